@@ -0,0 +1,55 @@
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from budget.models import Budget
+from expenditure.models import ExpenditureDailySummary
+
+
+def active_budgets(today, spent_until=None, **filters):
+    """
+    기준일에 진행 중인 예산과 해당 기간/카테고리의 지출 합계(spent)를 한 번의 쿼리로 조회
+    filters : user=user, user_id__in=[...] 등 Budget 조회 조건
+    spent_until : 지정하면 해당 일자까지의 지출만 합산
+    """
+    spent = ExpenditureDailySummary.objects.filter(
+        user=OuterRef('user'),
+        category=OuterRef('category'),
+        expense_date__gte=OuterRef('start_date'),
+        expense_date__lte=OuterRef('end_date'),
+    )
+    if spent_until is not None:
+        spent = spent.filter(expense_date__lte=spent_until)
+
+    spent = spent.order_by().values('user').annotate(total=Sum('money')).values('total')
+
+    return (
+        Budget.objects.select_related('category')
+        .filter(start_date__lte=today, end_date__gte=today, **filters)
+        .annotate(spent=Coalesce(Subquery(spent), 0))
+        .order_by('start_date', 'id')
+    )
+
+
+def budget_status(user, today):
+    """
+    예산별 지출액, 잔액, 일 평균 지출(burn_rate), 기간 종료 시 예상 지출
+    경과 일수로 나누므로 기준일 이후 일자로 등록된 지출은 합산하지 않음
+    """
+    result = []
+    for budget in active_budgets(today, spent_until=today, user=user):
+        total_days = (budget.end_date - budget.start_date).days + 1
+        elapsed_days = (min(today, budget.end_date) - budget.start_date).days + 1
+        burn_rate = budget.spent / elapsed_days
+
+        result.append({
+            "id" : budget.id,
+            "category" : budget.category.name,
+            "money" : budget.money,
+            "start_date" : budget.start_date,
+            "end_date" : budget.end_date,
+            "spent" : budget.spent,
+            "remaining" : budget.money - budget.spent,
+            "burn_rate" : round(burn_rate, 2),
+            "projected_spend" : round(burn_rate * total_days),
+        })
+    return result
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from budget import recommendation
+
+
+class Command(BaseCommand):
+    help = "사용자별 카테고리 예산 비율 분포로 예산 추천 비율을 다시 계산합니다. (하루 1회 이상 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=10000, help="한 번에 처리할 사용자 수")
+        parser.add_argument('--method', choices=recommendation.METHODS, help="대표값 (기본값 : BUDGET_RECOMMEND_METHOD)")
+        parser.add_argument('--trim', type=float, help="절사평균에서 위/아래로 제외할 비율 (기본값 : BUDGET_RECOMMEND_TRIM)")
+
+    def handle(self, *args, **options):
+        if options['trim'] is not None and not 0 <= options['trim'] < 0.5:
+            raise CommandError("--trim 은 0 이상 0.5 미만이어야 합니다.")
+
+        started = time.perf_counter()
+        users, method = recommendation.build(options['chunk_size'], options['method'], options['trim'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(f"사용자 {users}명, {method} 기준 추천 비율 갱신 ({elapsed:.2f}초)"))
@@ -0,0 +1,30 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from budget import plans
+
+
+class Command(BaseCommand):
+    help = "진행 중인 예산이 있는 모든 사용자의 오늘 지출 가능 금액을 미리 계산합니다. (매일 자정 이후 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="기준일 YYYY-MM-DD (기본값 : 오늘)")
+        parser.add_argument('--chunk-size', type=int, default=1000, help="한 번에 처리할 사용자 수")
+        parser.add_argument('--workers', type=int, default=1, help="프로세스 수")
+
+    def handle(self, *args, **options):
+        try:
+            plan_date = date.fromisoformat(options['date']) if options['date'] else timezone.localdate()
+        except ValueError:
+            raise CommandError("기준일 형식(YYYY-MM-DD)을 확인해주세요.")
+
+        started = time.perf_counter()
+        users, created = plans.build_all(plan_date, chunk_size=options['chunk_size'], workers=options['workers'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{plan_date} : 사용자 {users}명, 계획 {created}건 생성 ({elapsed:.2f}초)"
+        ))
@@ -0,0 +1,29 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from budget import peers
+
+
+class Command(BaseCommand):
+    help = "전체 사용자의 카테고리별 이번 달 지출/예산 비율 분포를 계산해 비교 통계를 갱신합니다. (하루 1회 이상 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="기준일 YYYY-MM-DD (기본값 : 오늘)")
+        parser.add_argument('--chunk-size', type=int, default=10000, help="한 번에 처리할 사용자 수")
+
+    def handle(self, *args, **options):
+        try:
+            day = date.fromisoformat(options['date']) if options['date'] else timezone.localdate()
+        except ValueError:
+            raise CommandError("기준일 형식(YYYY-MM-DD)을 확인해주세요.")
+
+        started = time.perf_counter()
+        users, categories = peers.build(day, chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{day} : 사용자 {users}명, 카테고리 {categories}개 통계 갱신 ({elapsed:.2f}초)"
+        ))
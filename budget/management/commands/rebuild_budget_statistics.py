@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from budget import statistics
+
+
+class Command(BaseCommand):
+    help = "예산 테이블로부터 카테고리별 예산 통계를 재생성합니다."
+
+    def handle(self, *args, **options):
+        statistics.rebuild()
+        self.stdout.write(self.style.SUCCESS("예산 통계를 재생성했습니다."))
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:49
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+
+
+def populate_statistic(apps, schema_editor):
+    Budget = apps.get_model('budget', 'Budget')
+    BudgetCategoryStatistic = apps.get_model('budget', 'BudgetCategoryStatistic')
+
+    BudgetCategoryStatistic.objects.bulk_create([
+        BudgetCategoryStatistic(category_id=row['category_id'], money=row['money__sum'], count=row['id__count'])
+        for row in Budget.objects.values('category_id').annotate(Sum('money'), Count('id')).order_by()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        ('budget', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BudgetCategoryStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('money', models.BigIntegerField(default=0, verbose_name='예산합계')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='예산건수')),
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='categories.category')),
+            ],
+            options={
+                'db_table': 'budget_category_statistic',
+            },
+        ),
+        migrations.RunPython(populate_statistic, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0002_budget_category_statistic'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='budget',
+            index=models.Index(fields=['user', 'start_date'], name='budget_user_start_date_idx'),
+        ),
+    ]
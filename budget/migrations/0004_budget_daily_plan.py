@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('budget', '0003_budget_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyBudgetPlan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('plan_date', models.DateField(verbose_name='기준일')),
+                ('daily_allowance', models.IntegerField(verbose_name='오늘 지출 가능 금액')),
+                ('remaining', models.IntegerField(verbose_name='남은 예산')),
+                ('remaining_days', models.PositiveIntegerField(verbose_name='남은 일수')),
+                ('spent', models.BigIntegerField(verbose_name='기준일 전까지 지출')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='categories.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'budget_daily_plan',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailybudgetplan',
+            constraint=models.UniqueConstraint(fields=('user', 'plan_date', 'category'), name='uniq_budget_daily_plan'),
+        ),
+    ]
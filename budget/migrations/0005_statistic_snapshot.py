@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0004_budget_daily_plan'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatisticSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('kind', models.CharField(max_length=30, verbose_name='종류')),
+                ('snapshot_date', models.DateField(verbose_name='기준일')),
+                ('data', models.JSONField(verbose_name='통계')),
+            ],
+            options={
+                'db_table': 'budget_statistic_snapshot',
+                'indexes': [models.Index(fields=['kind', 'id'], name='budget_snapshot_kind_idx')],
+            },
+        ),
+    ]
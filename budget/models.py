@@ -1,9 +1,9 @@
 from django.db import models
 from categories.models import Category
-from common.models import BaseModel
+from common.models import BaseModel, LoadedValuesMixin
 from users.models import User
 
-class Budget(BaseModel):
+class Budget(LoadedValuesMixin, BaseModel):
     money = models.PositiveIntegerField("예산금액")
     start_date = models.DateField("시작일")
     end_date = models.DateField("종료일")
@@ -13,6 +13,67 @@ class Budget(BaseModel):
     
     class Meta:
         db_table = 'budget'
+        indexes = [
+            # 목록 조회 : user 일치 + 시작일 범위
+            models.Index(fields=['user', 'start_date'], name='budget_user_start_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user} : {self.category} : {self.money}"
+
+
+class BudgetCategoryStatistic(models.Model):
+    """
+    전체 사용자의 카테고리별 예산 합계 (예산 추천 통계용)
+    """
+    money = models.BigIntegerField("예산합계", default=0)
+    count = models.PositiveIntegerField("예산건수", default=0)
+
+    category = models.OneToOneField(Category, on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = 'budget_category_statistic'
+
+    def __str__(self):
+        return f"{self.category} : {self.money}"
+
+
+class DailyBudgetPlan(BaseModel):
+    """
+    배치로 미리 계산한 사용자 x 카테고리별 오늘의 추천 지출 금액
+    """
+    plan_date = models.DateField("기준일")
+    daily_allowance = models.IntegerField("오늘 지출 가능 금액")
+    remaining = models.IntegerField("남은 예산")
+    remaining_days = models.PositiveIntegerField("남은 일수")
+    spent = models.BigIntegerField("기준일 전까지 지출")
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = 'budget_daily_plan'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'plan_date', 'category'], name='uniq_budget_daily_plan'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} : {self.plan_date} : {self.category} : {self.daily_allowance}"
+
+
+class StatisticSnapshot(BaseModel):
+    """
+    배치로 계산한 통계 결과 (API 는 kind 별 최신 결과를 캐시에서 조회)
+    """
+    kind = models.CharField("종류", max_length=30)
+    snapshot_date = models.DateField("기준일")
+    data = models.JSONField("통계")
+
+    class Meta:
+        db_table = 'budget_statistic_snapshot'
+        indexes = [
+            models.Index(fields=['kind', 'id'], name='budget_snapshot_kind_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} : {self.snapshot_date}"
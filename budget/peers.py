@@ -0,0 +1,161 @@
+from bisect import bisect_left
+
+import numpy as np
+from django.db.models import Sum
+
+from budget import snapshots
+from budget.models import Budget
+from budget.plans import iter_user_chunks
+from categories.registry import registry
+from expenditure.models import ExpenditureDailySummary
+
+
+KIND = 'peers'
+
+# 지출/예산 비율 분포를 BIN_WIDTH 간격 히스토그램으로 누적 (MAX_RATIO 이상은 마지막 구간)
+BIN_WIDTH = 0.01
+MAX_RATIO = 10
+BIN_COUNT = int(MAX_RATIO / BIN_WIDTH) + 1
+
+# 비교 대상 사용자 수가 이보다 적은 카테고리는 결과에 포함하지 않음
+MIN_PEERS = 5
+
+
+def budget_totals(day, **filters):
+    """
+    기준일에 진행 중인 예산의 (user_id, category_id, 예산합계)
+    """
+    return (
+        Budget.objects.filter(start_date__lte=day, end_date__gte=day, **filters)
+        .values_list('user_id', 'category_id')
+        .annotate(total=Sum('money'))
+        .order_by()
+    )
+
+
+def spent_totals(day, **filters):
+    """
+    기준일이 속한 달 1일부터 기준일까지의 (user_id, category_id, 지출합계)
+    """
+    return (
+        ExpenditureDailySummary.objects.filter(expense_date__range=(day.replace(day=1), day), **filters)
+        .values_list('user_id', 'category_id')
+        .annotate(total=Sum('money'))
+        .order_by()
+    )
+
+
+def _array(rows):
+    return np.array(list(rows), dtype=np.int64).reshape(-1, 3)
+
+
+def chunk_ratios(day, user_ids):
+    """
+    사용자 chunk 의 (카테고리 id 배열, 지출/예산 비율 배열)
+    예산이 있는 (사용자, 카테고리)만 포함하며 지출이 없으면 비율 0
+    """
+    budgets = _array(budget_totals(day, user_id__in=user_ids))
+    spent = _array(spent_totals(day, user_id__in=user_ids))
+    budgets = budgets[budgets[:, 2] > 0]
+
+    # (user_id, category_id) 를 하나의 정수 키로 합쳐 정렬 후 searchsorted 로 매칭
+    budget_keys = (budgets[:, 0] << 32) | budgets[:, 1]
+    order = np.argsort(budget_keys)
+    budgets, budget_keys = budgets[order], budget_keys[order]
+
+    spent_by_budget = np.zeros(len(budgets), dtype=np.int64)
+    if len(spent) and len(budgets):
+        spent_keys = (spent[:, 0] << 32) | spent[:, 1]
+        positions = np.minimum(np.searchsorted(budget_keys, spent_keys), len(budget_keys) - 1)
+        matched = budget_keys[positions] == spent_keys
+        spent_by_budget[positions[matched]] = spent[matched, 2]
+
+    return budgets[:, 1], spent_by_budget / budgets[:, 2]
+
+
+def quantiles(histogram, count):
+    """
+    누적 히스토그램으로 0 ~ 100 백분위 값을 계산 (구간 중앙값, 오차는 BIN_WIDTH / 2 이내)
+    """
+    cumulative = np.cumsum(histogram)
+    ranks = np.ceil(np.linspace(0, 1, 101) * count).clip(1, count)
+    bins = np.searchsorted(cumulative, ranks)
+    return np.round((bins + 0.5) * BIN_WIDTH, 4).tolist()
+
+
+def build(day, chunk_size=10000):
+    """
+    진행 중인 예산이 있는 전체 사용자의 카테고리별 지출/예산 비율 분포를 chunk 단위로 누적해 저장
+    사용자 수와 관계없이 메모리 사용량은 (카테고리 수 x BIN_COUNT) 히스토그램 크기로 일정
+    """
+    categories = {category.id : category.name for category in registry.all()}
+    size = max(categories, default=0) + 1
+
+    histogram = np.zeros(size * BIN_COUNT, dtype=np.int64)
+    sums = np.zeros(size, dtype=np.float64)
+    users = 0
+
+    for user_ids in iter_user_chunks(day, chunk_size):
+        category_ids, ratios = chunk_ratios(day, user_ids)
+        # 배치 중 추가된 카테고리는 다음 실행에 반영
+        known = category_ids < size
+        category_ids, ratios = category_ids[known], ratios[known]
+        bins = np.minimum((ratios / BIN_WIDTH).astype(np.int64), BIN_COUNT - 1)
+
+        histogram += np.bincount(category_ids * BIN_COUNT + bins, minlength=histogram.size)
+        sums += np.bincount(category_ids, weights=ratios, minlength=size)
+        users += len(user_ids)
+
+    histogram = histogram.reshape(size, BIN_COUNT)
+    counts = histogram.sum(axis=1)
+
+    data = {}
+    for category_id, name in categories.items():
+        count = int(counts[category_id])
+        if count < MIN_PEERS:
+            continue
+        data[str(category_id)] = {
+            'name' : name,
+            'count' : count,
+            'mean' : round(float(sums[category_id] / count), 4),
+            'quantiles' : quantiles(histogram[category_id], count),
+        }
+
+    snapshots.publish(KIND, day, data)
+    return users, len(data)
+
+
+def compare(user, day):
+    """
+    사용자의 카테고리별 이번 달 지출/예산 비율을 최신 배치 결과(다른 사용자 분포)와 비교
+    배치 결과가 없으면 None
+    """
+    snapshot = snapshots.get(KIND)
+    if snapshot is None:
+        return None
+
+    spent = {category_id : total for _, category_id, total in spent_totals(day, user=user)}
+
+    result = []
+    for _, category_id, money in budget_totals(day, user=user).order_by('category_id'):
+        peers = snapshot['data'].get(str(category_id))
+        if peers is None or not money:
+            continue
+
+        ratio = spent.get(category_id, 0) / money
+        mean = peers['mean']
+        result.append({
+            'category' : peers['name'],
+            'money' : money,
+            'spent' : spent.get(category_id, 0),
+            'ratio' : round(ratio, 4),
+            'peer_ratio' : mean,
+            'peer_median' : peers['quantiles'][50],
+            'peer_count' : peers['count'],
+            # 비슷한 사용자 평균보다 몇 % 더(+)/덜(-) 썼는지
+            'difference' : round((ratio / mean - 1) * 100, 1) if mean else None,
+            # 비율이 나보다 낮은 사용자 비율(%)
+            'percentile' : min(bisect_left(peers['quantiles'], ratio), 100),
+        })
+
+    return {'snapshot_date' : snapshot['snapshot_date'], 'categories' : result}
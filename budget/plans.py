@@ -0,0 +1,126 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+import multiprocessing
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from budget.consumption import active_budgets
+from budget.models import Budget, DailyBudgetPlan
+
+
+def compute_plans(plan_date, **filters):
+    """
+    기준일 전날까지의 지출을 반영해 진행 중인 예산별 오늘 지출 가능 금액을 계산
+    같은 사용자, 카테고리에 예산이 여러 개면 합산
+    """
+    plans = {}
+    for budget in active_budgets(plan_date, spent_until=plan_date - timedelta(days=1), **filters):
+        remaining = budget.money - budget.spent
+        remaining_days = (budget.end_date - plan_date).days + 1
+
+        plan = plans.get((budget.user_id, budget.category_id))
+        if plan is None:
+            plan = plans[(budget.user_id, budget.category_id)] = DailyBudgetPlan(
+                user_id=budget.user_id,
+                category=budget.category,
+                plan_date=plan_date,
+                daily_allowance=0,
+                remaining=0,
+                remaining_days=remaining_days,
+                spent=0
+            )
+
+        plan.daily_allowance += max(remaining, 0) // remaining_days
+        plan.remaining += remaining
+        plan.remaining_days = max(plan.remaining_days, remaining_days)
+        plan.spent += budget.spent
+
+    return list(plans.values())
+
+
+def save_plans(plans):
+    DailyBudgetPlan.objects.bulk_create(
+        plans,
+        update_conflicts=True,
+        unique_fields=['user', 'plan_date', 'category'],
+        update_fields=['daily_allowance', 'remaining', 'remaining_days', 'spent', 'updated_at'],
+    )
+
+
+def build_user_plans(user, plan_date):
+    """
+    배치 결과가 없는 사용자(신규 예산 등)를 위해 요청 시점에 계산해서 저장
+    해당 날짜의 계획이 없을 때만 호출하므로 삭제 없이 upsert 한 번으로 저장 (동시에 실행된 배치와 겹쳐도 덮어씀)
+    """
+    plans = compute_plans(plan_date, user=user)
+    save_plans(plans)
+    return plans
+
+
+def invalidate(user_id, expense_date=None):
+    """
+    예산이 바뀐 사용자의 오늘 이후 계획을 삭제 (다음 조회 시 요청 시점에 다시 계산)
+    expense_date : 지출이 바뀐 경우 해당 일자. 계획은 전날까지의 지출로 계산하므로 다음 날부터의 계획만 삭제
+    """
+    from_date = timezone.localdate()
+    if expense_date is not None:
+        from_date = max(from_date, expense_date + timedelta(days=1))
+    DailyBudgetPlan.objects.filter(user_id=user_id, plan_date__gte=from_date).delete()
+
+
+def build_chunk(plan_date, user_ids):
+    plans = compute_plans(plan_date, user_id__in=user_ids)
+    with transaction.atomic():
+        save_plans(plans)
+    return len(user_ids), len(plans)
+
+
+def iter_user_chunks(plan_date, chunk_size):
+    """
+    기준일에 진행 중인 예산이 있는 사용자 id 를 keyset 순서로 chunk_size 씩 반환
+    """
+    last_id = 0
+    while True:
+        user_ids = list(
+            Budget.objects.filter(start_date__lte=plan_date, end_date__gte=plan_date, user_id__gt=last_id)
+            .order_by('user_id')
+            .values_list('user_id', flat=True)
+            .distinct()[:chunk_size]
+        )
+        if not user_ids:
+            return
+        yield user_ids
+        last_id = user_ids[-1]
+
+
+def build_all(plan_date, chunk_size=1000, workers=1):
+    """
+    전체 사용자의 오늘 지출 계획을 chunk 단위로 계산 (workers > 1 이면 프로세스 풀 사용)
+    실행 전에 만들어진 같은 날짜의 계획(예산이 없어진 사용자 등)은 마지막에 삭제
+    """
+    started_at = timezone.now()
+    users, plans = 0, 0
+
+    if workers <= 1:
+        for user_ids in iter_user_chunks(plan_date, chunk_size):
+            chunk_users, chunk_plans = build_chunk(plan_date, user_ids)
+            users += chunk_users
+            plans += chunk_plans
+    else:
+        context = multiprocessing.get_context('fork')
+        futures = []
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            for user_ids in iter_user_chunks(plan_date, chunk_size):
+                # worker 가 fork 될 때 부모의 DB 연결을 공유하지 않도록 제출 전에 연결을 닫음
+                connections.close_all()
+                futures.append(executor.submit(build_chunk, plan_date, user_ids))
+
+            for future in futures:
+                chunk_users, chunk_plans = future.result()
+                users += chunk_users
+                plans += chunk_plans
+
+    DailyBudgetPlan.objects.filter(plan_date=plan_date, updated_at__lt=started_at).delete()
+
+    return users, plans
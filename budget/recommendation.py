@@ -0,0 +1,179 @@
+import numpy as np
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from budget import snapshots, statistics
+from budget.models import Budget
+from categories.registry import registry
+
+
+KIND = 'recommendation'
+
+# 사용자별 카테고리 비율(0 ~ 1)을 BIN_WIDTH 간격 히스토그램으로 누적
+BIN_WIDTH = 0.001
+BIN_COUNT = int(1 / BIN_WIDTH) + 1
+METHODS = ('trimmed_mean', 'median')
+
+
+def iter_user_chunks(chunk_size):
+    """
+    예산이 있는 사용자 id 를 keyset 순서로 chunk_size 씩 반환
+    """
+    last_id = 0
+    while True:
+        user_ids = list(
+            Budget.objects.filter(user_id__gt=last_id)
+            .order_by('user_id')
+            .values_list('user_id', flat=True)
+            .distinct()[:chunk_size]
+        )
+        if not user_ids:
+            return
+        yield user_ids
+        last_id = user_ids[-1]
+
+
+def chunk_ratios(user_ids):
+    """
+    사용자 chunk 의 (카테고리 id 배열, 사용자 전체 예산 중 해당 카테고리 비율 배열, 사용자 수)
+    """
+    rows = np.array(
+        list(
+            Budget.objects.filter(user_id__in=user_ids)
+            .values_list('user_id', 'category_id')
+            .annotate(total=Sum('money'))
+            .order_by()
+        ),
+        dtype=np.int64
+    ).reshape(-1, 3)
+
+    users, index = np.unique(rows[:, 0], return_inverse=True)
+    totals = np.bincount(index, weights=rows[:, 2], minlength=len(users))
+    valid = totals[index] > 0
+
+    return rows[valid, 1], rows[valid, 2] / totals[index][valid], int((totals > 0).sum())
+
+
+def bin_values():
+    """
+    구간별 대표값 (구간 중앙)
+    첫 구간은 대부분 예산이 없는 카테고리(비율 0), 마지막 구간은 비율 1 만 포함하므로 각각 0, 1 로 취급
+    """
+    values = (np.arange(BIN_COUNT) + 0.5) * BIN_WIDTH
+    values[0], values[-1] = 0, 1
+    return values
+
+
+def trimmed_means(histogram, trim):
+    """
+    카테고리별 히스토그램(행)에서 위/아래 trim 비율을 제외한 평균
+    """
+    counts = histogram.sum(axis=1, keepdims=True)
+    low = np.floor(counts * trim)
+    high = counts - low
+
+    cumulative = np.cumsum(histogram, axis=1)
+    # 각 구간에서 [low, high) 순위 범위에 포함되는 개수
+    included = (np.minimum(cumulative, high) - np.maximum(cumulative - histogram, low)).clip(0)
+    return (included * bin_values()).sum(axis=1) / np.maximum(high - low, 1).ravel()
+
+
+def medians(histogram):
+    counts = histogram.sum(axis=1)
+    cumulative = np.cumsum(histogram, axis=1)
+    bins = np.array([
+        min(np.searchsorted(row, count / 2), BIN_COUNT - 1) for row, count in zip(cumulative, counts)
+    ], dtype=np.int64)
+    return bin_values()[bins]
+
+
+def build(chunk_size=10000, method=None, trim=None):
+    """
+    사용자별 카테고리 예산 비율의 분포에서 카테고리별 대표값(절사평균 또는 중앙값)을 계산해 저장
+    예산이 없는 카테고리는 비율 0 으로 포함하므로 일부 사용자만 쓰는 카테고리는 작게 반영됨
+    """
+    method = method or settings.BUDGET_RECOMMEND_METHOD
+    trim = settings.BUDGET_RECOMMEND_TRIM if trim is None else trim
+
+    categories = {category.id : category.name for category in registry.all()}
+    size = max(categories, default=0) + 1
+
+    histogram = np.zeros(size * BIN_COUNT, dtype=np.int64)
+    users = 0
+
+    for user_ids in iter_user_chunks(chunk_size):
+        category_ids, ratios, chunk_users = chunk_ratios(user_ids)
+        known = category_ids < size
+        category_ids, ratios = category_ids[known], ratios[known]
+
+        bins = np.minimum((ratios / BIN_WIDTH).astype(np.int64), BIN_COUNT - 1)
+        histogram += np.bincount(category_ids * BIN_COUNT + bins, minlength=histogram.size)
+        users += chunk_users
+
+    histogram = histogram.reshape(size, BIN_COUNT)
+    # 해당 카테고리에 예산이 없는 사용자는 비율 0
+    histogram[:, 0] += users - histogram.sum(axis=1)
+
+    centers = trimmed_means(histogram, trim) if method == 'trimmed_mean' else medians(histogram)
+
+    data = {
+        'users' : users,
+        'method' : method,
+        'categories' : [
+            [category_id, name, round(float(centers[category_id]), 6)] for category_id, name in sorted(categories.items())
+        ],
+    }
+    snapshots.publish(KIND, timezone.localdate(), data)
+    return users, method
+
+
+def _snapshot_weights(snapshot):
+    # 저장된 비율(소수점 6자리)을 정수로 바꿔 배분 시 부동소수점 오차가 없도록 함
+    return [(name, round(weight * 10 ** 6)) for _, name, weight in snapshot['data']['categories']]
+
+
+def _statistics_weights(budget_statistics):
+    # 배치 결과가 없을 때는 전체 예산 합계 기준 비율 사용 (기존 방식)
+    return [(name, category_sum) for name, category_sum in budget_statistics['category_totals'].values()]
+
+
+def weights():
+    """
+    [(카테고리명, 정수 가중치)], 최신 배치 결과가 있으면 배치 결과를 사용
+    """
+    snapshot = snapshots.get(KIND)
+    if snapshot is not None:
+        return _snapshot_weights(snapshot)
+    return _statistics_weights(statistics.get_statistics())
+
+
+async def aweights():
+    """
+    weights 의 비동기 버전
+    """
+    snapshot = await snapshots.aget(KIND)
+    if snapshot is not None:
+        return _snapshot_weights(snapshot)
+    return _statistics_weights(await statistics.aget_statistics())
+
+
+def allocate(total, weights):
+    """
+    총 예산을 가중치 비율로 나눈 뒤 최대 잉여(largest remainder) 방식으로 정수 배분
+    배분 결과의 합은 항상 total 과 같음 (가중치가 모두 0 이면 균등 배분)
+    """
+    if not any(weight for _, weight in weights):
+        weights = [(name, 1) for name, _ in weights]
+    weight_sum = sum(weight for _, weight in weights)
+    if not weight_sum:
+        return {}
+
+    shares = [divmod(total * weight, weight_sum) for _, weight in weights]
+    remainder = total - sum(share for share, _ in shares)
+
+    # 나머지가 큰 순서(같으면 앞 카테고리 우선)로 1씩 추가
+    order = sorted(range(len(shares)), key=lambda i: -shares[i][1])
+    extra = set(order[:remainder])
+
+    return {name : share + (i in extra) for i, ((name, _), (share, _)) in enumerate(zip(weights, shares))}
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
-from budget.models import Budget
+from budget.models import Budget, DailyBudgetPlan
+from common.serializers import ValuesSerializerMixin
 
 
 class BudgetSerializer(serializers.ModelSerializer):
@@ -17,10 +18,19 @@ class BudgetSerializer(serializers.ModelSerializer):
         ]
 
 
-class BudgetListSerializer(serializers.ModelSerializer):
+class BudgetListSerializer(ValuesSerializerMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField()
     category = serializers.StringRelatedField()
 
+    value_fields = {
+        'id' : 'id',
+        'user' : 'user__username',
+        'category' : 'category__name',
+        'money' : 'money',
+        'start_date' : 'start_date',
+        'end_date' : 'end_date'
+    }
+
     class Meta:
         model = Budget
         fields = [
@@ -52,7 +62,8 @@ class BudgetDetailSerializer(serializers.ModelSerializer):
 class BudgetCreateSerializer(serializers.Serializer):
     start_date = serializers.DateField()
     end_date = serializers.DateField()
-    budget_data = serializers.DictField()
+    budget_data = serializers.DictField(child=serializers.IntegerField(min_value=0))
+    upsert = serializers.BooleanField(default=False, help_text="시작일, 종료일, 카테고리가 모두 같은 예산이 있으면 새로 만들지 않고 금액을 수정 (기간이 겹치기만 하는 예산은 별도로 생성)")
 
 
 class BudgetUpdateSerializer(serializers.Serializer):
@@ -63,8 +74,50 @@ class BudgetUpdateSerializer(serializers.Serializer):
 
 
 class BudgetRecommendInputSerializer(serializers.Serializer):
-    budget = serializers.IntegerField()
+    budget = serializers.IntegerField(min_value=0)
 
 
 class BudgetRecommendOutputSerializer(serializers.Serializer):
-    budget_data = serializers.DictField()
\ No newline at end of file
+    budget_data = serializers.DictField()
+
+class BudgetStatusSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    category = serializers.CharField()
+    money = serializers.IntegerField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    spent = serializers.IntegerField()
+    remaining = serializers.IntegerField()
+    burn_rate = serializers.FloatField(help_text="일 평균 지출")
+    projected_spend = serializers.IntegerField(help_text="현재 추세 유지 시 기간 종료 시점 예상 지출")
+
+
+class BudgetPeerCategorySerializer(serializers.Serializer):
+    category = serializers.CharField()
+    money = serializers.IntegerField(help_text="진행 중인 예산 합계")
+    spent = serializers.IntegerField(help_text="이번 달 지출")
+    ratio = serializers.FloatField(help_text="지출 / 예산")
+    peer_ratio = serializers.FloatField(help_text="다른 사용자 평균 지출 / 예산")
+    peer_median = serializers.FloatField(help_text="다른 사용자 지출 / 예산 중앙값")
+    peer_count = serializers.IntegerField()
+    difference = serializers.FloatField(help_text="평균 대비 더 쓴 비율(%)")
+    percentile = serializers.IntegerField(help_text="나보다 비율이 낮은 사용자 비율(%)")
+
+
+class BudgetPeerComparisonSerializer(serializers.Serializer):
+    snapshot_date = serializers.DateField(help_text="비교 통계 기준일")
+    categories = BudgetPeerCategorySerializer(many=True)
+
+
+class DailyBudgetPlanSerializer(serializers.ModelSerializer):
+    category = serializers.StringRelatedField()
+
+    class Meta:
+        model = DailyBudgetPlan
+        fields = [
+            'category',
+            'daily_allowance',
+            'remaining',
+            'remaining_days',
+            'spent'
+        ]
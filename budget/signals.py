@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from budget import plans, statistics
+from common.response_cache import bump_user_version
+from budget.models import Budget
+
+
+STATISTIC_FIELDS = ('category_id', 'money')
+
+_suppressed = ContextVar('budget_signals_suppressed', default=False)
+
+
+@contextmanager
+def suppress_statistics():
+    """
+    구간 안의 예산 저장/삭제에서 통계, 지출 계획, 응답 캐시 갱신을 생략
+    통계를 직접 다시 계산하는 일괄 작업(측정용 데이터 삭제 등)에서 QuerySet.delete() 를 사용할 때 사용
+    """
+    token = _suppressed.set(True)
+    try:
+        yield
+    finally:
+        _suppressed.reset(token)
+
+
+def _previous(instance):
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None or not all(field in loaded for field in STATISTIC_FIELDS):
+        loaded = Budget.objects.filter(pk=instance.pk).values(*STATISTIC_FIELDS).first()
+    if loaded is None:
+        return None
+    return loaded['category_id'], loaded['money']
+
+
+@receiver(pre_save, sender=Budget)
+def capture_previous_budget(sender, instance, **kwargs):
+    if _suppressed.get():
+        return
+    instance._statistic_previous = None
+    if instance.pk is not None and not instance._state.adding:
+        instance._statistic_previous = _previous(instance)
+
+
+@receiver(post_save, sender=Budget)
+def update_statistics_on_save(sender, instance, **kwargs):
+    if _suppressed.get():
+        return
+    previous = getattr(instance, '_statistic_previous', None)
+    current = (instance.category_id, instance.money)
+
+    deltas = {}
+    if previous is not None:
+        deltas[previous[0]] = (-previous[1], -1)
+    money, count = deltas.get(current[0], (0, 0))
+    deltas[current[0]] = (money + current[1], count + 1)
+
+    for category_id, (money, count) in deltas.items():
+        statistics.apply(category_id, money, count)
+
+    instance._statistic_previous = None
+    instance._loaded_values = dict(zip(STATISTIC_FIELDS, current))
+    plans.invalidate(instance.user_id)
+    bump_user_version(instance.user_id)
+
+
+@receiver(post_delete, sender=Budget)
+def update_statistics_on_delete(sender, instance, **kwargs):
+    if _suppressed.get():
+        return
+    loaded = getattr(instance, '_loaded_values', None) or {}
+    category_id = loaded.get('category_id', instance.category_id)
+    money = loaded.get('money', instance.money)
+    statistics.apply(category_id, -money, -1)
+    plans.invalidate(instance.user_id)
+    bump_user_version(instance.user_id)
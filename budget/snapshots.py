@@ -0,0 +1,60 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+
+from budget.models import StatisticSnapshot
+
+
+CACHE_KEY = 'budget:snapshot:{}'
+# kind 별로 보관할 이전 결과 수
+KEEP = 7
+
+
+def publish(kind, snapshot_date, data):
+    """
+    배치 결과를 저장하고 캐시를 교체 (API 는 캐시만 조회하므로 교체 전까지 이전 결과를 사용)
+    """
+    with transaction.atomic():
+        snapshot = StatisticSnapshot.objects.create(kind=kind, snapshot_date=snapshot_date, data=data)
+        old_ids = (
+            StatisticSnapshot.objects.filter(kind=kind)
+            .order_by('-id')
+            .values_list('id', flat=True)[KEEP:]
+        )
+        StatisticSnapshot.objects.filter(id__in=list(old_ids)).delete()
+
+    transaction.on_commit(lambda: cache.set(CACHE_KEY.format(kind), _value(snapshot), None))
+    return snapshot
+
+
+def _value(snapshot):
+    return {'snapshot_date' : snapshot.snapshot_date, 'data' : snapshot.data}
+
+
+def _load(kind):
+    snapshot = StatisticSnapshot.objects.filter(kind=kind).order_by('-id').first()
+    return None if snapshot is None else _value(snapshot)
+
+
+def get(kind):
+    """
+    {'snapshot_date' : 기준일, 'data' : 통계}, 배치 결과가 없으면 None
+    """
+    value = cache.get(CACHE_KEY.format(kind))
+    if value is None:
+        value = _load(kind)
+        if value is not None:
+            cache.set(CACHE_KEY.format(kind), value, None)
+    return value
+
+
+async def aget(kind):
+    """
+    get 의 비동기 버전
+    """
+    value = await cache.aget(CACHE_KEY.format(kind))
+    if value is None:
+        value = await sync_to_async(_load)(kind)
+        if value is not None:
+            await cache.aset(CACHE_KEY.format(kind), value, None)
+    return value
@@ -0,0 +1,83 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+from budget.models import Budget, BudgetCategoryStatistic
+from categories.registry import registry
+
+
+CACHE_KEY = 'budget:category-statistics'
+
+
+def apply(category_id, money, count):
+    """
+    카테고리별 예산 합계에 변화량을 반영
+    """
+    if not money and not count:
+        return
+
+    changes = {'money' : F('money') + money, 'count' : F('count') + count}
+    if BudgetCategoryStatistic.objects.filter(category_id=category_id).update(**changes) or count < 0:
+        return
+
+    try:
+        with transaction.atomic():
+            BudgetCategoryStatistic.objects.create(category_id=category_id, money=money, count=count)
+    except IntegrityError:
+        BudgetCategoryStatistic.objects.filter(category_id=category_id).update(**changes)
+
+
+def _load():
+    totals = dict(
+        BudgetCategoryStatistic.objects.filter(count__gt=0).values_list('category_id', 'money')
+    )
+    category_totals = {
+        category_id : (name, totals.get(category_id, 0))
+        for category_id, name in ((category.id, category.name) for category in registry.all())
+    }
+    return {
+        'category_totals' : category_totals,
+        'total' : sum(totals.values()),
+    }
+
+
+def get_statistics():
+    """
+    {'category_totals' : {category_id : (카테고리명, 예산합계)}, 'total' : 전체 예산합계}
+    BUDGET_STATISTICS_TIMEOUT(초) 동안 캐시된 값을 사용
+    """
+    statistics = cache.get(CACHE_KEY)
+    if statistics is None:
+        statistics = _load()
+        cache.set(CACHE_KEY, statistics, settings.BUDGET_STATISTICS_TIMEOUT)
+    return statistics
+
+
+async def aget_statistics():
+    """
+    get_statistics 의 비동기 버전
+    """
+    statistics = await cache.aget(CACHE_KEY)
+    if statistics is None:
+        statistics = await sync_to_async(_load)()
+        await cache.aset(CACHE_KEY, statistics, settings.BUDGET_STATISTICS_TIMEOUT)
+    return statistics
+
+
+def invalidate():
+    cache.delete(CACHE_KEY)
+
+
+@transaction.atomic
+def rebuild():
+    """
+    예산 테이블로부터 카테고리별 합계를 다시 계산
+    """
+    BudgetCategoryStatistic.objects.all().delete()
+    BudgetCategoryStatistic.objects.bulk_create([
+        BudgetCategoryStatistic(category_id=row['category_id'], money=row['money__sum'], count=row['id__count'])
+        for row in Budget.objects.values('category_id').annotate(Sum('money'), Count('id')).order_by()
+    ])
+    invalidate()
@@ -1,3 +1,508 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from budget import peers, plans, recommendation, statistics
+from budget.models import Budget, BudgetCategoryStatistic, DailyBudgetPlan
+from budget.serializers import BudgetListSerializer
+from budget.views import BudgetAPIView, DailyBudgetPlanAPIView
+from categories.models import Category
+from common.renderers import FastJSONRenderer
+from common.testing import ExplainMixin, QueryBudgetMixin
+from expenditure.models import Expenditure
+from users.models import User
+
+
+class BudgetStatisticsTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create_user(username=f'tester{i}', password='password') for i in range(2)]
+        cls.food = Category.objects.create(name='식비', description='식비')
+        cls.cafe = Category.objects.create(name='카페', description='카페')
+
+    def setUp(self):
+        cache.clear()
+
+    def create(self, user, category, money):
+        return Budget.objects.create(user=user, category=category, money=money, start_date=date(2023, 11, 1), end_date=date(2023, 11, 30))
+
+    def state(self):
+        return dict(
+            (category_id, (money, count))
+            for category_id, money, count in BudgetCategoryStatistic.objects.filter(count__gt=0).values_list('category_id', 'money', 'count')
+        )
+
+    def assertMatchesRebuild(self, expected):
+        self.assertEqual(self.state(), expected)
+        statistics.rebuild()
+        self.assertEqual(self.state(), expected)
+
+    def test_signal_deltas_match_rebuild(self):
+        first = self.create(self.users[0], self.food, 10000)
+        second = self.create(self.users[1], self.food, 30000)
+        third = self.create(self.users[1], self.cafe, 5000)
+        self.assertMatchesRebuild({self.food.id : (40000, 2), self.cafe.id : (5000, 1)})
+
+        # 금액 변경, 카테고리 변경 (rebuild 뒤 다시 읽은 인스턴스도 같은 변화량)
+        first.money = 15000
+        first.save()
+        second = Budget.objects.get(id=second.id)
+        second.category = self.cafe
+        second.save()
+        self.assertMatchesRebuild({self.food.id : (15000, 1), self.cafe.id : (35000, 2)})
+
+        third.delete()
+        first.delete()
+        self.assertMatchesRebuild({self.cafe.id : (30000, 1)})
+
+    def test_cached_until_invalidated(self):
+        self.create(self.users[0], self.food, 10000)
+        self.assertEqual(statistics.get_statistics(), {
+            'category_totals' : {self.food.id : ('식비', 10000), self.cafe.id : ('카페', 0)},
+            'total' : 10000,
+        })
+
+        self.create(self.users[1], self.cafe, 5000)
+        with CaptureQueriesContext(connection) as context:
+            cached = statistics.get_statistics()
+
+        # BUDGET_STATISTICS_TIMEOUT 동안은 저장된 값을 조회 없이 사용
+        self.assertEqual(len(context.captured_queries), 0)
+        self.assertEqual(cached['total'], 10000)
+
+        statistics.invalidate()
+        self.assertEqual(statistics.get_statistics()['total'], 15000)
+
+
+class BudgetBulkCreateTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        cls.food = Category.objects.create(name='식비', description='식비')
+        cls.cafe = Category.objects.create(name='카페', description='카페')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, budget_data, start_date='2023-11-01', end_date='2023-11-30', **data):
+        return self.client.post('/api/v1/budget/', {'start_date' : start_date, 'end_date' : end_date, 'budget_data' : budget_data, **data}, format='json')
+
+    def budgets(self):
+        return sorted(Budget.objects.filter(user=self.user).values_list('category__name', 'money', 'start_date', 'end_date'))
+
+    def totals(self):
+        return dict(BudgetCategoryStatistic.objects.filter(count__gt=0).values_list('category_id', 'money'))
+
+    def test_create(self):
+        response = self.post({'식비' : 300000, '카페' : 50000})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(sorted((row['category'], row['money']) for row in response.data), [('식비', 300000), ('카페', 50000)])
+        self.assertEqual(self.budgets(), [
+            ('식비', 300000, date(2023, 11, 1), date(2023, 11, 30)),
+            ('카페', 50000, date(2023, 11, 1), date(2023, 11, 30)),
+        ])
+        # bulk_create 는 signal 이 없으므로 직접 반영한 통계가 rebuild 결과와 같은지 확인
+        self.assertEqual(self.totals(), {self.food.id : 300000, self.cafe.id : 50000})
+        statistics.rebuild()
+        self.assertEqual(self.totals(), {self.food.id : 300000, self.cafe.id : 50000})
+
+    def test_upsert_updates_same_period_in_place(self):
+        self.post({'식비' : 300000})
+        budget_id = Budget.objects.get(user=self.user).id
+
+        self.assertEqual(self.post({'식비' : 250000, '카페' : 50000}, upsert=True).status_code, 201)
+        # 기간이 겹치기만 하는 예산은 별도로 생성
+        self.assertEqual(self.post({'식비' : 100000}, start_date='2023-11-15', upsert=True).status_code, 201)
+
+        self.assertEqual(Budget.objects.get(user=self.user, start_date=date(2023, 11, 1), category=self.food).id, budget_id)
+        self.assertEqual(self.budgets(), [
+            ('식비', 100000, date(2023, 11, 15), date(2023, 11, 30)),
+            ('식비', 250000, date(2023, 11, 1), date(2023, 11, 30)),
+            ('카페', 50000, date(2023, 11, 1), date(2023, 11, 30)),
+        ])
+        self.assertEqual(self.totals(), {self.food.id : 350000, self.cafe.id : 50000})
+        statistics.rebuild()
+        self.assertEqual(self.totals(), {self.food.id : 350000, self.cafe.id : 50000})
+
+        # upsert 없이 같은 기간으로 등록하면 새 예산 생성
+        self.post({'카페' : 10000})
+        self.assertEqual(Budget.objects.filter(user=self.user, category=self.cafe).count(), 2)
+
+    def test_atomic(self):
+        response = self.post({'식비' : 300000, '없는카테고리' : 1000})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.budgets(), [])
+
+        # 저장 도중 실패하면 이미 저장한 예산과 통계도 함께 취소
+        self.post({'식비' : 300000})
+        with mock.patch.object(statistics, 'apply', side_effect=[None, RuntimeError]):
+            with self.assertRaises(RuntimeError):
+                self.post({'식비' : 100000, '카페' : 50000}, upsert=True)
+
+        self.assertEqual(self.budgets(), [('식비', 300000, date(2023, 11, 1), date(2023, 11, 30))])
+        self.assertEqual(self.totals(), {self.food.id : 300000})
+
+
+class BudgetStatusTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        other = User.objects.create_user(username='other', password='password')
+        cls.food = Category.objects.create(name='식비', description='식비')
+        cls.cafe = Category.objects.create(name='카페', description='카페')
+
+        cls.month = Budget.objects.create(user=cls.user, category=cls.food, money=300000, start_date=date(2023, 11, 1), end_date=date(2023, 11, 30))
+        cls.over = Budget.objects.create(user=cls.user, category=cls.cafe, money=3000, start_date=date(2023, 11, 1), end_date=date(2023, 11, 10))
+        cls.first_day = Budget.objects.create(user=cls.user, category=cls.food, money=1000, start_date=date(2023, 11, 5), end_date=date(2023, 11, 6))
+        # 기준일에 진행 중이 아닌 예산
+        Budget.objects.create(user=cls.user, category=cls.food, money=100000, start_date=date(2023, 10, 1), end_date=date(2023, 10, 31))
+
+        for money, day, category, user, is_sum in (
+            (10000, date(2023, 11, 1), cls.food, cls.user, True),
+            (20000, date(2023, 11, 5), cls.food, cls.user, True),
+            (30000, date(2023, 11, 10), cls.food, cls.user, True),   # 기준일 이후
+            (5000, date(2023, 10, 31), cls.food, cls.user, True),    # 예산 기간 이전
+            (7777, date(2023, 11, 3), cls.food, cls.user, False),    # 합계 제외
+            (99999, date(2023, 11, 2), cls.food, other, True),       # 다른 사용자
+            (4000, date(2023, 11, 2), cls.cafe, cls.user, True),
+        ):
+            Expenditure.objects.create(user=user, category=category, money=money, expense_date=day, is_sum=is_sum)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def status_on(self, day):
+        response = self.client.get('/api/v1/budget/status/', {'date' : day})
+        self.assertEqual(response.status_code, 200)
+        return {row['id'] : row for row in response.data}
+
+    def test_spent_remaining_and_projection(self):
+        rows = self.status_on('2023-11-05')
+
+        self.assertEqual(list(rows), [self.month.id, self.over.id, self.first_day.id])
+        self.assertEqual(
+            {key : rows[self.month.id][key] for key in ('spent', 'remaining', 'burn_rate', 'projected_spend')},
+            {'spent' : 30000, 'remaining' : 270000, 'burn_rate' : 6000.0, 'projected_spend' : 180000}
+        )
+        # 예산 초과 : 잔액은 음수
+        self.assertEqual(
+            {key : rows[self.over.id][key] for key in ('spent', 'remaining', 'burn_rate', 'projected_spend')},
+            {'spent' : 4000, 'remaining' : -1000, 'burn_rate' : 800.0, 'projected_spend' : 8000}
+        )
+        # 시작일 당일 : 경과 일수 1일로 계산 (예산 기간의 지출만 합산)
+        self.assertEqual(
+            {key : rows[self.first_day.id][key] for key in ('spent', 'remaining', 'burn_rate', 'projected_spend')},
+            {'spent' : 20000, 'remaining' : -19000, 'burn_rate' : 20000.0, 'projected_spend' : 40000}
+        )
+
+    def test_no_spending_and_period_edges(self):
+        # 마지막 날은 기간 전체 지출, 지출이 없는 예산은 0
+        rows = self.status_on('2023-11-30')
+        self.assertEqual(list(rows), [self.month.id])
+        self.assertEqual((rows[self.month.id]['spent'], rows[self.month.id]['burn_rate'], rows[self.month.id]['projected_spend']), (60000, 2000.0, 60000))
+
+        Budget.objects.create(user=self.user, category=self.cafe, money=5000, start_date=date(2023, 12, 1), end_date=date(2023, 12, 31))
+        rows = self.status_on('2023-12-01')
+        self.assertEqual(
+            [(row['spent'], row['remaining'], row['burn_rate'], row['projected_spend']) for row in rows.values()],
+            [(0, 5000, 0.0, 0)]
+        )
+
+        response = self.client.get('/api/v1/budget/status/', {'date' : '2023-13-01'})
+        self.assertEqual(response.status_code, 400)
+
+
+class BudgetQueryPlanTest(ExplainMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        cls.category = Category.objects.create(name='식비', description='식비')
+        Budget.objects.bulk_create([
+            Budget(user=cls.user, category=cls.category, money=10000, start_date=date(2023, month, 1), end_date=date(2023, month, 28))
+            for month in range(1, 13)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_month_list_uses_index(self):
+        response, queries = self.capture(self.client.get, '/api/v1/budget/', {'year' : 2023, 'month' : 11})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+        self.assertUsesIndex(queries, 'budget')
+
+    def test_month_without_year_matches_every_year(self):
+        Budget.objects.create(user=self.user, category=self.category, money=20000, start_date=date(2022, 12, 1), end_date=date(2022, 12, 31))
+
+        every_year = self.client.get('/api/v1/budget/', {'month' : 12})
+        one_year = self.client.get('/api/v1/budget/', {'year' : 2023, 'month' : 12})
+
+        self.assertEqual(sorted(row['start_date'] for row in every_year.data), ['2022-12-01', '2023-12-01'])
+        self.assertEqual([row['start_date'] for row in one_year.data], ['2023-12-01'])
+        self.assertEqual(self.client.get('/api/v1/budget/', {'month' : 13}).status_code, 400)
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class BudgetQueryBudgetTest(QueryBudgetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        categories = [Category.objects.create(name=name, description=name) for name in ('식비', '교통', '카페')]
+        for month in range(1, 13):
+            for category in categories:
+                Budget.objects.create(user=cls.user, category=category, money=10000, start_date=date(2023, month, 1), end_date=date(2023, month, 28))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}")
+
+    def test_list_query_budget(self):
+        response, queries = self.capture(self.client.get, '/api/v1/budget/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 36)
+        self.assertEqual(response.data[0]['user'], 'tester')
+        self.assertQueryBudget(BudgetAPIView, 'get', queries)
+
+
+    def test_daily_plan_query_budget(self):
+        today = timezone.localdate()
+        Budget.objects.create(user=self.user, category=Category.objects.get(name='식비'), money=10000, start_date=today, end_date=today + timedelta(days=9))
+
+        # 배치 결과가 없어 요청 시점에 계산
+        response, queries = self.capture(self.client.get, '/api/v1/budget/today/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 1000)
+        self.assertQueryBudget(DailyBudgetPlanAPIView, 'get', queries)
+
+        # 배치 결과 사용
+        plans.build_all(today)
+        response, queries = self.capture(self.client.get, '/api/v1/budget/today/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 1000)
+        self.assertQueryBudget(DailyBudgetPlanAPIView, 'get', queries)
+
+
+class BudgetListRenderingTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='테스터', password='password')
+        categories = [Category.objects.create(name=name, description=name) for name in ('식비', '교통')]
+        Budget.objects.bulk_create([
+            Budget(user=cls.user, category=categories[day % 2], money=10000 * day, start_date=date(2023, 11, day), end_date=date(2023, 11, 30))
+            for day in range(1, 29)
+        ])
+
+    def test_values_path_matches_serializer(self):
+        queryset = Budget.objects.filter(user=self.user).order_by('start_date', 'id')
+
+        expected = JSONRenderer().render(BudgetListSerializer(queryset.select_related('user', 'category'), many=True).data)
+        actual = FastJSONRenderer().render(BudgetListSerializer.represent_values(BudgetListSerializer.values(queryset)))
+
+        self.assertEqual(actual, expected)
+
+
+class BudgetAsyncAPITest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        categories = [Category.objects.create(name=name, description=name) for name in ('식비', '교통')]
+        for month in range(10, 13):
+            for category in categories:
+                Budget.objects.create(user=cls.user, category=category, money=100000 * month, start_date=date(2023, month, 1), end_date=date(2023, month, 28))
+
+    def setUp(self):
+        cache.clear()
+        self.async_client = AsyncClient()
+        self.headers = {'Authorization' : f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+
+    async def test_list_matches_sync_view(self):
+        for params in ({'page_size' : 4}, {'year' : 2023, 'month' : 11}, {'month' : 13}):
+            sync = await self.async_client.get('/api/v1/budget/', params, headers=self.headers)
+            async_ = await self.async_client.get('/api/v1/budget/async/', params, headers=self.headers)
+
+            self.assertEqual(async_.status_code, sync.status_code)
+            self.assertEqual(async_.json(), sync.json())
+            self.assertEqual(async_.has_header('Link'), sync.has_header('Link'))
+
+        page = await self.async_client.get('/api/v1/budget/async/', {'page_size' : 4}, headers=self.headers)
+        self.assertEqual(len(page.json()), 4)
+        self.assertIn('/api/v1/budget/async/?', page['Link'])
+
+    async def test_recommend_matches_sync_view(self):
+        for body in ({'budget' : 1000000}, {}, {'budget' : -1}):
+            sync = await self.async_client.post('/api/v1/budget/recommend/', body, content_type='application/json', headers=self.headers)
+            async_ = await self.async_client.post('/api/v1/budget/recommend/async/', body, content_type='application/json', headers=self.headers)
+
+            self.assertEqual(async_.status_code, sync.status_code)
+            self.assertEqual(async_.json(), sync.json())
+
+
+class DailyBudgetPlanTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = timezone.localdate()
+        cls.user = User.objects.create_user(username='tester', password='password')
+        cls.food = Category.objects.create(name='식비', description='식비')
+        cls.cafe = Category.objects.create(name='카페', description='카페')
+        # 오늘 포함 10일 남은 예산, 어제까지 1000 지출
+        cls.budget = Budget.objects.create(user=cls.user, category=cls.food, money=11000, start_date=cls.today - timedelta(days=1), end_date=cls.today + timedelta(days=9))
+        Expenditure.objects.create(user=cls.user, category=cls.food, money=1000, expense_date=cls.today - timedelta(days=1))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def allowances(self):
+        response = self.client.get('/api/v1/budget/today/')
+        self.assertEqual(response.status_code, 200)
+        return {row['category'] : row['daily_allowance'] for row in response.data['categories']}
+
+    def test_batch_plans_are_served(self):
+        plans.build_all(self.today, chunk_size=1)
+        # 배치 결과를 그대로 사용하는지 확인하기 위해 저장된 값을 변경
+        DailyBudgetPlan.objects.filter(user=self.user).update(daily_allowance=12345)
+
+        self.assertEqual(self.allowances(), {'식비' : 12345})
+
+    def test_computed_on_demand(self):
+        self.assertEqual(self.allowances(), {'식비' : 1000})
+        self.assertEqual(DailyBudgetPlan.objects.filter(user=self.user, plan_date=self.today).count(), 1)
+
+    def test_budget_changes_after_batch(self):
+        plans.build_all(self.today)
+        self.assertEqual(self.allowances(), {'식비' : 1000})
+
+        response = self.client.post('/api/v1/budget/', {
+            'start_date' : self.today,
+            'end_date' : self.today + timedelta(days=4),
+            'budget_data' : {'카페' : 5000},
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.allowances(), {'식비' : 1000, '카페' : 1000})
+
+        response = self.client.put(f'/api/v1/budget/{self.budget.id}/', {'money' : 21000}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.allowances(), {'식비' : 2000, '카페' : 1000})
+
+        response = self.client.delete(f'/api/v1/budget/{self.budget.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.allowances(), {'카페' : 1000})
+
+    def test_expenditure_changes_after_batch(self):
+        plans.build_all(self.today)
+        self.assertEqual(self.allowances(), {'식비' : 1000})
+
+        # 오늘 지출은 전날까지의 지출로 계산한 오늘 계획에 영향 없음
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/expenditure/', {'money' : 3000, 'category' : '식비', 'expense_date' : self.today}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(DailyBudgetPlan.objects.filter(user=self.user, plan_date=self.today).exists())
+
+        # 어제 날짜로 등록 : 남은 5000 / 10일
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/expenditure/', {'money' : 5000, 'category' : '식비', 'expense_date' : self.today - timedelta(days=1)}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.allowances(), {'식비' : 500})
+
+        expenditure = Expenditure.objects.get(user=self.user, money=5000)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/v1/expenditure/{expenditure.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.allowances(), {'식비' : 1000})
+
+        upload = SimpleUploadedFile('rows.csv', f'money,category,expense_date\n2000,식비,{self.today - timedelta(days=1)}\n'.encode('utf-8'))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/expenditure/import/', {'file' : upload}, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.allowances(), {'식비' : 800})
+
+
+class BudgetPeerComparisonTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        cls.category = Category.objects.create(name='식비', description='식비')
+        cls.users = [User.objects.create_user(username=f'tester{i}', password=None) for i in range(6)]
+        for i, user in enumerate(cls.users):
+            Budget.objects.create(user=user, category=cls.category, money=100000, start_date=today.replace(day=1), end_date=today)
+            Expenditure.objects.create(user=user, category=cls.category, money=10000 * (i + 1), expense_date=today)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[-1])
+
+    def test_compare_with_snapshot(self):
+        self.assertEqual(self.client.get('/api/v1/budget/peers/').status_code, 404)
+
+        peers.build(timezone.localdate(), chunk_size=4)
+        response = self.client.get('/api/v1/budget/peers/')
+
+        self.assertEqual(response.status_code, 200)
+        category = response.data['categories'][0]
+        self.assertEqual(category['ratio'], 0.6)
+        self.assertEqual(category['peer_ratio'], 0.35)
+        self.assertEqual(category['peer_count'], 6)
+        self.assertEqual(category['difference'], 71.4)
+
+
+class BudgetRecommendationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        categories = [Category.objects.create(name=name, description=name) for name in ('식비', '교통', '쇼핑')]
+        users = [User.objects.create_user(username=f'tester{i}', password=None) for i in range(6)]
+        for user in users[:5]:
+            for category, money in zip(categories, (300000, 200000)):
+                Budget.objects.create(user=user, category=category, money=money, start_date=date(2023, 11, 1), end_date=date(2023, 11, 30))
+        # 예산이 매우 큰 사용자 1명
+        Budget.objects.create(user=users[5], category=categories[2], money=100000000, start_date=date(2023, 11, 1), end_date=date(2023, 11, 30))
+        cls.user = users[0]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_allocation_sums_to_budget(self):
+        weights = [('식비', 1), ('교통', 1), ('쇼핑', 1)]
+
+        self.assertEqual(recommendation.allocate(100, weights), {'식비' : 34, '교통' : 33, '쇼핑' : 33})
+        self.assertEqual(sum(recommendation.allocate(1000003, [('a', 318169), ('b', 181106), ('c', 7)]).values()), 1000003)
+
+    def test_outlier_does_not_skew(self):
+        recommendation.build(chunk_size=4, method='median')
+        response = self.client.post('/api/v1/budget/recommend/', {'budget' : 1000001}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        budget_data = response.data['budget_data']
+        self.assertEqual(sum(budget_data.values()), 1000001)
+        self.assertEqual(budget_data['쇼핑'], 0)
+        # 히스토그램 구간(0.001) 오차 이내
+        self.assertAlmostEqual(budget_data['식비'] / 1000001, 0.6, delta=0.001)
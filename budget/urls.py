@@ -1,9 +1,14 @@
 from django.urls import path
 
-from budget.views import BudgetAPIView, BudgetDetailAPIView, BudgetRecommendAPIView
+from budget.views import BudgetAPIView, BudgetAsyncAPIView, BudgetDetailAPIView, BudgetPeerComparisonAPIView, BudgetRecommendAPIView, BudgetRecommendAsyncAPIView, BudgetStatusAPIView, DailyBudgetPlanAPIView
 
 urlpatterns = [
     path('', BudgetAPIView.as_view()),
+    path('async/', BudgetAsyncAPIView.as_view()),
     path('<int:budget_id>/', BudgetDetailAPIView.as_view()),
+    path('peers/', BudgetPeerComparisonAPIView.as_view()),
     path('recommend/', BudgetRecommendAPIView.as_view()),
+    path('recommend/async/', BudgetRecommendAsyncAPIView.as_view()),
+    path('status/', BudgetStatusAPIView.as_view()),
+    path('today/', DailyBudgetPlanAPIView.as_view()),
 ]
\ No newline at end of file
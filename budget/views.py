@@ -1,48 +1,108 @@
-from django.db.models import Q, Sum, Count
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.utils import timezone
 from rest_framework.views import APIView
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from budget.models import Budget
-from budget.serializers import BudgetCreateSerializer, BudgetDetailSerializer, BudgetListSerializer, BudgetRecommendInputSerializer, BudgetRecommendOutputSerializer, BudgetSerializer, BudgetUpdateSerializer
-from categories.models import Category
+from budget import consumption, peers, plans, recommendation, statistics
+from budget.models import Budget, DailyBudgetPlan
+from budget.serializers import BudgetCreateSerializer, BudgetPeerComparisonSerializer, DailyBudgetPlanSerializer, BudgetDetailSerializer, BudgetListSerializer, BudgetRecommendInputSerializer, BudgetRecommendOutputSerializer, BudgetSerializer, BudgetStatusSerializer, BudgetUpdateSerializer
+from categories.registry import registry
+from common.pagination import KeysetPagination
+from common.response_cache import bump_user_version, cache_response
+from common.views import AsyncAPIView, InstrumentedViewMixin
+
+
+class BudgetListMixin:
+    """
+    예산 목록 조회 API 의 동기/비동기 버전이 함께 사용하는 조회 조건 해석과 응답 생성
+    """
+    list_ordering = ('start_date', 'id')
+
+    def list_queryset(self, request):
+        """
+        조회할 예산 queryset (values) 또는 오류 응답
+        """
+        user = request.user
+        month = request.query_params.get('month', None)
+
+        year = request.query_params.get('year', None)
+
+        if month is None:
+            budget_list = Budget.objects.filter(user=user)
+        else:
+            try:
+                month_start = date(int(year) if year is not None else 2000, int(month), 1)
+            except ValueError:
+                return Response({"message" : "검색 연도/월을 확인해주세요."}, status=status.HTTP_400_BAD_REQUEST)
+
+            if year is None:
+                # 연도가 없으면 모든 연도의 해당 월 (기존 동작)
+                budget_list = Budget.objects.filter(user=user, start_date__month=month_start.month)
+            else:
+                # 인덱스를 사용할 수 있도록 월 조건을 시작일 범위로 조회
+                next_month_start = (month_start + timedelta(days=31)).replace(day=1)
+                budget_list = Budget.objects.filter(user=user, start_date__gte=month_start, start_date__lt=next_month_start)
+
+        return BudgetListSerializer.values(budget_list)
+
+    def list_response(self, paginator, page):
+        with self.timing('serialize'):
+            data = BudgetListSerializer.represent_values(page)
+
+        # 다음 페이지 주소는 Link 헤더로 전달
+        return Response(data, status=status.HTTP_200_OK, headers=paginator.get_link_header())
 
-import math
 
 # api/v1/budget/
-class BudgetAPIView(APIView):
+class BudgetAPIView(InstrumentedViewMixin, BudgetListMixin, APIView):
     permission_classes = [IsAuthenticated]
+    # 요청당 최대 쿼리 수 (인증 포함)
+    query_budget = {'get' : 2}
+    # GET 조회는 read replica 사용 (설정된 경우)
+    read_replica = True
 
     query_month = openapi.Parameter(
         "month", openapi.IN_QUERY, type=openapi.TYPE_NUMBER, description="검색 월"
     )
+    query_year = openapi.Parameter(
+        "year", openapi.IN_QUERY, type=openapi.TYPE_NUMBER, description="검색 연도 (없으면 모든 연도의 검색 월, 함께 지정하면 인덱스로 조회)"
+    )
+    query_cursor = openapi.Parameter(
+        "cursor", openapi.IN_QUERY, type=openapi.TYPE_STRING, description="다음 페이지 cursor (Link 헤더)"
+    )
+    query_page_size = openapi.Parameter(
+        "page_size", openapi.IN_QUERY, type=openapi.TYPE_NUMBER, description="페이지 크기"
+    )
     @swagger_auto_schema(
         request_body=None,
         manual_parameters=[
-            query_month
+            query_month,
+            query_year,
+            query_cursor,
+            query_page_size
         ],
         responses={
             status.HTTP_200_OK : BudgetListSerializer
         }
     )
+    @cache_response
     def get(self, request):
         """
         예산 목록
         """
-        user = request.user
-        month = request.query_params.get('month', None)
-
-        if month is None:
-            budget_list = Budget.objects.filter(user=user)
-        else:
-            budget_list = Budget.objects.filter(user=user, start_date__month=month)
-        
-        serializer = BudgetListSerializer(budget_list, many=True)
+        budget_list = self.list_queryset(request)
+        if isinstance(budget_list, Response):
+            return budget_list
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = KeysetPagination(ordering=self.list_ordering)
+        page = paginator.paginate_queryset(budget_list, request)
+        return self.list_response(paginator, page)
     
     
     @swagger_auto_schema(
@@ -62,27 +122,65 @@ class BudgetAPIView(APIView):
         if start_date is None or end_date is None:
             return Response({"message" : "기간을 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST)
         
-        result = []
-        input_data = {
-            "user" : user.id,
-            "start_date" : start_date,
-            "end_date" : end_date
-        }
-        budget_data = request.data.get('budget_data')
-        for category, money in budget_data.items():
-            try:
-                category_id = Category.objects.get(name=category).id
-            except:
+        input_serializer = BudgetCreateSerializer(data=request.data)
+        input_serializer.is_valid(raise_exception=True)
+        start_date = input_serializer.validated_data['start_date']
+        end_date = input_serializer.validated_data['end_date']
+        budget_data = input_serializer.validated_data['budget_data']
+        upsert = input_serializer.validated_data['upsert']
+
+        # 카테고리명은 프로세스 캐시에서 조회
+        categories = { name : registry.get_by_name(name) for name in budget_data.keys() }
+        for category in budget_data.keys():
+            if categories[category] is None:
                 return Response({"message" : f"{category} : 해당 카테고리는 사용할 수 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
 
-            input_data['category'] = category_id
-            input_data['money'] = money
-
-            serializer = BudgetSerializer(data=input_data)
-            serializer.is_valid(raise_exception=True)
-            saved_data = serializer.save()
-            output_data = BudgetDetailSerializer(saved_data).data
-            result.append(output_data)
+        existing = {}
+        if upsert:
+            existing_budgets = Budget.objects.filter(
+                user=user,
+                category__in=categories.values(),
+                start_date=start_date,
+                end_date=end_date
+            ).order_by('id')
+            existing = { budget.category_id : budget for budget in existing_budgets }
+
+        now = timezone.now()
+        budgets, created, updated, deltas = [], [], [], {}
+        for category, money in budget_data.items():
+            category_instance = categories[category]
+            budget = existing.get(category_instance.id)
+
+            if budget is None:
+                budget = Budget(
+                    user=user,
+                    category=category_instance,
+                    money=money,
+                    start_date=start_date,
+                    end_date=end_date
+                )
+                created.append(budget)
+                deltas[category_instance.id] = (money, 1)
+            else:
+                deltas[category_instance.id] = (money - budget.money, 0)
+                budget.money = money
+                budget.updated_at = now
+                budget.category = category_instance
+                updated.append(budget)
+
+            budgets.append(budget)
+
+        # 전체 예산을 하나의 트랜잭션으로 저장 (bulk 작업은 signal 이 발생하지 않으므로 통계를 직접 반영)
+        with transaction.atomic():
+            Budget.objects.bulk_create(created)
+            Budget.objects.bulk_update(updated, ['money', 'updated_at'])
+            for category_id, (money, count) in deltas.items():
+                statistics.apply(category_id, money, count)
+            # 배치로 계산된 오늘의 지출 계획은 다음 조회 시 다시 계산
+            plans.invalidate(user.id)
+            bump_user_version(user.id)
+
+        result = [BudgetDetailSerializer(budget).data for budget in budgets]
 
         return Response(result, status=status.HTTP_201_CREATED)
         
@@ -90,13 +188,14 @@ class BudgetAPIView(APIView):
 # api/v1/budget/<int:budget_id>/
 class BudgetDetailAPIView(APIView):
     permission_classes = [IsAuthenticated]
+    query_budget = {'get' : 2}
 
 
     def get(self, request, budget_id):
         user = request.user
 
         try:
-            budget = Budget.objects.get(id=budget_id, user=user)
+            budget = Budget.objects.select_related('category').get(id=budget_id, user=user)
             serializer = BudgetDetailSerializer(budget)
             return Response(serializer.data, status=status.HTTP_200_OK)
         
@@ -114,7 +213,7 @@ class BudgetDetailAPIView(APIView):
         user = request.user
 
         try:
-            budget = Budget.objects.get(id=budget_id, user=user)
+            budget = Budget.objects.select_related('category').get(id=budget_id, user=user)
         except Exception as e:
             return Response({"error_message" : str(e), "message" : "해당 예산 정보를 수정할 수 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
         
@@ -139,42 +238,192 @@ class BudgetDetailAPIView(APIView):
         return Response({"message" : "예산 정보가 삭제되었습니다."}, status=status.HTTP_200_OK)
 
 
-# api/v1/budget/recommend/
-class BudgetRecommendAPIView(APIView):
+# api/v1/budget/status/
+class BudgetStatusAPIView(InstrumentedViewMixin, APIView):
     permission_classes = [IsAuthenticated]
+    query_budget = {'get' : 2}
+    read_replica = True
 
+    query_date = openapi.Parameter(
+        "date", openapi.IN_QUERY, type=openapi.TYPE_STRING, description="기준일 (기본값 : 오늘)"
+    )
     @swagger_auto_schema(
-        request_body = BudgetRecommendInputSerializer,
+        request_body=None,
+        manual_parameters=[
+            query_date
+        ],
         responses={
-            status.HTTP_200_OK : BudgetRecommendOutputSerializer
+            status.HTTP_200_OK : BudgetStatusSerializer(many=True)
         }
     )
-    def post(self, request):
+    def get(self, request):
+        """
+        진행 중인 예산별 지출 현황
+        """
+        try:
+            today = date.fromisoformat(request.query_params.get('date', timezone.localdate().isoformat()))
+        except ValueError:
+            return Response({"message" : "기준일 형식(YYYY-MM-DD)을 확인해주세요."}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = consumption.budget_status(request.user, today)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+
+# api/v1/budget/today/
+class DailyBudgetPlanAPIView(InstrumentedViewMixin, APIView):
+    permission_classes = [IsAuthenticated]
+    # 인증 + 계획 조회, 배치 결과가 없으면 예산/지출 조회 + 저장
+    query_budget = {'get' : 4}
+
+    @swagger_auto_schema(
+        request_body=None,
+        responses={
+            status.HTTP_200_OK : DailyBudgetPlanSerializer(many=True)
+        }
+    )
+    def get(self, request):
+        """
+        오늘 카테고리별 지출 가능 금액 (매일 배치로 미리 계산된 값)
+        """
         user = request.user
-        
-        budget = request.data.get('budget', None)
-        if budget is None:
-            return Response({"message" : "총 예산을 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # 통계치 계산
-        all_budget = Budget.objects.all()
-        all_category = Category.objects.all().values_list('name', flat=True)
+        today = timezone.localdate()
+
+        daily_plans = list(DailyBudgetPlan.objects.select_related('category').filter(user=user, plan_date=today).order_by('category'))
+        if not daily_plans:
+            # 배치 이후 예산을 만들거나 수정한 경우(저장 시 계획 삭제) 등은 요청 시점에 계산
+            daily_plans = sorted(plans.build_user_plans(user, today), key=lambda plan: plan.category_id)
+
+        with self.timing('serialize'):
+            categories = DailyBudgetPlanSerializer(daily_plans, many=True).data
+
+        data = {
+            "date" : today,
+            "total" : sum(plan.daily_allowance for plan in daily_plans),
+            "categories" : categories
+        }
+
+        return Response(data, status=status.HTTP_200_OK)
+
+
+# api/v1/budget/peers/
+class BudgetPeerComparisonAPIView(InstrumentedViewMixin, APIView):
+    permission_classes = [IsAuthenticated]
+    # 비교 통계는 캐시에서 조회
+    query_budget = {'get' : 3}
+
+    @swagger_auto_schema(
+        request_body=None,
+        responses={
+            status.HTTP_200_OK : BudgetPeerComparisonSerializer
+        }
+    )
+    def get(self, request):
+        """
+        카테고리별 이번 달 지출/예산 비율을 다른 사용자와 비교 (매일 배치로 계산된 통계 사용)
+        """
+        data = peers.compare(request.user, timezone.localdate())
+        if data is None:
+            return Response({"message" : "비교 통계가 아직 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+
+# api/v1/budget/async/
+class BudgetAsyncAPIView(InstrumentedViewMixin, BudgetListMixin, AsyncAPIView):
+    """
+    예산 목록 조회 API 의 비동기 버전 (ASGI 배포용, 응답 형식은 동일)
+    """
+    permission_classes = [IsAuthenticated]
+    query_budget = {'get' : 2}
+    read_replica = True
+
+    @swagger_auto_schema(
+        request_body=None,
+        manual_parameters=[
+            BudgetAPIView.query_month,
+            BudgetAPIView.query_year,
+            BudgetAPIView.query_cursor,
+            BudgetAPIView.query_page_size
+        ],
+        responses={
+            status.HTTP_200_OK : BudgetListSerializer
+        }
+    )
+    @cache_response
+    async def get(self, request):
+        """
+        예산 목록 (async)
+        """
+        budget_list = self.list_queryset(request)
+        if isinstance(budget_list, Response):
+            return budget_list
+
+        paginator = KeysetPagination(ordering=self.list_ordering)
+        page = await paginator.apaginate_queryset(budget_list, request)
+        return self.list_response(paginator, page)
+
 
-        sum_category_budget = all_budget.values('category__name').annotate(Sum('money')).order_by('category')
-        sum_budget = all_budget.aggregate(Sum('money'))
+class BudgetRecommendMixin:
+    """
+    예산 추천 API 의 동기/비동기 버전이 함께 사용하는 입력 검증과 응답 생성
+    """
 
-        avg_list = { k : 0 for k in all_category }
-        for category_budget in sum_category_budget:
-            avg_list[category_budget['category__name']] = round(category_budget['money__sum'] / sum_budget['money__sum'], 2)
+    def recommend_input(self, request):
+        """
+        총 예산 또는 오류 응답
+        """
+        if request.data.get('budget', None) is None:
+            return Response({"message" : "총 예산을 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST)
 
-        budget_data = { k : v * budget for k, v in avg_list.items()}
+        serializer = BudgetRecommendInputSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return serializer.validated_data['budget']
 
+    def recommend_response(self, budget, weights):
+        # 배치로 계산한 사용자별 카테고리 비율의 대표값으로 배분 (합계는 입력한 총 예산과 같음)
         data = {
-            "budget_data" : budget_data
+            "budget_data" : recommendation.allocate(budget, weights)
         }
 
         return Response(data, status=status.HTTP_200_OK)
 
 
+# api/v1/budget/recommend/
+class BudgetRecommendAPIView(BudgetRecommendMixin, APIView):
+    permission_classes = [IsAuthenticated]
 
+    @swagger_auto_schema(
+        request_body = BudgetRecommendInputSerializer,
+        responses={
+            status.HTTP_200_OK : BudgetRecommendOutputSerializer
+        }
+    )
+    def post(self, request):
+        budget = self.recommend_input(request)
+        if isinstance(budget, Response):
+            return budget
+
+        return self.recommend_response(budget, recommendation.weights())
+
+
+# api/v1/budget/recommend/async/
+class BudgetRecommendAsyncAPIView(BudgetRecommendMixin, AsyncAPIView):
+    """
+    예산 추천 API 의 비동기 버전 (ASGI 배포용, 응답 형식은 동일)
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        request_body = BudgetRecommendInputSerializer,
+        responses={
+            status.HTTP_200_OK : BudgetRecommendOutputSerializer
+        }
+    )
+    async def post(self, request):
+        budget = self.recommend_input(request)
+        if isinstance(budget, Response):
+            return budget
 
+        return self.recommend_response(budget, await recommendation.aweights())
@@ -0,0 +1,92 @@
+import hashlib
+import threading
+import uuid
+
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from categories.models import Category
+from categories.serializers import CategorySerializer
+
+
+VERSION_KEY = 'categories:version'
+
+
+class CategoryRegistry:
+    """
+    프로세스 단위 카테고리 캐시 (name -> Category, id -> Category, 목록 응답 JSON/ETag)
+    공유 캐시의 버전 값이 바뀌면(카테고리 변경 signal) 다시 불러오므로 여러 worker 간에도 일관성 유지
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._data = None
+
+    def _shared_version(self):
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+            version = cache.get(VERSION_KEY)
+        return version
+
+    def _load(self):
+        categories = list(Category.objects.order_by('id'))
+        body = JSONRenderer().render(CategorySerializer(categories, many=True).data)
+        return {
+            'by_name' : {category.name : category for category in categories},
+            'by_id' : {category.id : category for category in categories},
+            'body' : body,
+            'etag' : f'"{hashlib.md5(body).hexdigest()}"',
+        }
+
+    def _get(self):
+        version = self._shared_version()
+        data = self._data
+        if data is not None and version == self._version:
+            return data
+
+        with self._lock:
+            if self._data is None or version != self._version:
+                self._data = self._load()
+                self._version = version
+            return self._data
+
+    def invalidate(self):
+        """
+        모든 worker 의 카테고리 캐시를 무효화
+        """
+        cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+        with self._lock:
+            self._data = None
+
+    def get(self, name):
+        """
+        Category.objects.get(name=name) 과 같이 없으면 Category.DoesNotExist 발생
+        """
+        category = self.get_by_name(name)
+        if category is None:
+            raise Category.DoesNotExist("Category matching query does not exist.")
+        return category
+
+    def get_by_name(self, name):
+        return self._get()['by_name'].get(name)
+
+    def get_by_id(self, category_id):
+        return self._get()['by_id'].get(category_id)
+
+    def name_to_id(self):
+        return {name : category.id for name, category in self._get()['by_name'].items()}
+
+    def all(self):
+        return list(self._get()['by_id'].values())
+
+    def response_body(self):
+        """
+        (목록 응답 JSON bytes, ETag)
+        """
+        data = self._get()
+        return data['body'], data['etag']
+
+
+registry = CategoryRegistry()
@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from categories.models import Category
+from categories.registry import registry
+from common.response_cache import bump_global_version
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_registry(sender, **kwargs):
+    # 현재 프로세스는 즉시, 커밋 전에 다른 worker 가 이전 값을 다시 불러온 경우를 위해 커밋 후 한 번 더 무효화
+    registry.invalidate()
+    transaction.on_commit(registry.invalidate)
+    # 목록 응답에 카테고리명이 포함되므로 캐시된 응답도 무효화
+    bump_global_version()
@@ -1,3 +1,81 @@
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from categories.models import Category
+from categories.registry import CategoryRegistry, registry
+
+
+class CategoryRegistryTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='식비', description='식비')
+
+    def setUp(self):
+        cache.clear()
+        registry.invalidate()
+
+    def test_invalidated_on_save_and_delete(self):
+        # 다른 worker 의 registry (공유 캐시의 version 으로만 변경을 알 수 있음)
+        other = CategoryRegistry()
+        self.assertEqual(other.get_by_name('식비'), self.category)
+
+        self.category.name = '외식'
+        self.category.save()
+        created = Category.objects.create(name='교통', description='교통')
+
+        for current in (registry, other):
+            self.assertIsNone(current.get_by_name('식비'))
+            self.assertEqual(current.get_by_name('외식').id, self.category.id)
+            self.assertEqual(current.get_by_id(created.id).name, '교통')
+
+        created.delete()
+
+        self.assertIsNone(other.get_by_name('교통'))
+        self.assertEqual(other.name_to_id(), {'외식' : self.category.id})
+        with self.assertRaises(Category.DoesNotExist):
+            registry.get('교통')
+
+    def test_lookups_use_loaded_data(self):
+        registry.get('식비')
+
+        with CaptureQueriesContext(connection) as context:
+            registry.get('식비')
+            registry.get_by_id(self.category.id)
+
+        self.assertEqual(len(context.captured_queries), 0)
+
+
+class CategoryAPITest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='식비', description='식비')
+
+    def setUp(self):
+        cache.clear()
+        registry.invalidate()
+        self.client = APIClient()
+
+    def test_etag_not_modified(self):
+        first = self.client.get('/api/v1/categories/')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json(), [{'id' : self.category.id, 'name' : '식비', 'description' : '식비'}])
+
+        with CaptureQueriesContext(connection) as context:
+            not_modified = self.client.get('/api/v1/categories/', HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], first['ETag'])
+        self.assertEqual(len(context.captured_queries), 0)
+
+        Category.objects.create(name='교통', description='교통')
+        changed = self.client.get('/api/v1/categories/', HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+        self.assertEqual([row['name'] for row in changed.json()], ['식비', '교통'])
@@ -1,10 +1,11 @@
+from django.http import HttpResponse, HttpResponseNotModified
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from drf_yasg.utils import swagger_auto_schema
 
-from categories.models import Category
+from categories.registry import registry
 from categories.serializers import CategorySerializer
 
 class CategoryAPIView(APIView):
@@ -17,7 +18,14 @@ class CategoryAPIView(APIView):
         }
     )
     def get(self, request):
-        queryset = Category.objects.all()
-        serializer = CategorySerializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # 미리 만들어 둔 JSON 응답을 그대로 반환 (변경이 없으면 304)
+        body, etag = registry.response_body()
+
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type='application/json')
+
+        response['ETag'] = etag
+        return response
 
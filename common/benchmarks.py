@@ -0,0 +1,267 @@
+import io
+import json
+import math
+import platform
+import statistics
+import time
+from contextlib import nullcontext
+from datetime import timedelta
+
+import django
+from django.db import connection, transaction
+from django.db.models import Count, Max
+from django.urls import URLPattern, URLResolver, get_resolver, resolve
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from budget.models import Budget
+from categories.models import Category
+from common.middleware import QueryCounter
+from common.synthetic import PASSWORD
+from expenditure.models import Expenditure
+from users.models import User
+
+
+# 측정 대상에서 제외하는 route (관리자, 문서, 정적 파일)
+EXCLUDED_ROUTES = ('admin/', 'swagger/', 'static/', 'media/', '^static/', '^media/')
+
+
+class Scenario:
+    """
+    측정할 요청 하나
+    path, params, data 는 값 또는 (context, 반복 번호) 를 받는 함수
+    write=True 인 요청은 매번 transaction 을 rollback 해서 데이터를 유지
+    """
+
+    def __init__(self, name, method, path, params=None, data=None, format='json', write=False, auth=True, iterations=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.params = params
+        self.data = data
+        self.format = format
+        self.write = write
+        self.auth = auth
+        self.iterations = iterations
+
+    def resolve(self, value, context, number):
+        return value(context, number) if callable(value) else value
+
+    def request(self, client, context, number):
+        path = self.resolve(self.path, context, number).format(**context)
+        if self.method == 'get':
+            return client.get(path, self.resolve(self.params, context, number))
+        data = self.resolve(self.data, context, number)
+        return getattr(client, self.method)(path, data, format=self.format)
+
+
+def _import_file(context, number):
+    lines = ['expense_date,category,money,comment']
+    lines += [f"{context['end_date']},{context['category']},{1000 + row},benchmark" for row in range(100)]
+    upload = io.BytesIO('\n'.join(lines).encode())
+    upload.name = 'benchmark.csv'
+    return {'file' : upload}
+
+
+def _period(context, number):
+    return {'start_date' : context['start_date'], 'end_date' : context['end_date']}
+
+
+# 로그인/가입은 비밀번호 hash 비용이 커서 반복 횟수를 줄임
+SCENARIOS = [
+    Scenario('users.signup', 'post', '/api/v1/users/signup/', data=lambda context, number: {'username' : f'bench-{number}', 'password' : 'bench-password'}, write=True, auth=False, iterations=5),
+    Scenario('users.login', 'post', '/api/v1/users/login/', data=lambda context, number: {'username' : context['username'], 'password' : PASSWORD}, auth=False, iterations=5),
+    Scenario('users.logout', 'post', '/api/v1/users/logout/', write=True),
+    Scenario('users.token', 'post', '/api/v1/users/token/', data=lambda context, number: {'username' : context['username'], 'password' : PASSWORD}, auth=False, iterations=5),
+    Scenario('users.token_refresh', 'post', '/api/v1/users/token/refresh/', data=lambda context, number: {'refresh' : str(RefreshToken.for_user(context['user']))}, write=True, auth=False),
+
+    Scenario('categories.list', 'get', '/api/v1/categories/', auth=False),
+
+    Scenario('budget.list', 'get', '/api/v1/budget/'),
+    Scenario('budget.list_month', 'get', '/api/v1/budget/', params=lambda context, number: {'month' : context['month'], 'year' : context['year']}),
+    Scenario('budget.list_async', 'get', '/api/v1/budget/async/'),
+    Scenario('budget.create', 'post', '/api/v1/budget/', data=lambda context, number: {'start_date' : context['next_start_date'], 'end_date' : context['next_end_date'], 'budget_data' : {context['category'] : 100000}, 'upsert' : True}, write=True),
+    Scenario('budget.detail', 'get', '/api/v1/budget/{budget_id}/'),
+    Scenario('budget.update', 'put', '/api/v1/budget/{budget_id}/', data={'money' : 123000}, write=True),
+    Scenario('budget.delete', 'delete', '/api/v1/budget/{budget_id}/', write=True),
+    Scenario('budget.peers', 'get', '/api/v1/budget/peers/'),
+    Scenario('budget.recommend', 'post', '/api/v1/budget/recommend/', data={'budget' : 1000000}),
+    Scenario('budget.recommend_async', 'post', '/api/v1/budget/recommend/async/', data={'budget' : 1000000}),
+    Scenario('budget.status', 'get', '/api/v1/budget/status/', params=lambda context, number: {'date' : context['end_date']}),
+    Scenario('budget.today', 'get', '/api/v1/budget/today/'),
+
+    Scenario('expenditure.list', 'get', '/api/v1/expenditure/', params=_period),
+    Scenario('expenditure.list_filtered', 'get', '/api/v1/expenditure/', params=lambda context, number: {**_period(context, number), 'category' : context['category'], 'min_m' : 1000, 'max_m' : 50000}),
+    Scenario('expenditure.list_async', 'get', '/api/v1/expenditure/async/', params=_period),
+    Scenario('expenditure.create', 'post', '/api/v1/expenditure/', data=lambda context, number: {'money' : 12000, 'comment' : 'benchmark', 'category' : context['category'], 'expense_date' : context['end_date']}, write=True),
+    Scenario('expenditure.report_day', 'get', '/api/v1/expenditure/report/', params=lambda context, number: {**_period(context, number), 'interval' : 'day'}),
+    Scenario('expenditure.report_month', 'get', '/api/v1/expenditure/report/', params=lambda context, number: {'start_date' : context['first_date'], 'end_date' : context['end_date'], 'interval' : 'month'}),
+    Scenario('expenditure.export', 'get', '/api/v1/expenditure/export/', params={'format' : 'csv'}, iterations=5),
+    Scenario('expenditure.import', 'post', '/api/v1/expenditure/import/', data=_import_file, format='multipart', write=True, iterations=10),
+    Scenario('expenditure.detail', 'get', '/api/v1/expenditure/{expenditure_id}/'),
+    Scenario('expenditure.update', 'put', '/api/v1/expenditure/{expenditure_id}/', data=lambda context, number: {'money' : 4500, 'category' : context['category']}, write=True),
+    Scenario('expenditure.delete', 'delete', '/api/v1/expenditure/{expenditure_id}/', write=True),
+
+    Scenario('metrics', 'get', '/metrics', auth=False),
+]
+
+
+def build_context(username=None, prefix='synthetic'):
+    """
+    측정에 사용할 사용자와 경로/파라미터 값 (기본값 : 지출이 가장 많은 seed 사용자)
+    """
+    if username is not None:
+        user = User.objects.get(username=username)
+    else:
+        user = (
+            User.objects.filter(username__startswith=f'{prefix}-')
+            .annotate(expenditure_count=Count('expenditure'))
+            .order_by('-expenditure_count', 'id')
+            .first()
+        )
+        if user is None:
+            raise User.DoesNotExist(f"'{prefix}-' 사용자가 없습니다. seed_synthetic 을 먼저 실행해주세요.")
+
+    last_date = Expenditure.objects.filter(user=user).aggregate(Max('expense_date'))['expense_date__max'] or timezone.localdate()
+    first_date = (last_date.replace(day=1) - timedelta(days=1)).replace(day=1)
+    next_start_date = (last_date.replace(day=1) + timedelta(days=32)).replace(day=1)
+    next_end_date = (next_start_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    budget = Budget.objects.filter(user=user).order_by('id').first()
+    expenditure = Expenditure.objects.filter(user=user).order_by('id').first()
+
+    return {
+        'user' : user,
+        'username' : user.username,
+        'budget_id' : budget.id if budget else 0,
+        'expenditure_id' : expenditure.id if expenditure else 0,
+        'category' : Category.objects.order_by('id').values_list('name', flat=True).first(),
+        'first_date' : first_date.isoformat(),
+        'start_date' : last_date.replace(day=1).isoformat(),
+        'end_date' : last_date.isoformat(),
+        'next_start_date' : next_start_date.isoformat(),
+        'next_end_date' : next_end_date.isoformat(),
+        'month' : last_date.month,
+        'year' : last_date.year,
+    }
+
+
+def routes():
+    """
+    config/urls.py 에 등록된 route 목록 (EXCLUDED_ROUTES 제외)
+    """
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, route)
+            elif isinstance(pattern, URLPattern):
+                yield route
+
+    return {route for route in walk(get_resolver().url_patterns, '') if not route.startswith(EXCLUDED_ROUTES)}
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _consume(response):
+    if getattr(response, 'streaming', False):
+        return b''.join(response.streaming_content)
+    return response.content
+
+
+def run_scenario(scenario, context, iterations, warmup):
+    client = APIClient()
+    if scenario.auth:
+        client.force_authenticate(context['user'])
+
+    latencies, query_counts, statuses = [], [], set()
+    for number in range(warmup + (scenario.iterations or iterations)):
+        counter = QueryCounter()
+        with transaction.atomic() if scenario.write else nullcontext():
+            with connection.execute_wrapper(counter):
+                started = time.perf_counter()
+                response = scenario.request(client, context, number)
+                _consume(response)
+                elapsed = time.perf_counter() - started
+            if scenario.write:
+                transaction.set_rollback(True)
+
+        if number >= warmup:
+            latencies.append(elapsed)
+            query_counts.append(counter.count)
+            statuses.add(response.status_code)
+
+    return {
+        'method' : scenario.method.upper(),
+        'route' : resolve(scenario.resolve(scenario.path, context, 0).format(**context)).route,
+        'status' : sorted(statuses),
+        'iterations' : len(latencies),
+        'p50_ms' : round(percentile(latencies, 0.5) * 1000, 3),
+        'p99_ms' : round(percentile(latencies, 0.99) * 1000, 3),
+        'mean_ms' : round(statistics.mean(latencies) * 1000, 3),
+        'queries' : max(query_counts),
+    }
+
+
+def run(context, iterations=50, warmup=3, only=None):
+    results = {}
+    for scenario in SCENARIOS:
+        if only and not any(scenario.name.startswith(prefix) for prefix in only):
+            continue
+        results[scenario.name] = run_scenario(scenario, context, iterations, warmup)
+
+    user = context['user']
+    return {
+        'meta' : {
+            'created_at' : timezone.now().isoformat(timespec='seconds'),
+            'python' : platform.python_version(),
+            'django' : django.get_version(),
+            'database' : connection.vendor,
+            'user' : user.username,
+            'user_expenditures' : Expenditure.objects.filter(user=user).count(),
+            'user_budgets' : Budget.objects.filter(user=user).count(),
+            'total_expenditures' : Expenditure.objects.count(),
+        },
+        'results' : results,
+    }
+
+
+def compare(results, baseline, tolerance=0.5, min_delta_ms=1.0):
+    """
+    baseline 대비 쿼리 수가 늘었거나 p50 응답 시간이 tolerance 이상(최소 min_delta_ms) 느려진 항목 목록
+    """
+    regressions = []
+    for name, result in results['results'].items():
+        expected = baseline['results'].get(name)
+        if expected is None:
+            continue
+
+        if result['queries'] > expected['queries']:
+            regressions.append((name, 'queries', expected['queries'], result['queries']))
+
+        p50, expected_p50 = result['p50_ms'], expected['p50_ms']
+        if p50 > expected_p50 * (1 + tolerance) and p50 - expected_p50 > min_delta_ms:
+            regressions.append((name, 'p50_ms', expected_p50, p50))
+
+    return regressions
+
+
+def missing(results, baseline):
+    """
+    측정했지만 baseline 에 없는 항목 (시나리오를 추가한 뒤 baseline 을 갱신하지 않은 경우)
+    """
+    return sorted(name for name in results['results'] if name not in baseline['results'])
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+        f.write('\n')
@@ -0,0 +1,67 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from common import benchmarks
+from users.models import User
+
+
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, 'benchmarks', 'baseline.json')
+
+
+class Command(BaseCommand):
+    help = (
+        "config/urls.py 의 모든 API 를 test client 로 호출해 p50/p99 응답 시간과 쿼리 수를 측정합니다. "
+        "seed_synthetic 으로 생성한 데이터를 사용하며, --baseline 과 비교해 느려진 API 가 있으면 실패합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="측정에 사용할 계정명 (기본값 : 지출이 가장 많은 seed 사용자)")
+        parser.add_argument('--prefix', default='synthetic', help="seed_synthetic 의 --prefix")
+        parser.add_argument('--iterations', type=int, default=50, help="API 별 측정 횟수")
+        parser.add_argument('--warmup', type=int, default=3, help="API 별 예열 횟수")
+        parser.add_argument('--only', nargs='*', help="측정할 항목 이름 prefix (예: expenditure budget.list)")
+        parser.add_argument('--output', help="측정 결과를 저장할 JSON 경로 (baseline 갱신 시 사용)")
+        parser.add_argument('--baseline', nargs='?', const=DEFAULT_BASELINE, help=f"비교할 baseline JSON (기본값 : {DEFAULT_BASELINE})")
+        parser.add_argument('--tolerance', type=float, default=0.5, help="허용하는 p50 증가 비율 (측정 환경 차이를 고려해 여유 있게 설정)")
+        parser.add_argument('--strict', action='store_true', help="측정 항목이 없는 API 가 있으면 실패")
+
+    def handle(self, *args, **options):
+        try:
+            context = benchmarks.build_context(options['user'], options['prefix'])
+        except User.DoesNotExist as e:
+            raise CommandError(str(e) or "사용자를 찾을 수 없습니다.")
+
+        results = benchmarks.run(context, iterations=options['iterations'], warmup=options['warmup'], only=options['only'])
+
+        self.stdout.write(f"{'항목':<28} {'route':<52} {'p50(ms)':>9} {'p99(ms)':>9} {'쿼리':>5}  status")
+        for name, result in results['results'].items():
+            self.stdout.write(
+                f"{name:<28} {result['method'] + ' ' + result['route']:<52} "
+                f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['queries']:>5}  {result['status']}"
+            )
+
+        measured = {result['route'] for result in results['results'].values()}
+        missing = sorted(benchmarks.routes() - measured)
+        if missing and not options['only']:
+            self.stdout.write(self.style.WARNING(f"측정 항목이 없는 API : {', '.join(missing)}"))
+            if options['strict']:
+                raise CommandError("모든 API 에 측정 항목을 추가해주세요.")
+
+        if options['output']:
+            benchmarks.save(results, options['output'])
+            self.stdout.write(f"결과를 저장했습니다 : {options['output']}")
+
+        if options['baseline']:
+            baseline = benchmarks.load(options['baseline'])
+            regressions = benchmarks.compare(results, baseline, tolerance=options['tolerance'])
+            for name, metric, expected, actual in regressions:
+                self.stdout.write(self.style.ERROR(f"{name} : {metric} {expected} -> {actual}"))
+            if regressions:
+                raise CommandError(f"baseline 보다 느려진 항목이 {len(regressions)}개 있습니다.")
+
+            missing = benchmarks.missing(results, baseline)
+            if missing:
+                raise CommandError(f"baseline 에 없는 항목이 있습니다 : {', '.join(missing)} (--output 으로 baseline 을 갱신해주세요)")
+            self.stdout.write(self.style.SUCCESS("baseline 대비 느려진 항목이 없습니다."))
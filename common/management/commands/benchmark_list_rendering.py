@@ -0,0 +1,88 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from budget.models import Budget
+from budget.serializers import BudgetListSerializer
+from categories.models import Category
+from common.renderers import FastJSONRenderer, orjson
+from expenditure.models import Expenditure
+from expenditure.serializers import ExpenditureListSerializer
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "목록 응답의 기존 경로(ModelSerializer + JSONRenderer)와 values() + FastJSONRenderer 경로를 비교합니다. 생성한 데이터는 종료 시 롤백됩니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help="응답 행 수")
+        parser.add_argument('--repeat', type=int, default=5, help="반복 횟수 (최솟값 기준)")
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+
+        with transaction.atomic():
+            querysets = self.create_rows(rows)
+
+            self.stdout.write(f"{rows}행, {repeat}회 반복 (orjson {'사용' if orjson else '미설치'})")
+            for name, serializer_class, queryset, ordering in querysets:
+                self.compare(name, serializer_class, queryset, ordering, repeat)
+
+            transaction.set_rollback(True)
+
+    def create_rows(self, rows):
+        user = User.objects.create_user(username='benchmark-list-rendering', password=None)
+        categories = [
+            Category.objects.get_or_create(name=name, defaults={'description' : name})[0]
+            for name in ('식비', '교통', '카페', '쇼핑')
+        ]
+
+        start = date(2023, 1, 1)
+        Expenditure.objects.bulk_create([
+            Expenditure(user=user, category=random.choice(categories), money=random.randint(0, 100000), expense_date=start + timedelta(days=i % 365))
+            for i in range(rows)
+        ], batch_size=1000)
+        Budget.objects.bulk_create([
+            Budget(user=user, category=random.choice(categories), money=random.randint(0, 1000000), start_date=start + timedelta(days=i % 365), end_date=start + timedelta(days=i % 365 + 30))
+            for i in range(rows)
+        ], batch_size=1000)
+
+        return [
+            ('지출 목록', ExpenditureListSerializer, Expenditure.objects.filter(user=user), ('expense_date', 'id')),
+            ('예산 목록', BudgetListSerializer, Budget.objects.filter(user=user), ('start_date', 'id')),
+        ]
+
+    def compare(self, name, serializer_class, queryset, ordering, repeat):
+        related = [field for field in ('user', 'category') if field in serializer_class.value_fields]
+
+        def baseline():
+            page = list(queryset.select_related(*related).order_by(*ordering))
+            return JSONRenderer().render(serializer_class(page, many=True).data)
+
+        def fast():
+            page = list(serializer_class.values(queryset).order_by(*ordering))
+            return FastJSONRenderer().render(serializer_class.represent_values(page))
+
+        baseline_body, baseline_time = self.measure(baseline, repeat)
+        fast_body, fast_time = self.measure(fast, repeat)
+
+        if baseline_body != fast_body:
+            raise CommandError(f"{name} : 두 경로의 응답이 다릅니다.")
+
+        self.stdout.write(
+            f"{name} : 기존 {baseline_time * 1000:.1f}ms, 변경 {fast_time * 1000:.1f}ms "
+            f"({baseline_time / fast_time:.1f}배), 응답 {len(fast_body)} bytes 동일"
+        )
+
+    def measure(self, func, repeat):
+        body, best = None, None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            body = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return body, best
@@ -0,0 +1,89 @@
+import http.client
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "실행 중인 서버(WSGI/ASGI)에 동시 요청을 보내 초당 처리량과 응답 시간을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help="요청 주소 (예: http://127.0.0.1:8000/api/v1/expenditure/)")
+        parser.add_argument('--method', default='GET')
+        parser.add_argument('--data', default=None, help="요청 본문 (JSON)")
+        parser.add_argument('--token', default=None, help="JWT access token")
+        parser.add_argument('--concurrency', type=int, default=16, help="동시 연결 수")
+        parser.add_argument('--duration', type=float, default=10, help="측정 시간(초)")
+        parser.add_argument('--warmup', type=float, default=1, help="측정 전 예열 시간(초)")
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme not in ('http', 'https') or not url.hostname:
+            raise CommandError("요청 주소를 확인해주세요.")
+
+        path = url.path + (f'?{url.query}' if url.query else '')
+        headers = {'Connection' : 'keep-alive'}
+        if options['token']:
+            headers['Authorization'] = f"Bearer {options['token']}"
+        body = options['data'].encode() if options['data'] else None
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+
+        connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        latencies, errors = [], []
+        lock = threading.Lock()
+
+        def worker(deadline, measure):
+            connection = connection_class(url.hostname, url.port)
+            local_latencies, local_errors = [], []
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        connection.request(options['method'], path, body=body, headers=headers)
+                        response = connection.getresponse()
+                        response.read()
+                    except (OSError, http.client.HTTPException) as e:
+                        local_errors.append(type(e).__name__)
+                        connection.close()
+                        continue
+                    if response.status >= 400:
+                        local_errors.append(response.status)
+                    local_latencies.append(time.perf_counter() - started)
+            finally:
+                connection.close()
+
+            if measure:
+                with lock:
+                    latencies.extend(local_latencies)
+                    errors.extend(local_errors)
+
+        def run(seconds, measure):
+            deadline = time.perf_counter() + seconds
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                for _ in range(options['concurrency']):
+                    executor.submit(worker, deadline, measure)
+
+        if options['warmup'] > 0:
+            run(options['warmup'], measure=False)
+
+        started = time.perf_counter()
+        run(options['duration'], measure=True)
+        elapsed = time.perf_counter() - started
+
+        if not latencies:
+            raise CommandError(f"성공한 요청이 없습니다. (오류 {len(errors)}건)")
+
+        latencies.sort()
+        percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+        self.stdout.write(
+            f"요청 {len(latencies)}건 / {elapsed:.1f}초 : {len(latencies) / elapsed:.1f} req/s, "
+            f"오류 {len(errors)}건\n"
+            f"응답 시간(ms) : 평균 {statistics.mean(latencies) * 1000:.1f}, "
+            f"p50 {percentile(0.5):.1f}, p95 {percentile(0.95):.1f}, p99 {percentile(0.99):.1f}"
+        )
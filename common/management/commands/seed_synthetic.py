@@ -0,0 +1,61 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from common import synthetic
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "성능 측정용 사용자/예산/지출 데이터를 생성합니다. (비밀번호 : synthetic-password)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help="생성할 사용자 수")
+        parser.add_argument('--expenditures', type=int, default=10000, help="생성할 지출 행 수 (전체)")
+        parser.add_argument('--months', type=int, default=3, help="데이터 기간 (최근 n개월)")
+        parser.add_argument('--end-date', help="데이터 기간 마지막 날 YYYY-MM-DD (기본값 : 오늘)")
+        parser.add_argument('--prefix', default='synthetic', help="사용자 계정명 prefix")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0, help="난수 seed (같은 값이면 같은 데이터 생성)")
+        parser.add_argument('--clear', action='store_true', help="같은 prefix 로 생성한 데이터를 삭제한 뒤 생성")
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['expenditures'] < 0 or options['months'] < 1:
+            raise CommandError("사용자 수, 지출 행 수, 기간을 확인해주세요.")
+
+        try:
+            end_date = date.fromisoformat(options['end_date']) if options['end_date'] else None
+        except ValueError:
+            raise CommandError("기간 형식(YYYY-MM-DD)을 확인해주세요.")
+
+        prefix = options['prefix']
+        if options['clear']:
+            deleted = synthetic.clear(prefix)
+            self.stdout.write(f"기존 사용자 {deleted}명과 관련 데이터를 삭제했습니다.")
+        elif User.objects.filter(username__startswith=f'{prefix}-').exists():
+            raise CommandError(f"'{prefix}-' 사용자가 이미 있습니다. --clear 또는 다른 --prefix 를 사용해주세요.")
+
+        total = options['expenditures']
+        step = max(total // 10, options['batch_size'])
+
+        def progress(count):
+            if count % step < options['batch_size'] or count == total:
+                self.stdout.write(f"  지출 {count}/{total}")
+
+        started = time.perf_counter()
+        created = synthetic.seed(
+            options['users'],
+            total,
+            month_count=options['months'],
+            end_date=end_date,
+            prefix=prefix,
+            batch_size=options['batch_size'],
+            random_seed=options['seed'],
+            progress=progress
+        )
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"사용자 {created['users']}명, 예산 {created['budgets']}건, 지출 {created['expenditures']}건 생성 ({elapsed:.1f}초)"
+        ))
@@ -0,0 +1,129 @@
+import threading
+from bisect import bisect_left
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames, labels, extra=()):
+    pairs = list(zip(labelnames, labels)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def expose(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self.lock:
+            values = sorted(self.values.items())
+        for labels, value in values:
+            lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels : [구간별 건수(누적 아님)..., +Inf 건수, 합계]
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(labels)
+            if state is None:
+                state = self.values[labels] = [0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    def expose(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self.lock:
+            values = sorted((labels, list(state)) for labels, state in self.values.items())
+
+        for labels, state in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), state[:-1]):
+                cumulative += count
+                le = bound if bound == '+Inf' else _format_value(bound)
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, labels, [("le", le)])} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(state[-1])}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}')
+        return lines
+
+
+class Registry:
+    """
+    프로세스 단위 지표 저장소 (Prometheus text 형식으로 출력)
+    worker 가 여러 개인 경우 worker 마다 따로 수집됨
+    """
+
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, *args, **kwargs):
+        metric = Counter(*args, **kwargs)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, *args, **kwargs):
+        metric = Histogram(*args, **kwargs)
+        self.metrics.append(metric)
+        return metric
+
+    def expose(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.expose())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+REQUEST_LABELS = ('method', 'route')
+
+requests_total = registry.counter(
+    'http_requests_total', "요청 수", REQUEST_LABELS + ('status',)
+)
+request_duration = registry.histogram(
+    'http_request_duration_seconds', "요청 처리 시간", REQUEST_LABELS
+)
+db_queries = registry.histogram(
+    'http_request_db_queries', "요청당 SQL 실행 수", REQUEST_LABELS, buckets=QUERY_BUCKETS
+)
+db_duration = registry.histogram(
+    'http_request_db_duration_seconds', "요청당 SQL 실행 시간", REQUEST_LABELS
+)
+serialize_duration = registry.histogram(
+    'http_request_serialize_duration_seconds', "요청당 serializer 처리 시간", REQUEST_LABELS
+)
+render_duration = registry.histogram(
+    'http_request_render_duration_seconds', "요청당 응답 렌더링 시간", REQUEST_LABELS
+)
@@ -0,0 +1,224 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from common import metrics, routers
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    """
+    connection.execute_wrapper 에 등록해 실행된 쿼리 수와 시간을 계산
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class RequestMetrics:
+    """
+    요청 하나의 측정값 (request.metrics)
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = QueryCounter()
+        self.timings = {}
+
+    def add(self, name, duration):
+        self.timings[name] = self.timings.get(name, 0.0) + duration
+
+
+def _add_wrapper(wrapper):
+    # replica 를 사용하는 요청도 측정하도록 모든 DB 연결에 등록
+    for conn in connections.all():
+        conn.execute_wrappers.append(wrapper)
+
+
+def _remove_wrapper(wrapper):
+    for conn in connections.all():
+        conn.execute_wrappers.remove(wrapper)
+
+
+class AsyncCapableMiddleware:
+    """
+    WSGI(동기), ASGI(비동기) 양쪽에서 동작하는 middleware 기본 클래스
+    request 전체 구간에 QueryCounter 를 등록하는 부분을 공통으로 처리
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def get_counter(self, request):
+        """
+        None 이 아닌 QueryCounter 를 반환하면 요청 처리 중 connection 에 등록
+        """
+        return None
+
+    def before(self, request):
+        pass
+
+    def after(self, request, response):
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        self.before(request)
+        counter = self.get_counter(request)
+        if counter is None:
+            response = self.get_response(request)
+        else:
+            _add_wrapper(counter)
+            try:
+                response = self.get_response(request)
+            finally:
+                _remove_wrapper(counter)
+
+        return self.after(request, response)
+
+    async def __acall__(self, request):
+        self.before(request)
+        counter = self.get_counter(request)
+        if counter is None:
+            response = await self.get_response(request)
+        else:
+            # 비동기 ORM 은 요청마다 같은 sync 스레드의 connection 을 사용하므로 그 스레드에서 등록
+            await sync_to_async(_add_wrapper)(counter)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(_remove_wrapper)(counter)
+
+        return self.after(request, response)
+
+
+class RequestMetricsMiddleware(AsyncCapableMiddleware):
+    """
+    요청별 SQL 실행 수/시간, serializer/렌더링 시간(InstrumentedViewMixin), 전체 처리 시간을 측정해
+    Server-Timing 헤더로 반환하고 /metrics 의 Prometheus 지표에 누적
+    REQUEST_METRICS 가 False 이면 사용하지 않음
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS', True):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def before(self, request):
+        request.metrics = RequestMetrics()
+
+    def get_counter(self, request):
+        return request.metrics.queries
+
+    def after(self, request, response):
+        request_metrics = request.metrics
+        duration = time.perf_counter() - request_metrics.started
+        queries = request_metrics.queries
+
+        timings = [('db', queries.duration, f'{queries.count} queries')]
+        timings += [(name, value, None) for name, value in request_metrics.timings.items()]
+        timings.append(('total', duration, None))
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={value * 1000:.1f}' + (f';desc="{desc}"' if desc else '')
+            for name, value, desc in timings
+        )
+
+        match = getattr(request, 'resolver_match', None)
+        labels = (request.method, match.route if match is not None else '<unmatched>')
+        metrics.requests_total.inc(labels + (str(response.status_code),))
+        metrics.request_duration.observe(duration, labels)
+        metrics.db_queries.observe(queries.count, labels)
+        metrics.db_duration.observe(queries.duration, labels)
+        if 'serialize' in request_metrics.timings:
+            metrics.serialize_duration.observe(request_metrics.timings['serialize'], labels)
+        if 'render' in request_metrics.timings:
+            metrics.render_duration.observe(request_metrics.timings['render'], labels)
+
+        return response
+
+
+class QueryBudgetMiddleware(AsyncCapableMiddleware):
+    """
+    view 에 선언된 query_budget({'get' : 최대 쿼리 수}) 을 초과하면 경고
+    QUERY_BUDGET_STRICT 가 True 이면(테스트) QueryBudgetExceeded 예외 발생
+    RequestMetricsMiddleware 가 있으면 그 QueryCounter 를 함께 사용
+    """
+
+    def before(self, request):
+        request._query_budget = None
+        request_metrics = getattr(request, 'metrics', None)
+        if request_metrics is not None:
+            request._query_counter = request_metrics.queries
+            request._query_start = request_metrics.queries.count
+        else:
+            request._query_counter = QueryCounter()
+            request._query_start = 0
+
+    def get_counter(self, request):
+        if getattr(request, 'metrics', None) is not None:
+            return None
+        return request._query_counter
+
+    def after(self, request, response):
+        count = request._query_counter.count - request._query_start
+        budget = request._query_budget
+        if budget is not None and count > budget:
+            message = f"{request.method} {request.path} : 쿼리 {count}건 (허용 {budget}건)"
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        budgets = getattr(view_class, 'query_budget', None) or {}
+        request._query_budget = budgets.get(request.method.lower())
+
+
+class ReadReplicaMiddleware(AsyncCapableMiddleware):
+    """
+    view 에 read_replica = True 가 선언된 GET/HEAD 요청의 조회를 replica 로 보냄 (common.routers.ReplicaRouter)
+    replica DB 가 설정되어 있지 않으면 사용하지 않음
+    """
+
+    def __init__(self, get_response):
+        if routers.REPLICA not in settings.DATABASES:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if request.method in ('GET', 'HEAD') and getattr(view_class, 'read_replica', False):
+            routers.use_replica()
+
+    def after(self, request, response):
+        # WSGI 에서는 같은 스레드가 다음 요청을 처리하므로 해제
+        routers.use_replica(False)
+        return response
@@ -5,4 +5,17 @@ class BaseModel(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+
+class LoadedValuesMixin:
+    """
+    DB 에서 불러온 시점의 필드 값을 _loaded_values 에 보관
+    (signal 에서 변경 전 값과 비교할 때 사용)
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
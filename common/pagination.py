@@ -0,0 +1,148 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination:
+    """
+    (정렬 필드..., id) 기준 keyset 페이지네이션
+    cursor 는 마지막 행의 정렬 필드 값을 base64 로 인코딩한 문자열이며,
+    몇 번째 페이지든 인덱스 탐색 + page_size 건 조회 비용만 발생
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = "유효하지 않은 cursor 입니다."
+
+    def __init__(self, ordering):
+        self.ordering = tuple(ordering)
+        self.page_size = settings.LIST_PAGE_SIZE
+        self.max_page_size = settings.LIST_MAX_PAGE_SIZE
+        self.next_position = None
+        self.request = None
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def encode_cursor(self, position):
+        data = json.dumps([str(value) for value in position], separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, UnicodeDecodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def after(self, position):
+        """
+        (a, b, c) > (va, vb, vc) 조건을 인덱스가 사용 가능한 OR 조건으로 변환
+        """
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            equal = {name : position[i] for i, name in enumerate(self.ordering[:index])}
+            condition |= Q(**equal, **{f'{field}__gt' : position[index]})
+        return condition
+
+    def _page_queryset(self, queryset, request):
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request, queryset.model)
+
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+
+        return queryset[:page_size + 1], page_size
+
+    def _page(self, rows, page_size):
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            if isinstance(last, dict):
+                # values() 로 조회한 경우
+                self.next_position = [last[field] for field in self.ordering]
+            else:
+                self.next_position = [getattr(last, field) for field in self.ordering]
+        else:
+            self.next_position = None
+
+        return rows
+
+    def paginate_queryset(self, queryset, request):
+        queryset, page_size = self._page_queryset(queryset, request)
+        return self._page(list(queryset), page_size)
+
+    async def apaginate_queryset(self, queryset, request):
+        queryset, page_size = self._page_queryset(queryset, request)
+        rows = [row async for row in queryset.aiterator(chunk_size=page_size + 1)]
+        return self._page(rows, page_size)
+
+    def _position(self, row):
+        if isinstance(row, dict):
+            return tuple(row[field] for field in self.ordering)
+        return tuple(getattr(row, field) for field in self.ordering)
+
+    def _merge(self, results):
+        """
+        테이블별로 조회한 페이지를 정렬 순서대로 합침
+        (테이블 사이를 옮기는 중인 행이 양쪽에서 조회된 경우 한 번만 포함)
+        """
+        merged = []
+        for row in sorted((row for rows in results for row in rows), key=self._position):
+            if not merged or self._position(merged[-1]) != self._position(row):
+                merged.append(row)
+        return merged
+
+    def paginate_querysets(self, querysets, request):
+        """
+        같은 필드를 가진 여러 테이블(예 : 지출 + 보관 지출)을 하나의 목록처럼 페이지네이션
+        테이블마다 page_size + 1 건씩만 조회
+        """
+        results = []
+        for queryset in querysets:
+            queryset, page_size = self._page_queryset(queryset, request)
+            results.append(list(queryset))
+        return self._page(self._merge(results), page_size)
+
+    async def apaginate_querysets(self, querysets, request):
+        results = []
+        for queryset in querysets:
+            queryset, page_size = self._page_queryset(queryset, request)
+            results.append([row async for row in queryset.aiterator(chunk_size=page_size + 1)])
+        return self._page(self._merge(results), page_size)
+
+    @property
+    def is_first_page(self):
+        return not self.request.query_params.get(self.cursor_query_param)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_link_header(self):
+        next_link = self.get_next_link()
+        if next_link is None:
+            return {}
+        return {'Link' : f'<{next_link}>; rel="next"'}
@@ -0,0 +1,37 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    orjson 이 설치되어 있으면 orjson 으로, 아니면 기존 JSONRenderer 로 직렬화
+    출력은 JSONRenderer(UNICODE_JSON, COMPACT_JSON) 결과와 같으며(지수 표기되는 실수 제외),
+    orjson 이 처리하지 못하는 형식(날짜, Decimal 등)은 JSONRenderer 의 encoder 로 변환
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # 들여쓰기, ASCII 출력 등 기본 형식이 아닌 경우는 기존 방식으로 처리
+        if self.get_indent(accepted_media_type, renderer_context or {}) or not (self.compact and self.ensure_ascii is False):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+            )
+        except (orjson.JSONEncodeError, TypeError):
+            # 64bit 범위를 넘는 정수 등
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # JSONRenderer 와 같이 U+2028, U+2029 는 escape
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,202 @@
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from common import routers
+
+
+VERSION_KEY = 'responses:version:{}'
+GLOBAL_VERSION_KEY = VERSION_KEY.format('global')
+# 최근(DATABASE_REPLICA_LAG 초 이내)에 변경된 데이터 표시
+WRITTEN_KEY = 'responses:written:{}'
+# 캐시한 응답과 함께 저장할 헤더 (cursor 페이지네이션)
+CACHED_HEADERS = ('Link',)
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # 캐시에서 사라진 뒤 다시 만든 값이 이전 값과 겹치지 않도록 현재 시각(ns)으로 시작
+        cache.add(key, time.time_ns(), None)
+
+
+def _written(key):
+    # replica 가 따라잡을 때까지(커밋 후 DATABASE_REPLICA_LAG 초) 유지
+    cache.set(key, True, settings.DATABASE_REPLICA_LAG)
+
+
+def _bump_on_commit(key, written_key):
+    # 현재 요청은 즉시, 커밋 전에 다른 요청이 변경 전 데이터로 응답을 캐시한 경우를 위해 커밋 후 한 번 더 변경
+    _bump(key)
+    _written(written_key)
+
+    def committed():
+        _bump(key)
+        _written(written_key)
+
+    transaction.on_commit(committed)
+
+
+def bump_user_version(user_id):
+    """
+    사용자의 예산/지출이 바뀌면 호출 (해당 사용자의 캐시된 응답을 모두 무효화)
+    """
+    _bump_on_commit(VERSION_KEY.format(user_id), WRITTEN_KEY.format(user_id))
+
+
+def bump_global_version():
+    """
+    모든 사용자의 응답에 포함되는 데이터(카테고리 등)가 바뀌면 호출
+    """
+    _bump_on_commit(GLOBAL_VERSION_KEY, WRITTEN_KEY.format('global'))
+
+
+def recently_written(user_id):
+    """
+    사용자 또는 전체 데이터가 DATABASE_REPLICA_LAG 초 이내에 바뀌었는지 (replica 에 아직 반영되지 않았을 수 있음)
+    """
+    return bool(cache.get_many([WRITTEN_KEY.format(user_id), WRITTEN_KEY.format('global')]))
+
+
+def _fill_from_default(request):
+    # replica 조회 결과는 새 version 으로 캐시되므로, 최근 변경이 replica 에 반영되기 전에는 default 에서 조회
+    return routers.replica_in_use() and recently_written(request.user.pk)
+
+
+def data_versions(user_id):
+    """
+    (사용자 version, 전체 version), cache 를 사용할 수 없으면 None
+    """
+    keys = [VERSION_KEY.format(user_id), GLOBAL_VERSION_KEY]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+        if versions[key] is None:
+            return None
+    return tuple(versions[key] for key in keys)
+
+
+def _lookup(request):
+    """
+    (캐시 key, ETag, 캐시된 응답)
+    key 는 사용자(계정 생성 시각 포함), 데이터 version, 경로와 쿼리, 응답 형식으로 구성
+    """
+    user = request.user
+    versions = data_versions(user.pk)
+    if versions is None:
+        return None, None, None
+
+    query = sorted(request.query_params.lists())
+    digest = hashlib.sha1(
+        f'{request.path}?{query}|{request.accepted_media_type}|{user.created_at.timestamp()}'.encode()
+    ).hexdigest()
+    key = f'responses:{user.pk}:{versions[0]}:{versions[1]}:{digest}'
+    etag = f'"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        return key, etag, None
+
+    # 프로세스 메모리(LRU) -> 공용 캐시(redis) 순서로 조회
+    local = caches['local']
+    cached = local.get(key)
+    if cached is None:
+        cached = cache.get(key)
+        if cached is not None:
+            local.set(key, cached, settings.RESPONSE_CACHE_TIMEOUT)
+
+    return key, etag, cached
+
+
+def _store(key, response):
+    value = {
+        'content' : response.content,
+        'content_type' : response['Content-Type'],
+        'headers' : {name : response[name] for name in CACHED_HEADERS if response.has_header(name)},
+    }
+    caches['local'].set(key, value, settings.RESPONSE_CACHE_TIMEOUT)
+    cache.set(key, value, settings.RESPONSE_CACHE_TIMEOUT)
+
+
+def _respond(request, key, etag, cached):
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        # 변경되지 않았으면 조회/직렬화 없이 304
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag' : etag})
+
+    if cached is not None:
+        response = HttpResponse(cached['content'], content_type=cached['content_type'])
+        for name, value in cached['headers'].items():
+            response[name] = value
+        response['ETag'] = etag
+        return response
+
+    return None
+
+
+def _prepare(response, key, etag):
+    if isinstance(response, Response) and response.status_code == status.HTTP_200_OK:
+        response['ETag'] = etag
+        # 렌더링된 뒤 저장
+        response.add_post_render_callback(lambda rendered: _store(key, rendered))
+    return response
+
+
+def cache_response(handler):
+    """
+    GET 핸들러의 응답을 사용자별 데이터 version 기준으로 캐시하고 ETag/If-None-Match(304)를 처리
+    예산/지출이 바뀌면 version 이 바뀌므로 캐시 만료를 기다리지 않고 바로 새 응답을 반환
+    replica 를 사용하는 요청은 최근 변경이 있으면 default 에서 조회해 캐시 (복제 지연된 데이터를 새 version 으로 저장하지 않음)
+    """
+    if iscoroutinefunction(handler):
+        @wraps(handler)
+        async def async_wrapper(self, request, *args, **kwargs):
+            if not settings.RESPONSE_CACHE:
+                return await handler(self, request, *args, **kwargs)
+
+            key, etag, cached = await sync_to_async(_lookup)(request)
+            if key is None:
+                return await handler(self, request, *args, **kwargs)
+
+            response = _respond(request, key, etag, cached)
+            if response is None:
+                if await sync_to_async(_fill_from_default)(request):
+                    with routers.use_default():
+                        response = await handler(self, request, *args, **kwargs)
+                else:
+                    response = await handler(self, request, *args, **kwargs)
+                response = _prepare(response, key, etag)
+            return response
+
+        return async_wrapper
+
+    @wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        if not settings.RESPONSE_CACHE:
+            return handler(self, request, *args, **kwargs)
+
+        key, etag, cached = _lookup(request)
+        if key is None:
+            return handler(self, request, *args, **kwargs)
+
+        response = _respond(request, key, etag, cached)
+        if response is None:
+            if _fill_from_default(request):
+                with routers.use_default():
+                    response = handler(self, request, *args, **kwargs)
+            else:
+                response = handler(self, request, *args, **kwargs)
+            response = _prepare(response, key, etag)
+        return response
+
+    return wrapper
@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+REPLICA = 'replica'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def use_replica(enabled=True):
+    """
+    현재 요청(컨텍스트)의 조회를 replica 로 보낼지 설정
+    """
+    _use_replica.set(enabled)
+
+
+def replica_in_use():
+    return _use_replica.get()
+
+
+@contextmanager
+def use_default():
+    """
+    구간 안의 조회를 default 로 보냄 (복제 지연 없이 최신 데이터를 읽어야 하는 경우)
+    """
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    use_replica() 가 설정된 구간(read_replica 가 선언된 view 의 GET 요청)의 조회만 replica 로 보냄
+    그 외 조회와 모든 쓰기, migrate 는 default 사용
+    """
+
+    def db_for_read(self, model, **hints):
+        return REPLICA if _use_replica.get() else None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica 는 default 와 같은 데이터
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA
@@ -0,0 +1,26 @@
+from datetime import date
+
+
+class ValuesSerializerMixin:
+    """
+    읽기 전용 목록 응답을 values() 결과로 바로 생성 (모델 인스턴스 생성, 필드별 to_representation 생략)
+    value_fields : {응답 필드명 : values() 조회 경로}, ModelSerializer 의 fields 와 같은 순서로 선언
+    정수, 문자열, 날짜(date) 필드만 지원하며 결과는 serializer.data 와 같음
+    """
+    value_fields = {}
+
+    @classmethod
+    def values(cls, queryset):
+        return queryset.values(*cls.value_fields.values())
+
+    @classmethod
+    def represent_values(cls, rows):
+        fields = list(cls.value_fields.items())
+        data = []
+        for row in rows:
+            item = {}
+            for name, path in fields:
+                value = row[path]
+                item[name] = value.isoformat() if isinstance(value, date) else value
+            data.append(item)
+        return data
@@ -0,0 +1,169 @@
+import math
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+
+from budget import signals as budget_signals, statistics
+from budget.models import Budget, DailyBudgetPlan
+from categories.models import Category
+from expenditure import rollups, signals as expenditure_signals
+from expenditure.models import Expenditure, ExpenditureDailySummary, ExpenditureMonthlySummary
+from expenditure.rollups import month_end, month_start
+from users.models import User
+
+
+PASSWORD = 'synthetic-password'
+
+# (카테고리명, 지출 비중, 1회 지출 금액 중앙값)
+CATEGORIES = (
+    ('식비', 0.32, 9000),
+    ('카페', 0.18, 5000),
+    ('교통', 0.20, 2500),
+    ('쇼핑', 0.10, 35000),
+    ('주거/통신', 0.04, 80000),
+    ('문화/여가', 0.07, 20000),
+    ('의료/건강', 0.04, 15000),
+    ('기타', 0.05, 12000),
+)
+COMMENTS = ('점심', '저녁', '출근', '퇴근', '장보기', '모임', '구독료', '병원', '선물', '')
+
+
+def months(end_date, count):
+    """
+    end_date 가 속한 달을 포함해 최근 count 개월의 (시작일, 종료일)
+    """
+    result = []
+    current = month_start(end_date)
+    for _ in range(count):
+        result.append((current, month_end(current)))
+        current = month_start(current - timedelta(days=1))
+    return list(reversed(result))
+
+
+def ensure_categories():
+    categories = {category.name : category for category in Category.objects.all()}
+    for name, _, _ in CATEGORIES:
+        if name not in categories:
+            categories[name] = Category.objects.create(name=name, description=name)
+    return [(categories[name], weight, median) for name, weight, median in CATEGORIES]
+
+
+def create_users(prefix, count, batch_size):
+    password = make_password(PASSWORD)
+    width = max(6, len(str(count)))
+    User.objects.bulk_create(
+        (User(username=f'{prefix}-{number:0{width}d}', password=password) for number in range(1, count + 1)),
+        batch_size=batch_size
+    )
+    return list(User.objects.filter(username__startswith=f'{prefix}-').order_by('id').values_list('id', flat=True))
+
+
+def _batched(objs, batch_size):
+    batch = []
+    for obj in objs:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _budgets(rng, user_ids, categories, periods):
+    total_weight = sum(weight for _, weight, _ in categories)
+    for user_id in user_ids:
+        # 월 예산은 중앙값 150만원 정도의 로그정규분포
+        monthly = rng.lognormvariate(math.log(1500000), 0.4)
+        for start_date, end_date in periods:
+            for category, weight, _ in categories:
+                money = monthly * weight / total_weight * rng.uniform(0.7, 1.3)
+                yield Budget(user_id=user_id, category=category, money=int(round(money, -3)), start_date=start_date, end_date=end_date)
+
+
+def _expenditure_counts(rng, user_ids, total):
+    # 사용자별 활동량 차이 (소수의 사용자가 많은 지출을 등록)
+    weights = [rng.paretovariate(1.5) for _ in user_ids]
+    weight_sum = sum(weights)
+    counts = [int(total * weight / weight_sum) for weight in weights]
+    for index in rng.sample(range(len(user_ids)), k=min(len(user_ids), total - sum(counts))):
+        counts[index] += 1
+    return counts
+
+
+def _expenditures(rng, user_ids, counts, categories, start_date, end_date):
+    days = (end_date - start_date).days + 1
+    # 주말 지출 비중을 높게
+    day_weights = [1.4 if (start_date + timedelta(days=offset)).weekday() >= 5 else 1.0 for offset in range(days)]
+    day_cumulative = []
+    for weight in day_weights:
+        day_cumulative.append((day_cumulative[-1] if day_cumulative else 0) + weight)
+    category_weights = [weight for _, weight, _ in categories]
+
+    for user_id, count in zip(user_ids, counts):
+        offsets = rng.choices(range(days), cum_weights=day_cumulative, k=count)
+        picked = rng.choices(categories, weights=category_weights, k=count)
+        for offset, (category, _, median) in zip(offsets, picked):
+            money = max(100, int(round(rng.lognormvariate(math.log(median), 0.6), -2)))
+            yield Expenditure(
+                user_id=user_id,
+                category=category,
+                money=money,
+                comment=rng.choice(COMMENTS),
+                expense_date=start_date + timedelta(days=offset),
+                is_sum=rng.random() >= 0.05
+            )
+
+
+def seed(users, expenditures, month_count=3, end_date=None, prefix='synthetic', batch_size=5000, random_seed=0, progress=None):
+    """
+    사용자, 예산(사용자 x 월 x 카테고리), 지출 데이터를 bulk_create 로 생성한 뒤 집계 테이블을 갱신
+    지출은 batch_size 단위로 생성/저장하므로 행 수와 관계없이 메모리 사용량이 일정
+    반환값 : {'users', 'budgets', 'expenditures'} 생성 건수
+    """
+    rng = random.Random(random_seed)
+    end_date = end_date or date.today()
+    periods = months(end_date, month_count)
+    start_date = periods[0][0]
+
+    categories = ensure_categories()
+    user_ids = create_users(prefix, users, batch_size)
+
+    created = {'users' : len(user_ids), 'budgets' : 0, 'expenditures' : 0}
+    for batch in _batched(_budgets(rng, user_ids, categories, periods), batch_size):
+        Budget.objects.bulk_create(batch)
+        created['budgets'] += len(batch)
+
+    counts = _expenditure_counts(rng, user_ids, expenditures)
+    for batch in _batched(_expenditures(rng, user_ids, counts, categories, start_date, end_date), batch_size):
+        Expenditure.objects.bulk_create(batch)
+        created['expenditures'] += len(batch)
+        if progress is not None:
+            progress(created['expenditures'])
+
+    # bulk_create 는 signal 이 발생하지 않으므로 집계 테이블을 직접 갱신
+    for index in range(0, len(user_ids), 1000):
+        rollups.rebuild(user_ids[index:index + 1000])
+    statistics.rebuild()
+
+    return created
+
+
+def clear(prefix='synthetic', chunk_size=100):
+    """
+    seed 로 생성한 사용자와 관련 데이터(집계 포함)를 삭제
+    지출/예산은 행 단위 signal 처리를 생략하고 삭제한 뒤 통계를 한 번에 다시 계산
+    signal 이 연결된 모델은 QuerySet.delete() 가 행을 메모리로 읽으므로 chunk_size 명의 사용자씩 삭제
+    """
+    users = User.objects.filter(username__startswith=f'{prefix}-')
+    user_ids = list(users.order_by('id').values_list('id', flat=True))
+
+    with expenditure_signals.suppress_rollups(), budget_signals.suppress_statistics():
+        for index in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[index:index + chunk_size]
+            for model in (ExpenditureDailySummary, ExpenditureMonthlySummary, DailyBudgetPlan, Expenditure, Budget):
+                model.objects.filter(user_id__in=chunk).delete()
+
+    _, deleted = users.delete()
+    statistics.rebuild()
+    return deleted.get(User._meta.label, 0)
@@ -0,0 +1,70 @@
+import re
+from unittest import SkipTest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def explain(sql):
+    """
+    SQLite / PostgreSQL 실행계획을 문자열 목록으로 반환
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return [row[-1] for row in cursor.fetchall()]
+
+        if connection.vendor == 'postgresql':
+            # 테스트 데이터가 적으면 순차 탐색이 선택되므로, 인덱스 사용 가능 여부만 확인
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}")
+            return [row[0] for row in cursor.fetchall()]
+
+    # 실행계획 형식을 알 수 없는 DB 에서는 인덱스 검사 테스트를 건너뜀
+    raise SkipTest(f"{connection.vendor} 실행계획은 지원하지 않습니다.")
+
+
+def full_scans(plan, table):
+    """
+    실행계획에서 table 전체를 읽는 단계를 반환
+    """
+    if connection.vendor == 'sqlite':
+        pattern = re.compile(rf'^SCAN {table}\b')
+    else:
+        pattern = re.compile(rf'Seq Scan on {table}\b')
+    return [line for line in plan if pattern.search(line.strip())]
+
+
+class CaptureMixin:
+
+    def capture(self, func, *args, **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            response = func(*args, **kwargs)
+        return response, [query['sql'] for query in context.captured_queries]
+
+
+class QueryBudgetMixin(CaptureMixin):
+    """
+    TestCase 용 : 요청 중 실행된 쿼리 수가 view 에 선언된 query_budget 이하인지 검사
+    """
+
+    def assertQueryBudget(self, view_class, method, queries):
+        budget = view_class.query_budget[method]
+        self.assertLessEqual(
+            len(queries), budget,
+            f"{view_class.__name__}.{method} 쿼리 {len(queries)}건 (허용 {budget}건)\n" + "\n".join(queries)
+        )
+
+
+class ExplainMixin(CaptureMixin):
+    """
+    TestCase 용 : 요청 중 실행된 table 조회 쿼리가 인덱스를 사용하는지 검사
+    """
+
+    def assertUsesIndex(self, queries, table):
+        selects = [sql for sql in queries if sql.startswith('SELECT') and f'FROM "{table}"' in sql]
+        self.assertTrue(selects, f"{table} 조회 쿼리가 실행되지 않았습니다.")
+
+        for sql in selects:
+            plan = explain(sql)
+            self.assertFalse(full_scans(plan, table), f"{table} 전체 탐색 : {sql}\n{plan}")
@@ -0,0 +1,175 @@
+from datetime import date
+
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from categories.models import Category
+from common import benchmarks, metrics, routers
+from common.response_cache import bump_user_version, cache_response
+from expenditure.models import Expenditure
+from users.models import User
+
+
+class MetricsFormatTest(TestCase):
+
+    def test_counter_and_histogram(self):
+        registry = metrics.Registry()
+        counter = registry.counter('test_requests_total', "요청 수", ('method', 'route'))
+        histogram = registry.histogram('test_duration_seconds', "처리 시간", ('route',), buckets=(0.1, 1.0))
+
+        counter.inc(('GET', 'a/"b"'))
+        counter.inc(('GET', 'a/"b"'), amount=2)
+        histogram.observe(0.05, ('a',))
+        histogram.observe(0.1, ('a',))
+        histogram.observe(3, ('a',))
+
+        self.assertEqual(registry.expose().splitlines(), [
+            '# HELP test_requests_total 요청 수',
+            '# TYPE test_requests_total counter',
+            'test_requests_total{method="GET",route="a/\\"b\\""} 3',
+            '# HELP test_duration_seconds 처리 시간',
+            '# TYPE test_duration_seconds histogram',
+            'test_duration_seconds_bucket{route="a",le="0.1"} 2',
+            'test_duration_seconds_bucket{route="a",le="1"} 2',
+            'test_duration_seconds_bucket{route="a",le="+Inf"} 3',
+            'test_duration_seconds_sum{route="a"} 3.15',
+            'test_duration_seconds_count{route="a"} 3',
+        ])
+
+
+class BenchmarkCompareTest(TestCase):
+
+    def results(self, **entries):
+        return {'results' : {name : {'p50_ms' : p50, 'queries' : queries} for name, (p50, queries) in entries.items()}}
+
+    def test_regressions_and_missing_entries(self):
+        baseline = self.results(list=(10.0, 2), detail=(2.0, 1), delete=(5.0, 7))
+        results = self.results(list=(16.0, 2), detail=(2.5, 2), delete=(5.5, 7), peers=(3.0, 2))
+
+        self.assertEqual(benchmarks.compare(results, baseline), [
+            ('list', 'p50_ms', 10.0, 16.0),
+            ('detail', 'queries', 1, 2),
+        ])
+        # 시나리오를 추가하고 baseline 을 갱신하지 않은 항목
+        self.assertEqual(benchmarks.missing(results, baseline), ['peers'])
+
+
+class RequestMetricsMiddlewareTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        category = Category.objects.create(name='식비', description='식비')
+        Expenditure.objects.create(user=cls.user, category=category, money=1000, expense_date=date(2023, 11, 1))
+
+    def setUp(self):
+        cache.clear()
+        caches['local'].clear()
+
+    def get_list(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        return client.get('/api/v1/expenditure/', {'start_date' : '2023-11-01', 'end_date' : '2023-11-30'})
+
+    def request_count(self):
+        return metrics.requests_total.values.get(('GET', 'api/v1/expenditure/', '200'), 0)
+
+    def test_server_timing(self):
+        response = self.get_list()
+
+        self.assertEqual(response.status_code, 200)
+        timings = {}
+        for entry in response['Server-Timing'].split(', '):
+            name, *params = entry.split(';')
+            timings[name] = dict(param.split('=', 1) for param in params)
+
+        self.assertEqual(list(timings), ['db', 'serialize', 'render', 'total'])
+        self.assertRegex(timings['db']['desc'], r'^"\d+ queries"$')
+        for values in timings.values():
+            self.assertGreaterEqual(float(values['dur']), 0)
+
+    def test_prometheus_endpoint(self):
+        before = self.request_count()
+        self.get_list()
+        self.assertEqual(self.request_count(), before + 1)
+
+        response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        body = response.content.decode('utf-8')
+        self.assertIn(f'http_requests_total{{method="GET",route="api/v1/expenditure/",status="200"}} {before + 1}\n', body)
+        self.assertIn('# TYPE http_request_duration_seconds histogram\n', body)
+        self.assertIn('http_request_db_queries_bucket{method="GET",route="api/v1/expenditure/",le="+Inf"}', body)
+
+        # 허용되지 않은 IP
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.1').status_code, 404)
+
+    @override_settings(REQUEST_METRICS=False)
+    def test_disabled(self):
+        # client 마다 middleware 를 새로 구성하므로 설정이 적용됨
+        before = self.request_count()
+        response = self.get_list()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertEqual(self.request_count(), before)
+
+
+class ReplicaReadView(APIView):
+    # 핸들러 실행 중 조회가 어느 DB 로 가는지 기록
+    databases = []
+
+    @cache_response
+    def get(self, request):
+        self.databases.append(routers.ReplicaRouter().db_for_read(Expenditure) or 'default')
+        return Response({'count' : len(self.databases)})
+
+
+class ResponseCacheReplicaTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+
+    def setUp(self):
+        cache.clear()
+        caches['local'].clear()
+        ReplicaReadView.databases = []
+        # ReadReplicaMiddleware 가 read_replica view 에 설정하는 것과 같음
+        routers.use_replica()
+        self.addCleanup(routers.use_replica, False)
+
+    def get(self):
+        request = APIRequestFactory().get('/replica/')
+        force_authenticate(request, self.user)
+        response = ReplicaReadView.as_view()(request)
+        if hasattr(response, 'render'):
+            # 캐시에 저장하는 post render callback 실행
+            response.render()
+        self.assertEqual(response.status_code, 200)
+
+    def test_fill_from_replica_without_recent_write(self):
+        self.get()
+        self.get()
+
+        # 두 번째 요청은 캐시에서 반환
+        self.assertEqual(ReplicaReadView.databases, ['replica'])
+
+    def test_fill_from_default_after_write(self):
+        self.get()
+        bump_user_version(self.user.pk)
+        self.get()
+
+        # 변경 직후에는 복제 지연된 데이터를 새 version 으로 캐시하지 않도록 default 에서 조회
+        self.assertEqual(ReplicaReadView.databases, ['replica', 'default'])
+        self.assertTrue(routers.replica_in_use())
+
+        with override_settings(DATABASE_REPLICA_LAG=0):
+            bump_user_version(self.user.pk)
+        self.get()
+
+        self.assertEqual(ReplicaReadView.databases, ['replica', 'default', 'replica'])
@@ -0,0 +1,65 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    이전/현재 고정 구간 카운터를 경과 비율로 가중합하는 sliding window 방식
+    요청마다 cache get_many 1회 + incr 1회만 사용 (SimpleRateThrottle 처럼 요청 시각 목록을 저장하지 않음)
+    거부된 요청은 카운트하지 않음
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        current_key, previous_key = f'{self.key}:{window}', f'{self.key}:{window - 1}'
+
+        counts = self.cache.get_many([previous_key, current_key])
+        self.previous = counts.get(previous_key, 0)
+        self.current = counts.get(current_key, 0)
+        self.elapsed = self.now - window * self.duration
+
+        if self.previous * (1 - self.elapsed / self.duration) + self.current >= self.num_requests:
+            return self.throttle_failure()
+
+        # 다음 구간에서 이전 구간 카운터로 사용되므로 2구간 동안 유지
+        if not self.cache.add(current_key, 1, self.duration * 2):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                # add 와 incr 사이에 만료된 경우
+                self.cache.set(current_key, 1, self.duration * 2)
+        return True
+
+    def wait(self):
+        remaining = self.duration - self.elapsed
+        if self.current >= self.num_requests or not self.previous:
+            # 현재 구간만으로 한도를 넘은 경우 다음 구간이 시작될 때까지
+            return remaining
+
+        # 이전 구간 가중치가 줄어 한도 아래로 내려가는 시점까지
+        allowed_weight = (self.num_requests - self.current) / self.previous
+        return max(0, (1 - allowed_weight) * self.duration - self.elapsed)
+
+
+class LoginIPRateThrottle(SlidingWindowRateThrottle):
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope' : self.scope, 'ident' : self.get_ident(request)}
+
+
+class LoginUsernameRateThrottle(SlidingWindowRateThrottle):
+    scope = 'login_username'
+
+    def get_cache_key(self, request, view):
+        username = request.data.get('username')
+        if not isinstance(username, str) or not username:
+            return None
+        return self.cache_format % {'scope' : self.scope, 'ident' : username.lower()}
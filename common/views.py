@@ -0,0 +1,115 @@
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from rest_framework.views import APIView
+
+from common import metrics
+
+
+class InstrumentedViewMixin:
+    """
+    serializer 처리 시간(self.timing('serialize'))과 응답 렌더링 시간을
+    RequestMetricsMiddleware 의 요청 측정값(request.metrics)에 기록
+    """
+
+    @contextmanager
+    def timing(self, name):
+        request_metrics = getattr(self.request._request, 'metrics', None)
+        if request_metrics is None:
+            yield
+            return
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            request_metrics.add(name, time.perf_counter() - started)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        request_metrics = getattr(request._request, 'metrics', None)
+        renderer = getattr(response, 'accepted_renderer', None)
+        if request_metrics is not None and renderer is not None:
+            render = renderer.render
+
+            def timed_render(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return render(*args, **kwargs)
+                finally:
+                    request_metrics.add('render', time.perf_counter() - started)
+
+            # renderer 는 요청마다 새로 생성되므로 인스턴스의 render 만 교체
+            renderer.render = timed_render
+
+        return response
+
+
+class AsyncAPIView(APIView):
+    """
+    async def 핸들러를 사용하는 APIView (ASGI 배포용)
+    인증/권한 검사(DB 조회 포함)는 기존 APIView 와 같은 코드를 sync_to_async 로 실행하고,
+    핸들러는 이벤트 루프에서 실행해 비동기 ORM(aiterator, aaggregate 등)을 사용
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        markcoroutinefunction(view)
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = handler(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def options(self, request, *args, **kwargs):
+        return super().options(request, *args, **kwargs)
+
+
+async def aiterate(iterator):
+    """
+    동기 iterator 를 한 조각씩 sync 스레드에서 읽는 비동기 iterator 로 변환
+    (ASGI 에서 StreamingHttpResponse 가 전체를 메모리에 올리지 않도록 사용)
+    """
+    iterator = iter(iterator)
+    done = object()
+    while True:
+        chunk = await sync_to_async(next)(iterator, done)
+        if chunk is done:
+            break
+        yield chunk
+
+
+def metrics_view(request):
+    """
+    Prometheus 지표 (METRICS_ALLOWED_IPS 에서만 조회 가능)
+    """
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    return HttpResponse(metrics.registry.expose(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -6,6 +6,8 @@ from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 
+from common.views import metrics_view
+
 schema_view = get_schema_view(
     openapi.Info(
         title="Budget Management App",
@@ -27,6 +29,9 @@ urlpatterns = [
     path('api/v1/budget/', include('budget.urls')),
     path('api/v1/expenditure/', include('expenditure.urls')),
 
+    # prometheus
+    path('metrics', metrics_view),
+
     # swagger
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui')
 
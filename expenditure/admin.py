@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from expenditure.models import Expenditure
+from expenditure.models import ArchivedExpenditure, Expenditure
 
 admin.site.register(Expenditure)
+admin.site.register(ArchivedExpenditure)
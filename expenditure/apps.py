@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ExpenditureConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'expenditure'
+
+    def ready(self):
+        from expenditure import signals  # noqa: F401
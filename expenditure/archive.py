@@ -0,0 +1,122 @@
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from expenditure import signals
+from expenditure.models import ArchivedExpenditure, Expenditure
+
+
+BOUNDARY_KEY = 'expenditure:archive:boundary'
+# 원본 -> 보관 테이블로 옮길 때 복사하는 필드
+FIELDS = ('id', 'money', 'comment', 'is_sum', 'expense_date', 'created_at', 'updated_at', 'user_id', 'category_id')
+
+
+def active():
+    """
+    삭제되지 않은 보관 지출
+    """
+    return ArchivedExpenditure.objects.filter(deleted_at__isnull=True)
+
+
+def _boundary(last_date):
+    return date.min if last_date is None else last_date + timedelta(days=1)
+
+
+def boundary():
+    """
+    보관 테이블에 (삭제되지 않은) 지출이 있을 수 있는 기준일
+    조회 시작일이 이 날짜 이전인 경우에만 보관 테이블을 함께 조회
+    프로세스별 캐시(locmem)에서는 보관 명령이 갱신한 값이 공유되지 않으므로 EXPENDITURE_ARCHIVE_SYNC_INTERVAL(초) 마다 DB 에서 다시 계산
+    """
+    value = cache.get(BOUNDARY_KEY)
+    if value is None:
+        value = _boundary(active().aggregate(Max('expense_date'))['expense_date__max'])
+        cache.set(BOUNDARY_KEY, value, settings.EXPENDITURE_ARCHIVE_SYNC_INTERVAL)
+    return value
+
+
+async def aboundary():
+    value = await cache.aget(BOUNDARY_KEY)
+    if value is None:
+        value = _boundary((await active().aaggregate(Max('expense_date')))['expense_date__max'])
+        await cache.aset(BOUNDARY_KEY, value, settings.EXPENDITURE_ARCHIVE_SYNC_INTERVAL)
+    return value
+
+
+def _querysets(query, start_date, archive_boundary):
+    querysets = [Expenditure.objects.filter(query)]
+    if archive_boundary > date.min and (start_date is None or start_date < archive_boundary):
+        querysets.append(active().filter(query))
+    return querysets
+
+
+def querysets(query, start_date):
+    """
+    조회 조건(query)에 맞는 (원본, 필요한 경우 보관) 지출 queryset 목록
+    """
+    return _querysets(query, start_date, boundary())
+
+
+async def aquerysets(query, start_date):
+    return _querysets(query, start_date, await aboundary())
+
+
+def cutoff(months, today=None):
+    """
+    이번 달을 포함한 최근 months 개월을 제외한 기준일 (해당 월의 1일)
+    """
+    if today is None:
+        today = timezone.localdate()
+    index = today.year * 12 + today.month - 1 - (months - 1)
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def archive_before(before, batch_size=1000, pause=0):
+    """
+    before 이전 지출을 batch_size 건씩 보관 테이블로 이동
+    지출 signal 처리를 생략하고 옮기므로 일/월 집계는 그대로 유지되고, 응답 캐시도 바뀌지 않음
+    """
+    # 옮기는 동안에도 목록 조회가 보관 테이블을 포함하도록 기준일을 먼저 갱신
+    cache.set(BOUNDARY_KEY, max(boundary(), before), settings.EXPENDITURE_ARCHIVE_SYNC_INTERVAL)
+
+    last_id = 0
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Expenditure.objects.select_for_update()
+                .filter(id__gt=last_id, expense_date__lt=before)
+                .order_by('id')
+                .values(*FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+
+            archived_at = timezone.now()
+            ArchivedExpenditure.objects.bulk_create([ArchivedExpenditure(archived_at=archived_at, **row) for row in rows])
+            with signals.suppress_rollups():
+                deleted, _ = Expenditure.objects.filter(id__in=[row['id'] for row in rows]).delete()
+            moved += deleted
+
+        last_id = rows[-1]['id']
+        if pause:
+            time.sleep(pause)
+
+    return moved
+
+
+@transaction.atomic
+def soft_delete(expenditure):
+    """
+    지출을 삭제하고 deleted_at 과 함께 보관 테이블에 남김 (집계 차감은 post_delete signal 에서 처리)
+    """
+    ArchivedExpenditure.objects.create(
+        deleted_at=timezone.now(),
+        **{field : getattr(expenditure, field) for field in FIELDS}
+    )
+    expenditure.delete()
@@ -0,0 +1,95 @@
+import csv
+import heapq
+import io
+import json
+import zlib
+from operator import itemgetter
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+FORMATS = ('csv', 'jsonl')
+CONTENT_TYPES = {
+    'csv' : 'text/csv; charset=utf-8',
+    'jsonl' : 'application/x-ndjson; charset=utf-8',
+}
+# 내보내기 컬럼 (import_expenditures 로 다시 등록할 수 있는 형식)
+FIELDS = ('id', 'expense_date', 'category', 'money', 'comment', 'is_sum')
+COLUMNS = ('id', 'expense_date', 'category__name', 'money', 'comment', 'is_sum')
+
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+
+
+def rows(querysets, chunk_size=CHUNK_SIZE):
+    """
+    서버 측 cursor(.iterator) 로 chunk_size 행씩 조회 (PostgreSQL 은 named cursor 사용)
+    여러 테이블(지출 + 보관 지출)은 (지출일, id) 순으로 합쳐서 반환
+    """
+    iterators = [
+        queryset.order_by('expense_date', 'id').values_list(*COLUMNS).iterator(chunk_size=chunk_size)
+        for queryset in querysets
+    ]
+    if len(iterators) == 1:
+        return iterators[0]
+    return heapq.merge(*iterators, key=itemgetter(1, 0))
+
+
+def _csv_chunks(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # Excel 에서 한글이 깨지지 않도록 BOM 추가 (import 시 utf-8-sig 로 읽음)
+    buffer.write('\ufeff')
+    writer.writerow(FIELDS)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= BUFFER_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def _jsonl_chunks(rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    lines = []
+    size = 0
+    for row in rows:
+        line = encoder.encode(dict(zip(FIELDS, row)))
+        lines.append(line)
+        size += len(line) + 1
+        if size >= BUFFER_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+            size = 0
+
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream(querysets, file_format, compress=False):
+    """
+    지출 내역(queryset 목록)을 file_format(csv/jsonl) 으로 변환한 bytes 조각을 순서대로 반환
+    약 64KB 단위로 내보내므로 전체 행 수와 관계없이 메모리 사용량이 일정
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다 : {file_format}")
+
+    chunks = _csv_chunks(rows(querysets)) if file_format == 'csv' else _jsonl_chunks(rows(querysets))
+    encoded = (chunk.encode('utf-8') for chunk in chunks)
+    return _gzip(encoded) if compress else encoded
+
+
+def filename(file_format, compress=False):
+    return f"expenditures.{file_format}" + (".gz" if compress else "")
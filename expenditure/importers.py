@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+
+from django.db import transaction
+from rest_framework import serializers
+
+from budget import plans
+from categories.registry import registry
+from common.response_cache import bump_user_version
+from expenditure import rollups
+from expenditure.models import Expenditure
+from expenditure.serializers import ExpenditureImportSerializer
+
+
+FORMATS = ('csv', 'jsonl')
+DEFAULT_BATCH_SIZE = 1000
+
+
+class InvalidRow(Exception):
+    pass
+
+
+def guess_format(filename):
+    extension = filename.rsplit('.', 1)[-1].lower() if filename and '.' in filename else ''
+    if extension in ('jsonl', 'ndjson', 'json'):
+        return 'jsonl'
+    return 'csv'
+
+
+def read_csv(stream):
+    for row in csv.DictReader(stream):
+        # 빈 칸은 값이 없는 것으로 처리
+        yield {key.strip() : value for key, value in row.items() if key and value not in ('', None)}
+
+
+def read_jsonl(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield InvalidRow(f"JSON 형식 오류 : {e}")
+            continue
+        if not isinstance(row, dict):
+            yield InvalidRow("각 줄은 JSON 객체여야 합니다.")
+            continue
+        yield row
+
+
+def read_rows(stream, file_format):
+    """
+    텍스트/바이너리 스트림에서 한 행씩 읽어 dict 로 반환 (전체를 메모리에 올리지 않음)
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다 : {file_format}")
+
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    return read_csv(stream) if file_format == 'csv' else read_jsonl(stream)
+
+
+def import_expenditures(user, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    지출 행을 검증하여 batch_size 단위로 bulk_create
+    집계 변화량은 (user, category, 일자) 단위로 누적해 마지막에 한 번만 반영
+    반환값 : {'created' : 생성 건수, 'errors' : [{'row' : 행 번호, 'errors' : 오류}]}
+    """
+    categories = registry.name_to_id()
+    validator = ExpenditureImportSerializer()
+
+    created = 0
+    errors = []
+    batch = []
+    deltas = None
+
+    with transaction.atomic():
+        for number, row in enumerate(rows, start=1):
+            if isinstance(row, InvalidRow):
+                errors.append({'row' : number, 'errors' : {'non_field_errors' : [str(row)]}})
+                continue
+
+            try:
+                data = validator.run_validation(row)
+            except serializers.ValidationError as e:
+                errors.append({'row' : number, 'errors' : e.detail})
+                continue
+
+            category_id = categories.get(data.pop('category'))
+            if category_id is None:
+                errors.append({'row' : number, 'errors' : {'category' : ["해당 카테고리는 사용할 수 없습니다."]}})
+                continue
+
+            batch.append(Expenditure(user_id=user.id, category_id=category_id, **data))
+            if len(batch) >= batch_size:
+                Expenditure.objects.bulk_create(batch)
+                deltas = rollups.collect_deltas(batch, deltas=deltas)
+                created += len(batch)
+                batch = []
+
+        if batch:
+            Expenditure.objects.bulk_create(batch)
+            deltas = rollups.collect_deltas(batch, deltas=deltas)
+            created += len(batch)
+
+        # bulk_create 는 signal 이 발생하지 않으므로 집계를 직접 반영
+        rollups.apply_deltas(deltas)
+        if deltas:
+            # 가장 이른 지출 일자 이후의 지출 계획을 한 번만 삭제
+            earliest = min(expense_date for _, _, expense_date in deltas)
+            transaction.on_commit(lambda: plans.invalidate(user.id, earliest))
+        bump_user_version(user.id)
+
+    return {
+        'created' : created,
+        'errors' : errors
+    }
@@ -0,0 +1,30 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from expenditure import archive
+
+
+class Command(BaseCommand):
+    help = "지난 달 이전의 지출을 batch 단위로 보관 테이블로 옮깁니다. (일/월 집계는 유지)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=settings.EXPENDITURE_ARCHIVE_MONTHS, help="원본 테이블에 남겨 둘 최근 개월 수 (이번 달 포함)")
+        parser.add_argument('--before', help="이 날짜(YYYY-MM-DD) 이전 지출을 이동 (--months 대신 사용)")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0.1, help="batch 사이 대기 시간(초), DB 부하를 줄이기 위해 사용")
+
+    def handle(self, *args, **options):
+        if options['before']:
+            try:
+                before = date.fromisoformat(options['before'])
+            except ValueError:
+                raise CommandError("--before 형식(YYYY-MM-DD)을 확인해주세요.")
+        elif options['months'] < 1:
+            raise CommandError("--months 는 1 이상이어야 합니다.")
+        else:
+            before = archive.cutoff(options['months'])
+
+        moved = archive.archive_before(before, options['batch_size'], options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f"{before} 이전 지출 {moved}건 보관"))
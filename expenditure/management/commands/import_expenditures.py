@@ -0,0 +1,41 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from expenditure import importers
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "CSV/JSONL 파일의 지출 내역을 일괄 등록합니다. (path 가 '-' 이면 표준입력)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="입력 파일 경로 또는 '-'")
+        parser.add_argument('--user', required=True, help="등록할 사용자 계정명")
+        parser.add_argument('--format', choices=importers.FORMATS, help="입력 형식 (기본값 : 확장자로 판단)")
+        parser.add_argument('--batch-size', type=int, default=importers.DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"{options['user']} : 사용자를 찾을 수 없습니다.")
+
+        path = options['path']
+        file_format = options['format'] or importers.guess_format(path)
+
+        started = time.perf_counter()
+        if path == '-':
+            report = importers.import_expenditures(user, importers.read_rows(sys.stdin, file_format), options['batch_size'])
+        else:
+            with open(path, 'rb') as stream:
+                report = importers.import_expenditures(user, importers.read_rows(stream, file_format), options['batch_size'])
+        elapsed = time.perf_counter() - started
+
+        for error in report['errors']:
+            self.stderr.write(f"{error['row']}행 : {error['errors']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['created']}건 등록, {len(report['errors'])}건 오류 ({elapsed:.2f}초)"
+        ))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from expenditure import rollups
+
+
+class Command(BaseCommand):
+    help = "지출 원본 테이블로부터 일/월 집계 테이블을 재생성하고 검증합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids', help="대상 사용자 id (여러 번 지정 가능)")
+        parser.add_argument('--verify-only', action='store_true', help="재생성 없이 검증만 수행")
+
+    def handle(self, *args, **options):
+        user_ids = options['user_ids']
+
+        if not options['verify_only']:
+            rollups.rebuild(user_ids)
+            self.stdout.write("집계 테이블을 재생성했습니다.")
+
+        mismatches = rollups.verify(user_ids)
+        for model_name, key, expected, actual in mismatches[:20]:
+            self.stderr.write(f"{model_name} {key} : expected={expected} actual={actual}")
+
+        if mismatches:
+            raise CommandError(f"집계 불일치 {len(mismatches)}건")
+
+        self.stdout.write(self.style.SUCCESS("집계 테이블이 원본과 일치합니다."))
@@ -0,0 +1,103 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:48
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+import django.db.models.deletion
+
+
+def populate_summary(apps, schema_editor):
+    Expenditure = apps.get_model('expenditure', 'Expenditure')
+    ExpenditureDailySummary = apps.get_model('expenditure', 'ExpenditureDailySummary')
+    ExpenditureMonthlySummary = apps.get_model('expenditure', 'ExpenditureMonthlySummary')
+
+    daily = (
+        Expenditure.objects.filter(is_sum=True)
+        .values('user_id', 'category_id', 'expense_date')
+        .annotate(total=Sum('money'), rows=Count('id'))
+        .order_by()
+    )
+    ExpenditureDailySummary.objects.bulk_create(
+        [
+            ExpenditureDailySummary(
+                user_id=row['user_id'],
+                category_id=row['category_id'],
+                expense_date=row['expense_date'],
+                money=row['total'],
+                count=row['rows'],
+            )
+            for row in daily
+        ],
+        batch_size=1000,
+    )
+
+    monthly = (
+        Expenditure.objects.filter(is_sum=True)
+        .annotate(month=TruncMonth('expense_date'))
+        .values('user_id', 'category_id', 'month')
+        .annotate(total=Sum('money'), rows=Count('id'))
+        .order_by()
+    )
+    ExpenditureMonthlySummary.objects.bulk_create(
+        [
+            ExpenditureMonthlySummary(
+                user_id=row['user_id'],
+                category_id=row['category_id'],
+                month=row['month'],
+                money=row['total'],
+                count=row['rows'],
+            )
+            for row in monthly
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('categories', '0001_initial'),
+        ('expenditure', '0002_alter_expenditure_comment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpenditureMonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='지출월')),
+                ('money', models.BigIntegerField(default=0, verbose_name='지출합계')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='지출건수')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='categories.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'expenditure_monthly_summary',
+            },
+        ),
+        migrations.CreateModel(
+            name='ExpenditureDailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('expense_date', models.DateField(verbose_name='지출일')),
+                ('money', models.BigIntegerField(default=0, verbose_name='지출합계')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='지출건수')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='categories.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'expenditure_daily_summary',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='expendituremonthlysummary',
+            constraint=models.UniqueConstraint(fields=('user', 'month', 'category'), name='uniq_expenditure_monthly_summary'),
+        ),
+        migrations.AddConstraint(
+            model_name='expendituredailysummary',
+            constraint=models.UniqueConstraint(fields=('user', 'expense_date', 'category'), name='uniq_expenditure_daily_summary'),
+        ),
+        migrations.RunPython(populate_summary, migrations.RunPython.noop),
+    ]
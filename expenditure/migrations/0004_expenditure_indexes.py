@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenditure', '0003_expenditure_summary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expenditure',
+            index=models.Index(fields=['user', 'expense_date', 'is_sum', 'category', 'money'], name='expenditure_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expenditure',
+            index=models.Index(fields=['user', 'category', 'expense_date', 'is_sum', 'money'], name='expenditure_user_cat_date_idx'),
+        ),
+    ]
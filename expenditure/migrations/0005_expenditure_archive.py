@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:44
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('expenditure', '0004_expenditure_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedExpenditure',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('money', models.PositiveIntegerField(verbose_name='지출금액')),
+                ('comment', models.TextField(blank=True, max_length=100, null=True, verbose_name='지출메모')),
+                ('is_sum', models.BooleanField(default=True, verbose_name='합계여부')),
+                ('expense_date', models.DateField(verbose_name='지출일')),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='보관일시')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='삭제일시')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='categories.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'expenditure_archive',
+                'indexes': [models.Index(fields=['user', 'expense_date'], name='expenditure_archive_date_idx')],
+            },
+        ),
+    ]
@@ -1,10 +1,11 @@
 from django.db import models
+from django.utils import timezone
 from categories.models import Category
 
-from common.models import BaseModel
+from common.models import BaseModel, LoadedValuesMixin
 from users.models import User
 
-class Expenditure(BaseModel):
+class Expenditure(LoadedValuesMixin, BaseModel):
     money = models.PositiveIntegerField("지출금액")
     comment = models.TextField("지출메모", max_length=100, null=True, blank=True)
     is_sum = models.BooleanField("합계여부", default=True)
@@ -16,7 +17,83 @@ class Expenditure(BaseModel):
 
     class Meta:
         db_table = 'expenditure'
+        indexes = [
+            # 목록/합계 조회 : user 일치 + 지출일 범위 (is_sum, category, money 까지 포함해 인덱스만으로 필터/집계)
+            models.Index(fields=['user', 'expense_date', 'is_sum', 'category', 'money'], name='expenditure_user_date_idx'),
+            # 카테고리 검색 : user, category 일치 + 지출일 범위
+            models.Index(fields=['user', 'category', 'expense_date', 'is_sum', 'money'], name='expenditure_user_cat_date_idx'),
+        ]
 
 
     def __str__(self):
-        return f"{self.category}|{self.money}|{self.expense_date}"
\ No newline at end of file
+        return f"{self.category}|{self.money}|{self.expense_date}"
+
+
+class ArchivedExpenditure(models.Model):
+    """
+    보관 처리된 지출 (지난 달 지출을 옮겨 두거나, 삭제한 지출을 deleted_at 과 함께 보관)
+    id, 생성/수정 시각은 원본 값을 그대로 유지
+    """
+    id = models.BigIntegerField(primary_key=True)
+    money = models.PositiveIntegerField("지출금액")
+    comment = models.TextField("지출메모", max_length=100, null=True, blank=True)
+    is_sum = models.BooleanField("합계여부", default=True)
+    expense_date = models.DateField("지출일")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField("보관일시", default=timezone.now)
+    deleted_at = models.DateTimeField("삭제일시", null=True, blank=True)
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = 'expenditure_archive'
+        indexes = [
+            models.Index(fields=['user', 'expense_date'], name='expenditure_archive_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.category}|{self.money}|{self.expense_date}"
+
+
+class ExpenditureDailySummary(models.Model):
+    """
+    사용자 x 카테고리 x 일자별 지출 합계 (is_sum=True 인 지출만 집계)
+    """
+    expense_date = models.DateField("지출일")
+    money = models.BigIntegerField("지출합계", default=0)
+    count = models.PositiveIntegerField("지출건수", default=0)
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = 'expenditure_daily_summary'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'expense_date', 'category'], name='uniq_expenditure_daily_summary'),
+        ]
+
+    def __str__(self):
+        return f"{self.user}|{self.category}|{self.expense_date}|{self.money}"
+
+
+class ExpenditureMonthlySummary(models.Model):
+    """
+    사용자 x 카테고리 x 월별 지출 합계 (month 는 해당 월의 1일)
+    """
+    month = models.DateField("지출월")
+    money = models.BigIntegerField("지출합계", default=0)
+    count = models.PositiveIntegerField("지출건수", default=0)
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = 'expenditure_monthly_summary'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'month', 'category'], name='uniq_expenditure_monthly_summary'),
+        ]
+
+    def __str__(self):
+        return f"{self.user}|{self.category}|{self.month:%Y-%m}|{self.money}"
@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+from django.db.models import DateField, Q, Sum
+from django.db.models.functions import Trunc
+
+from categories.registry import registry
+from expenditure import rollups
+from expenditure.models import ExpenditureDailySummary, ExpenditureMonthlySummary
+
+
+INTERVALS = ('day', 'week', 'month')
+# 한 번에 조회할 수 있는 최대 기간(일), 구간 수에 비례해 응답을 만드는 비용이 커지므로 단위별로 제한
+MAX_DAYS = {
+    'day' : 366,
+    'week' : 366 * 3,
+    'month' : 366 * 10,
+}
+
+
+def truncate(day, interval):
+    if interval == 'week':
+        return day - timedelta(days=day.weekday())
+    if interval == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(day, interval):
+    if interval == 'week':
+        return day + timedelta(days=7)
+    if interval == 'month':
+        return (day + timedelta(days=32)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def buckets(start_date, end_date, interval):
+    bucket = truncate(start_date, interval)
+    while bucket <= end_date:
+        yield bucket
+        bucket = next_bucket(bucket, interval)
+
+
+def _truncated(filters, day_range, interval):
+    return (
+        ExpenditureDailySummary.objects.filter(filters, expense_date__range=day_range)
+        .annotate(bucket=Trunc('expense_date', interval, output_field=DateField()))
+        .values_list('bucket', 'category_id')
+        .annotate(Sum('money'))
+    )
+
+
+def spending_report(user, start_date, end_date, interval='day', category_id=None):
+    """
+    집계 테이블을 DB 에서 (구간, 카테고리) 단위로 묶어 조회하고, 빈 구간은 0 으로 채움
+    """
+    filters = Q(user=user, count__gt=0)
+    if category_id is not None:
+        filters &= Q(category_id=category_id)
+
+    if interval in ('day', 'week'):
+        # 일별 집계 테이블은 (user, 일자, 카테고리) 당 한 행이므로 그대로 사용하고, 주 단위는 아래에서 묶음
+        querysets = [
+            ExpenditureDailySummary.objects.filter(filters, expense_date__range=(start_date, end_date))
+            .values_list('expense_date', 'category_id', 'money')
+        ]
+    elif interval == 'month':
+        # 온전히 포함되는 월은 월별 집계, 앞뒤 일부 구간만 일별 집계를 월 단위로 묶어서 조회
+        day_ranges, months = rollups.split_range(start_date, end_date)
+        querysets = [_truncated(filters, day_range, interval) for day_range in day_ranges]
+        if months is not None:
+            querysets.append(
+                ExpenditureMonthlySummary.objects.filter(filters, month__range=months)
+                .values_list('month', 'category_id', 'money')
+            )
+
+    labels = list(buckets(start_date, end_date, interval))
+    positions = {label : index for index, label in enumerate(labels)}
+
+    names = {category.id : category.name for category in registry.all()}
+    series = {}
+    total = [0] * len(labels)
+    for queryset in querysets:
+        for bucket, category_id, money in queryset.order_by():
+            position = positions[truncate(bucket, interval)]
+            values = series.get(category_id)
+            if values is None:
+                values = series[category_id] = [0] * len(labels)
+            values[position] += money
+            total[position] += money
+
+    series = {names.get(category_id, str(category_id)) : values for category_id, values in series.items()}
+
+    return {
+        "interval" : interval,
+        "start_date" : start_date,
+        "end_date" : end_date,
+        "buckets" : labels,
+        "series" : dict(sorted(series.items())),
+        "total" : total
+    }
@@ -0,0 +1,333 @@
+import asyncio
+import calendar
+import heapq
+from collections import defaultdict
+from datetime import timedelta
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from expenditure.models import ArchivedExpenditure, Expenditure, ExpenditureDailySummary, ExpenditureMonthlySummary
+
+
+BATCH_SIZE = 1000
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def month_end(day):
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def split_range(start_date, end_date):
+    """
+    조회 기간을 (앞뒤 일 단위 구간 목록, 온전히 포함되는 월 구간)으로 분리
+    """
+    if start_date > end_date:
+        return [], None
+
+    first_full = start_date if start_date.day == 1 else month_end(start_date) + timedelta(days=1)
+    last_full_end = end_date if end_date == month_end(end_date) else month_start(end_date) - timedelta(days=1)
+
+    if first_full > last_full_end:
+        # 온전히 포함되는 월이 없는 경우
+        return [(start_date, end_date)], None
+
+    day_ranges = []
+    if start_date < first_full:
+        day_ranges.append((start_date, first_full - timedelta(days=1)))
+    if last_full_end < end_date:
+        day_ranges.append((last_full_end + timedelta(days=1), end_date))
+
+    return day_ranges, (first_full, month_start(last_full_end))
+
+
+def _apply_delta(model, date_field, user_id, category_id, day, money, count):
+    lookup = {'user_id' : user_id, 'category_id' : category_id, date_field : day}
+    changes = {'money' : F('money') + money, 'count' : F('count') + count}
+
+    if model.objects.filter(**lookup).update(**changes) or count < 0:
+        # 차감할 행이 없으면(cascade 로 이미 삭제된 경우 등) 새로 만들지 않음
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(money=money, count=count, **lookup)
+    except IntegrityError:
+        # 동시에 같은 행이 생성된 경우
+        model.objects.filter(**lookup).update(**changes)
+
+
+def apply(user_id, category_id, expense_date, money, count):
+    """
+    한 건(또는 같은 키로 묶인 여러 건)의 지출 변화량을 일/월 집계에 반영
+    """
+    if not money and not count:
+        return
+    _apply_delta(ExpenditureDailySummary, 'expense_date', user_id, category_id, expense_date, money, count)
+    _apply_delta(ExpenditureMonthlySummary, 'month', user_id, category_id, month_start(expense_date), money, count)
+
+
+def _bulk_apply(model, date_field, deltas):
+    """
+    같은 테이블의 여러 키에 변화량을 한 번에 반영 (기존 행 조회 1회 + bulk_update/bulk_create)
+    """
+    user_ids = {key[0] for key in deltas}
+    days = [key[2] for key in deltas]
+
+    existing = model.objects.select_for_update().filter(
+        user_id__in=user_ids,
+        **{f'{date_field}__range' : (min(days), max(days))}
+    )
+    rows = {(row.user_id, row.category_id, getattr(row, date_field)) : row for row in existing}
+
+    updated, created = [], []
+    for key, (money, count) in deltas.items():
+        row = rows.get(key)
+        if row is not None:
+            row.money += money
+            row.count += count
+            updated.append(row)
+        elif count > 0:
+            created.append(model(user_id=key[0], category_id=key[1], money=money, count=count, **{date_field : key[2]}))
+
+    model.objects.bulk_update(updated, ['money', 'count'], batch_size=BATCH_SIZE)
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create(created, batch_size=BATCH_SIZE)
+    except IntegrityError:
+        # 동시에 같은 키가 생성된 경우 한 건씩 반영
+        for row in created:
+            _apply_delta(model, date_field, row.user_id, row.category_id, getattr(row, date_field), row.money, row.count)
+
+
+def collect_deltas(rows, sign=1, deltas=None):
+    """
+    지출 행들을 (user, category, 일자) 단위 변화량으로 누적
+    """
+    if deltas is None:
+        deltas = defaultdict(lambda: [0, 0])
+
+    for row in rows:
+        if not row.is_sum:
+            continue
+        delta = deltas[(row.user_id, row.category_id, row.expense_date)]
+        delta[0] += sign * row.money
+        delta[1] += sign
+
+    return deltas
+
+
+def apply_deltas(daily):
+    """
+    collect_deltas 로 누적한 일별 변화량을 일/월 집계에 한 번에 반영
+    """
+    if not daily:
+        return
+
+    monthly = defaultdict(lambda: [0, 0])
+    for (user_id, category_id, expense_date), (money, count) in daily.items():
+        delta = monthly[(user_id, category_id, month_start(expense_date))]
+        delta[0] += money
+        delta[1] += count
+
+    with transaction.atomic():
+        _bulk_apply(ExpenditureDailySummary, 'expense_date', daily)
+        _bulk_apply(ExpenditureMonthlySummary, 'month', monthly)
+
+
+def apply_rows(rows, sign=1):
+    """
+    bulk_create, queryset.delete 처럼 signal 이 발생하지 않는 경로에서 사용
+    """
+    apply_deltas(collect_deltas(rows, sign))
+
+
+def _summary_querysets(user, start_date, end_date, category_id=None):
+    filters = Q(user=user, count__gt=0)
+    if category_id is not None:
+        filters &= Q(category_id=category_id)
+
+    day_ranges, months = split_range(start_date, end_date)
+    querysets = []
+
+    if months is not None:
+        monthly = ExpenditureMonthlySummary.objects.filter(filters, month__range=months)
+        querysets.append(monthly.values('category').annotate(Sum('money')).order_by())
+
+    if day_ranges:
+        day_query = Q()
+        for range_start, range_end in day_ranges:
+            day_query |= Q(expense_date__range=(range_start, range_end))
+
+        daily = ExpenditureDailySummary.objects.filter(filters, day_query)
+        querysets.append(daily.values('category').annotate(Sum('money')).order_by())
+
+    return querysets
+
+
+def merge_summary(results):
+    """
+    테이블별 카테고리 합계({'category', 'money__sum'} 목록)들을 합쳐 (카테고리별 합계, 총합)으로 변환
+    """
+    totals = defaultdict(int)
+    for rows in results:
+        for row in rows:
+            totals[row['category']] += row['money__sum']
+
+    sum_category = [{'category' : category, 'money__sum' : totals[category]} for category in sorted(totals)]
+    total_sum = sum(totals.values()) if totals else None
+
+    return sum_category, total_sum
+
+
+def summarize(user, start_date, end_date, category_id=None):
+    """
+    집계 테이블로 카테고리별 합계와 총합을 계산
+    반환값은 기존 응답 형식과 같은 ({'category', 'money__sum'} 목록, 총합)
+    """
+    querysets = _summary_querysets(user, start_date, end_date, category_id)
+    return merge_summary(list(queryset) for queryset in querysets)
+
+
+async def asummarize(user, start_date, end_date, category_id=None):
+    """
+    summarize 의 비동기 버전 (월/일 집계 조회를 동시에 실행)
+    """
+    async def fetch(queryset):
+        return [row async for row in queryset]
+
+    querysets = _summary_querysets(user, start_date, end_date, category_id)
+    return merge_summary(await asyncio.gather(*(fetch(queryset) for queryset in querysets)))
+
+
+def _sources(user_ids=None):
+    """
+    집계 대상 : 원본 지출 + 보관된 지출 (삭제된 지출 제외)
+    """
+    querysets = [
+        Expenditure.objects.filter(is_sum=True),
+        ArchivedExpenditure.objects.filter(is_sum=True, deleted_at__isnull=True),
+    ]
+    if user_ids:
+        querysets = [queryset.filter(user_id__in=user_ids) for queryset in querysets]
+    return querysets
+
+
+def _merge_sorted(key_fields, querysets):
+    """
+    키 순으로 정렬한 테이블별 집계 결과를 같은 키끼리 합산 (전체 결과를 메모리에 올리지 않음)
+    """
+    key = itemgetter(*key_fields)
+    iterators = [queryset.order_by(*key_fields).iterator(chunk_size=BATCH_SIZE) for queryset in querysets]
+    for values, group in groupby(heapq.merge(*iterators, key=key), key=key):
+        group = list(group)
+        yield {
+            **dict(zip(key_fields, values)),
+            'total' : sum(row['total'] for row in group),
+            'rows' : sum(row['rows'] for row in group),
+        }
+
+
+def _raw_daily(user_ids=None):
+    key_fields = ('user_id', 'category_id', 'expense_date')
+    return _merge_sorted(key_fields, [
+        queryset.values(*key_fields).annotate(total=Sum('money'), rows=Count('id'))
+        for queryset in _sources(user_ids)
+    ])
+
+
+def _raw_monthly(user_ids=None):
+    key_fields = ('user_id', 'category_id', 'month')
+    return _merge_sorted(key_fields, [
+        queryset.annotate(month=TruncMonth('expense_date')).values(*key_fields).annotate(total=Sum('money'), rows=Count('id'))
+        for queryset in _sources(user_ids)
+    ])
+
+
+def _bulk_insert(model, objs):
+    batch = []
+    for obj in objs:
+        batch.append(obj)
+        if len(batch) >= BATCH_SIZE:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+@transaction.atomic
+def rebuild(user_ids=None):
+    """
+    원본(보관 포함) 지출 테이블로부터 일/월 집계를 다시 생성
+    """
+    daily = ExpenditureDailySummary.objects.all()
+    monthly = ExpenditureMonthlySummary.objects.all()
+    if user_ids:
+        daily = daily.filter(user_id__in=user_ids)
+        monthly = monthly.filter(user_id__in=user_ids)
+    daily.delete()
+    monthly.delete()
+
+    _bulk_insert(ExpenditureDailySummary, (
+        ExpenditureDailySummary(
+            user_id=row['user_id'],
+            category_id=row['category_id'],
+            expense_date=row['expense_date'],
+            money=row['total'],
+            count=row['rows'],
+        )
+        for row in _raw_daily(user_ids)
+    ))
+    _bulk_insert(ExpenditureMonthlySummary, (
+        ExpenditureMonthlySummary(
+            user_id=row['user_id'],
+            category_id=row['category_id'],
+            month=row['month'],
+            money=row['total'],
+            count=row['rows'],
+        )
+        for row in _raw_monthly(user_ids)
+    ))
+
+
+def _diff(expected_rows, model, date_field, user_ids=None):
+    queryset = model.objects.filter(count__gt=0)
+    if user_ids:
+        queryset = queryset.filter(user_id__in=user_ids)
+
+    stored = {
+        (row['user_id'], row['category_id'], row[date_field]) : (row['money'], row['count'])
+        for row in queryset.values('user_id', 'category_id', date_field, 'money', 'count')
+    }
+
+    mismatches = []
+    for row in expected_rows:
+        key = (row['user_id'], row['category_id'], row[date_field])
+        expected = (row['total'], row['rows'])
+        actual = stored.pop(key, (0, 0))
+        if expected != actual:
+            mismatches.append((model.__name__, key, expected, actual))
+
+    for key, actual in stored.items():
+        mismatches.append((model.__name__, key, (0, 0), actual))
+
+    return mismatches
+
+
+def verify(user_ids=None):
+    """
+    집계 테이블과 원본(보관 포함) 지출 테이블을 비교해 불일치 목록을 반환
+    """
+    expected_daily = _raw_daily(user_ids)
+    expected_monthly = _raw_monthly(user_ids)
+
+    return (
+        _diff(expected_daily, ExpenditureDailySummary, 'expense_date', user_ids)
+        + _diff(expected_monthly, ExpenditureMonthlySummary, 'month', user_ids)
+    )
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from common.serializers import ValuesSerializerMixin
+from expenditure import reports
 from expenditure.models import Expenditure
 
 
@@ -10,9 +12,16 @@ class ExpenditureSerializer(serializers.ModelSerializer):
         fields = ('__all__')
 
 
-class ExpenditureListSerializer(serializers.ModelSerializer):
+class ExpenditureListSerializer(ValuesSerializerMixin, serializers.ModelSerializer):
     category = serializers.StringRelatedField()
 
+    value_fields = {
+        'id' : 'id',
+        'category' : 'category__name',
+        'money' : 'money',
+        'expense_date' : 'expense_date'
+    }
+
     class Meta:
         model = Expenditure
         fields = [
@@ -49,3 +58,60 @@ class ExpenditureCreateSerializer(serializers.Serializer):
     expense_date = serializers.DateField(format="%Y-%m-%d")
     is_sum = serializers.BooleanField(default=True)
 
+
+
+class ExpenditureImportSerializer(serializers.ModelSerializer):
+    """
+    일괄 등록용 행 검증 (ExpenditureSerializer 와 같은 모델 규칙, 카테고리는 이름으로 입력)
+    """
+    category = serializers.CharField()
+
+    class Meta:
+        model = Expenditure
+        fields = [
+            'money',
+            'comment',
+            'expense_date',
+            'is_sum',
+            'category'
+        ]
+        extra_kwargs = {
+            'money' : {'min_value' : 0}
+        }
+
+
+class ExpenditureImportInputSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=['csv', 'jsonl'], required=False)
+    batch_size = serializers.IntegerField(min_value=1, max_value=10000, default=1000)
+
+
+class ExpenditureReportInputSerializer(serializers.Serializer):
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    interval = serializers.ChoiceField(choices=['day', 'week', 'month'], default='day')
+    category = serializers.CharField(required=False)
+
+    def validate(self, data):
+        if data['start_date'] > data['end_date']:
+            raise serializers.ValidationError("조회 시작일이 종료일보다 늦습니다.")
+
+        max_days = reports.MAX_DAYS[data['interval']]
+        if (data['end_date'] - data['start_date']).days >= max_days:
+            raise serializers.ValidationError(f"{data['interval']} 단위 리포트는 최대 {max_days}일까지 조회할 수 있습니다.")
+        return data
+
+
+class ExpenditureExportInputSerializer(serializers.Serializer):
+    format = serializers.ChoiceField(choices=['csv', 'jsonl'], default='csv')
+    gzip = serializers.BooleanField(default=False)
+    start_date = serializers.DateField(required=False, help_text="기간(시작), 없으면 전체 기간")
+    end_date = serializers.DateField(required=False, help_text="기간(끝), 없으면 전체 기간")
+    category = serializers.CharField(required=False)
+    min_m = serializers.IntegerField(required=False)
+    max_m = serializers.IntegerField(required=False)
+
+    def validate(self, data):
+        if 'start_date' in data and 'end_date' in data and data['start_date'] > data['end_date']:
+            raise serializers.ValidationError("조회 시작일이 종료일보다 늦습니다.")
+        return data
@@ -0,0 +1,99 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from budget import plans
+from common.response_cache import bump_user_version
+from expenditure import rollups
+from expenditure.models import Expenditure
+
+
+ROLLUP_FIELDS = ('user_id', 'category_id', 'expense_date', 'money', 'is_sum')
+
+_suppressed = ContextVar('expenditure_signals_suppressed', default=False)
+
+
+@contextmanager
+def suppress_rollups():
+    """
+    구간 안의 지출 저장/삭제에서 집계, 지출 계획, 응답 캐시 갱신을 생략
+    집계를 직접 관리하는 일괄 작업(보관 이동 등)에서 QuerySet.delete() 를 사용할 때 사용
+    """
+    token = _suppressed.set(True)
+    try:
+        yield
+    finally:
+        _suppressed.reset(token)
+
+
+def _snapshot(values):
+    expense_date = values['expense_date']
+    if isinstance(expense_date, str):
+        expense_date = date.fromisoformat(expense_date)
+    return (values['user_id'], values['category_id'], expense_date, values['money'], values['is_sum'])
+
+
+def _current(instance):
+    return _snapshot({field : getattr(instance, field) for field in ROLLUP_FIELDS})
+
+
+def _invalidate_plans(user_id, expense_date):
+    # 배치로 계산된 지출 계획은 커밋된 지출 기준으로 다시 계산되도록 커밋 후 삭제
+    transaction.on_commit(lambda: plans.invalidate(user_id, expense_date))
+
+
+@receiver(pre_save, sender=Expenditure)
+def capture_previous_expenditure(sender, instance, **kwargs):
+    if _suppressed.get():
+        return
+    instance._rollup_previous = None
+    if instance.pk is None or instance._state.adding:
+        return
+
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None or not all(field in loaded for field in ROLLUP_FIELDS):
+        loaded = Expenditure.objects.filter(pk=instance.pk).values(*ROLLUP_FIELDS).first()
+
+    if loaded is not None:
+        instance._rollup_previous = _snapshot(loaded)
+
+
+@receiver(post_save, sender=Expenditure)
+def update_rollup_on_save(sender, instance, **kwargs):
+    if _suppressed.get():
+        return
+    previous = getattr(instance, '_rollup_previous', None)
+    current = _current(instance)
+
+    deltas = {}
+    if previous is not None and previous[4]:
+        deltas[previous[:3]] = (-previous[3], -1)
+    if current[4]:
+        money, count = deltas.get(current[:3], (0, 0))
+        deltas[current[:3]] = (money + current[3], count + 1)
+
+    for key, (money, count) in deltas.items():
+        rollups.apply(*key, money, count)
+    for user_id in {key[0] for key in deltas}:
+        _invalidate_plans(user_id, min(key[2] for key in deltas if key[0] == user_id))
+
+    instance._rollup_previous = None
+    instance._loaded_values = dict(zip(ROLLUP_FIELDS, current))
+    bump_user_version(instance.user_id)
+
+
+@receiver(post_delete, sender=Expenditure)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    if _suppressed.get():
+        return
+    loaded = getattr(instance, '_loaded_values', None)
+    previous = _snapshot(loaded) if loaded and all(field in loaded for field in ROLLUP_FIELDS) else _current(instance)
+
+    if previous[4]:
+        rollups.apply(*previous[:3], -previous[3], -1)
+        _invalidate_plans(previous[0], previous[2])
+    bump_user_version(instance.user_id)
@@ -1,3 +1,611 @@
-from django.test import TestCase
+import gzip
+import json
+import time
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Q
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from categories.models import Category
+from common.renderers import FastJSONRenderer
+from common.response_cache import bump_user_version
+from common.testing import ExplainMixin, QueryBudgetMixin
+from expenditure import archive, exporters, importers, reports, rollups
+from expenditure.models import ArchivedExpenditure, Expenditure, ExpenditureDailySummary, ExpenditureMonthlySummary
+from expenditure.serializers import ExpenditureListSerializer
+from expenditure.views import ExpenditureAPIView, ExpenditureDetailAPIView
+from users.models import User
+
+
+class ExpenditureRollupTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        cls.food = Category.objects.create(name='식비', description='식비')
+        cls.cafe = Category.objects.create(name='카페', description='카페')
+
+    def summary(self, model, date_field):
+        return {
+            (row.category_id, getattr(row, date_field)) : (row.money, row.count)
+            for row in model.objects.filter(user=self.user, count__gt=0)
+        }
+
+    def daily(self):
+        return self.summary(ExpenditureDailySummary, 'expense_date')
+
+    def monthly(self):
+        return self.summary(ExpenditureMonthlySummary, 'month')
+
+    def test_create_update_delete(self):
+        food, cafe = self.food.id, self.cafe.id
+        expenditure = Expenditure.objects.create(user=self.user, category=self.food, money=1000, expense_date=date(2023, 11, 5))
+        Expenditure.objects.create(user=self.user, category=self.food, money=500, expense_date=date(2023, 11, 20))
+
+        self.assertEqual(self.daily(), {(food, date(2023, 11, 5)) : (1000, 1), (food, date(2023, 11, 20)) : (500, 1)})
+        self.assertEqual(self.monthly(), {(food, date(2023, 11, 1)) : (1500, 2)})
+
+        expenditure.money = 3000
+        expenditure.expense_date = date(2023, 12, 1)
+        expenditure.category = self.cafe
+        expenditure.save()
+
+        self.assertEqual(self.daily(), {(food, date(2023, 11, 20)) : (500, 1), (cafe, date(2023, 12, 1)) : (3000, 1)})
+        self.assertEqual(self.monthly(), {(food, date(2023, 11, 1)) : (500, 1), (cafe, date(2023, 12, 1)) : (3000, 1)})
+
+        expenditure.delete()
+
+        self.assertEqual(self.daily(), {(food, date(2023, 11, 20)) : (500, 1)})
+        self.assertEqual(self.monthly(), {(food, date(2023, 11, 1)) : (500, 1)})
+        self.assertEqual(rollups.verify(), [])
+
+    def test_is_sum_toggle(self):
+        expenditure = Expenditure.objects.create(user=self.user, category=self.food, money=1000, expense_date=date(2023, 11, 5), is_sum=False)
+        self.assertEqual(self.daily(), {})
+
+        expenditure.is_sum = True
+        expenditure.save()
+        self.assertEqual(self.daily(), {(self.food.id, date(2023, 11, 5)) : (1000, 1)})
+
+        expenditure.is_sum = False
+        expenditure.save()
+        self.assertEqual(self.daily(), {})
+        self.assertEqual(self.monthly(), {})
+
+    def test_rebuild_command_matches_recount(self):
+        # bulk_create 는 signal 이 발생하지 않으므로 집계와 원본이 달라진 상태
+        Expenditure.objects.bulk_create([
+            Expenditure(user=self.user, category=self.food if day % 2 else self.cafe, money=100 * day, expense_date=date(2023, 10 + day % 2, day), is_sum=day % 5 != 0)
+            for day in range(1, 29)
+        ])
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_expenditure_rollup', '--verify-only', stdout=StringIO(), stderr=StringIO())
+
+        call_command('rebuild_expenditure_rollup', stdout=StringIO())
+
+        expected = {}
+        for row in Expenditure.objects.filter(user=self.user, is_sum=True):
+            money, count = expected.get((row.category_id, row.expense_date), (0, 0))
+            expected[(row.category_id, row.expense_date)] = (money + row.money, count + 1)
+
+        self.assertEqual(self.daily(), expected)
+        self.assertEqual(rollups.verify(), [])
+        call_command('rebuild_expenditure_rollup', '--verify-only', stdout=StringIO())
+
+
+class ExpenditureImportTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        cls.category = Category.objects.create(name='식비', description='식비')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, name, content, **data):
+        upload = SimpleUploadedFile(name, content.encode('utf-8'))
+        return self.client.post('/api/v1/expenditure/import/', {'file' : upload, **data}, format='multipart')
+
+    def test_read_rows(self):
+        csv_rows = list(importers.read_rows(BytesIO('\ufeffmoney,category,expense_date,comment\n1000,식비,2023-11-01,\n'.encode('utf-8')), 'csv'))
+        jsonl_rows = list(importers.read_rows(StringIO('{"money": 1000}\n\nnot json\n[1]\n'), 'jsonl'))
+
+        self.assertEqual(csv_rows, [{'money' : '1000', 'category' : '식비', 'expense_date' : '2023-11-01'}])
+        self.assertEqual(jsonl_rows[0], {'money' : 1000})
+        self.assertEqual(len(jsonl_rows), 3)
+        self.assertTrue(all(isinstance(row, importers.InvalidRow) for row in jsonl_rows[1:]))
+
+    def test_csv_partial_failure_across_batches(self):
+        lines = ['money,category,expense_date,is_sum']
+        for day in range(1, 8):
+            lines.append(f'{1000 * day},식비,2023-11-{day:02d},true')
+        lines.insert(3, '-5,식비,2023-11-02,true')
+        lines.insert(6, '1000,없는카테고리,2023-11-03,true')
+        lines.append('2000,식비,2023-11-07,false')
+
+        response = self.upload('expenditures.csv', '\n'.join(lines) + '\n', batch_size=3)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 8)
+        self.assertEqual([error['row'] for error in response.data['errors']], [3, 6])
+        self.assertIn('money', response.data['errors'][0]['errors'])
+        self.assertIn('category', response.data['errors'][1]['errors'])
+
+        # bulk_create 로 등록한 지출도 집계에 반영 (is_sum=False 제외)
+        self.assertEqual(rollups.verify(), [])
+        month = ExpenditureMonthlySummary.objects.get(user=self.user, category=self.category, month=date(2023, 11, 1))
+        self.assertEqual((month.money, month.count), (28000, 7))
+
+    def test_jsonl_errors_only(self):
+        content = 'not json\n{"money": 1000, "category": "식비"}\n'
+
+        response = self.upload('expenditures.jsonl', content)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['created'], 0)
+        self.assertEqual([error['row'] for error in response.data['errors']], [1, 2])
+        self.assertIn('expense_date', response.data['errors'][1]['errors'])
+        self.assertFalse(Expenditure.objects.filter(user=self.user).exists())
+
+
+class ExpenditureExportTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        other = User.objects.create_user(username='other', password='password')
+        cls.food = Category.objects.create(name='식비', description='식비')
+        cls.traffic = Category.objects.create(name='교통', description='교통')
+        for day in range(10, 0, -1):
+            Expenditure.objects.create(user=cls.user, category=cls.food if day % 2 else cls.traffic, money=1000 * day, comment=f'메모,{day}', expense_date=date(2023, 11, day))
+        Expenditure.objects.create(user=cls.user, category=cls.food, money=500, expense_date=date(2023, 11, 3), is_sum=False)
+        Expenditure.objects.create(user=other, category=cls.food, money=999, expense_date=date(2023, 11, 1))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def export(self, **params):
+        response = self.client.get('/api/v1/expenditure/export/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def test_csv(self):
+        response, content = self.export()
+
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="expenditures.csv"')
+        self.assertTrue(content.startswith('\ufeff'.encode('utf-8')))
+
+        # 지출일, id 순 / 다른 사용자 제외 / is_sum=False 포함 / import 형식으로 다시 읽을 수 있음
+        rows = list(importers.read_rows(BytesIO(content), 'csv'))
+        self.assertEqual(len(rows), 11)
+        self.assertEqual([row['expense_date'] for row in rows], sorted(row['expense_date'] for row in rows))
+        first = Expenditure.objects.get(user=self.user, expense_date=date(2023, 11, 1))
+        self.assertEqual(rows[0], {'id' : str(first.id), 'expense_date' : '2023-11-01', 'category' : '식비', 'money' : '1000', 'comment' : '메모,1', 'is_sum' : 'True'})
+        self.assertEqual(sum(row['is_sum'] == 'False' for row in rows), 1)
+
+    def test_jsonl(self):
+        response, content = self.export(format='jsonl')
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        rows = [json.loads(line) for line in content.decode('utf-8').splitlines()]
+        self.assertEqual(len(rows), 11)
+        self.assertEqual(set(rows[0]), set(exporters.FIELDS))
+        self.assertEqual((rows[-1]['expense_date'], rows[-1]['category'], rows[-1]['money']), ('2023-11-10', '교통', 10000))
+
+    def test_gzip(self):
+        for file_format in exporters.FORMATS:
+            _, plain = self.export(format=file_format)
+            response, compressed = self.export(format=file_format, gzip='true')
+
+            self.assertEqual(response['Content-Type'], 'application/gzip')
+            self.assertEqual(response['Content-Disposition'], f'attachment; filename="expenditures.{file_format}.gz"')
+            self.assertEqual(gzip.decompress(compressed), plain)
+
+    def test_filtered(self):
+        _, content = self.export(format='jsonl', category='식비', start_date='2023-11-02', end_date='2023-11-09', min_m=4000, max_m=9000)
+
+        rows = [json.loads(line) for line in content.decode('utf-8').splitlines()]
+        self.assertEqual([(row['expense_date'], row['money']) for row in rows], [('2023-11-05', 5000), ('2023-11-07', 7000), ('2023-11-09', 9000)])
+
+        response = self.client.get('/api/v1/expenditure/export/', {'category' : '없는카테고리'})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get('/api/v1/expenditure/export/', {'format' : 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_stream_in_chunks(self):
+        querysets = [Expenditure.objects.filter(user=self.user)]
+
+        with mock.patch.object(exporters, 'BUFFER_SIZE', 100):
+            chunks = list(exporters.stream(querysets, 'csv'))
+
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual(b''.join(chunks), b''.join(exporters.stream(querysets, 'csv')))
+
+
+class ExpenditurePaginationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        cls.category = Category.objects.create(name='식비', description='식비')
+        # 같은 지출일이 여러 건이어도 id 로 순서가 정해지는지 확인
+        for number in range(12):
+            Expenditure.objects.create(user=cls.user, category=cls.category, money=1000, expense_date=date(2023, 11, 1 + number // 3))
+
+    def setUp(self):
+        cache.clear()
+        caches['local'].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.params = {'start_date' : '2023-11-01', 'end_date' : '2023-11-30'}
+
+    def test_cursor_round_trip(self):
+        expected = list(Expenditure.objects.filter(user=self.user).order_by('expense_date', 'id').values_list('id', flat=True))
+
+        pages = []
+        response = self.client.get('/api/v1/expenditure/', {**self.params, 'page_size' : 5})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            pages.append([row['id'] for row in response.data['expense_list']])
+            if response.data['next'] is None:
+                self.assertFalse(response.has_header('Link'))
+                break
+            self.assertEqual(response['Link'], f'<{response.data["next"]}>; rel="next"')
+            response = self.client.get(response.data['next'])
+
+        self.assertEqual([len(page) for page in pages], [5, 5, 2])
+        self.assertEqual(sum(pages, []), expected)
+
+    @override_settings(LIST_PAGE_SIZE=4, LIST_MAX_PAGE_SIZE=6)
+    def test_page_size_default_and_limit(self):
+        default = self.client.get('/api/v1/expenditure/', self.params)
+        limited = self.client.get('/api/v1/expenditure/', {**self.params, 'page_size' : 100})
+
+        self.assertEqual(len(default.data['expense_list']), 4)
+        self.assertEqual(len(limited.data['expense_list']), 6)
+
+    def test_tampered_cursor(self):
+        first = self.client.get('/api/v1/expenditure/', {**self.params, 'page_size' : 5})
+        cursor = first.data['next'].split('cursor=')[1].split('&')[0]
+
+        for invalid in (cursor[:-2] + 'xx', 'WyIyMDIzLTExLTAxIl0', '!!!'):
+            response = self.client.get('/api/v1/expenditure/', {**self.params, 'cursor' : invalid})
+            self.assertEqual(response.status_code, 404)
+
+
+class ExpenditureReportTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        cls.food = Category.objects.create(name='식비', description='식비')
+        cls.cafe = Category.objects.create(name='카페', description='카페')
+        # 2023-11-05 는 일요일, 2023-11-06 은 월요일
+        for category, money, day in ((cls.food, 1000, date(2023, 10, 31)), (cls.food, 2000, date(2023, 11, 5)), (cls.cafe, 500, date(2023, 11, 6)), (cls.food, 300, date(2023, 12, 1))):
+            Expenditure.objects.create(user=cls.user, category=category, money=money, expense_date=day)
+
+    def setUp(self):
+        cache.clear()
+        caches['local'].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def report(self, **params):
+        return self.client.get('/api/v1/expenditure/report/', params)
+
+    def test_week_buckets_start_on_monday(self):
+        report = reports.spending_report(self.user, date(2023, 11, 1), date(2023, 11, 14), interval='week')
+
+        self.assertEqual(report['buckets'], [date(2023, 10, 30), date(2023, 11, 6), date(2023, 11, 13)])
+        # 조회 기간 밖(10/31)은 제외, 11/5 는 첫 주, 11/6 은 다음 주
+        self.assertEqual(report['series'], {'식비' : [2000, 0, 0], '카페' : [0, 500, 0]})
+        self.assertEqual(report['total'], [2000, 500, 0])
+
+    def test_month_buckets_with_partial_months(self):
+        report = reports.spending_report(self.user, date(2023, 10, 31), date(2024, 1, 15), interval='month')
+
+        self.assertEqual(report['buckets'], [date(2023, 10, 1), date(2023, 11, 1), date(2023, 12, 1), date(2024, 1, 1)])
+        self.assertEqual(report['series'], {'식비' : [1000, 2000, 300, 0], '카페' : [0, 500, 0, 0]})
+
+    def test_empty_buckets_and_category_filter(self):
+        response = self.report(start_date='2023-11-04', end_date='2023-11-07', category='카페')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['buckets'], [date(2023, 11, day) for day in range(4, 8)])
+        self.assertEqual(response.data['series'], {'카페' : [0, 0, 500, 0]})
+        self.assertEqual(response.data['total'], [0, 0, 500, 0])
+
+    def test_range_is_capped_per_interval(self):
+        for interval, max_days in reports.MAX_DAYS.items():
+            start = date(2000, 1, 1)
+            allowed = self.report(start_date=start, end_date=start + timedelta(days=max_days - 1), interval=interval)
+            too_long = self.report(start_date=start, end_date=start + timedelta(days=max_days), interval=interval)
+
+            self.assertEqual(allowed.status_code, 200)
+            self.assertEqual(too_long.status_code, 400)
+
+        self.assertEqual(self.report(start_date='2023-11-02', end_date='2023-11-01').status_code, 400)
+
+
+class ExpenditureAsyncAPITest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        categories = [Category.objects.create(name=name, description=name) for name in ('식비', '교통')]
+        for day in range(1, 21):
+            Expenditure.objects.create(user=cls.user, category=categories[day % 2], money=1000 * day, expense_date=date(2023, 11, day))
+
+    def setUp(self):
+        cache.clear()
+        caches['local'].clear()
+        self.async_client = AsyncClient()
+        self.headers = {'Authorization' : f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+
+    async def get_both(self, params):
+        sync = await self.async_client.get('/api/v1/expenditure/', params, headers=self.headers)
+        async_ = await self.async_client.get('/api/v1/expenditure/async/', params, headers=self.headers)
+        return sync, async_
+
+    async def test_matches_sync_view(self):
+        base = {'start_date' : '2023-11-01', 'end_date' : '2023-11-30', 'page_size' : 7}
+        for params in (base, {**base, 'category' : '식비'}, {**base, 'min_m' : 3000, 'max_m' : 12000}):
+            sync, async_ = await self.get_both(params)
+            self.assertEqual(async_.status_code, 200)
+
+            sync_data, async_data = sync.json(), async_.json()
+            self.assertEqual(async_data['next'], sync_data['next'].replace('/expenditure/?', '/expenditure/async/?'))
+            for key in ('expense_list', 'sum_category', 'total_sum'):
+                self.assertEqual(async_data[key], sync_data[key])
+
+        # 다음 페이지
+        _, async_ = await self.get_both(base)
+        second = await self.async_client.get(async_.json()['next'], headers=self.headers)
+        self.assertEqual(len(second.json()['expense_list']), 7)
+        self.assertEqual(second['Link'].count('rel="next"'), 1)
+
+    async def test_errors_match_sync_view(self):
+        base = {'start_date' : '2023-11-01', 'end_date' : '2023-11-30'}
+        for params, expected in (({**base, 'category' : '없음'}, 404), ({'start_date' : '2023-13-01'}, 400), ({'start_date' : '2024-01-01', 'end_date' : '2024-01-31'}, 404)):
+            sync, async_ = await self.get_both(params)
+            self.assertEqual((sync.status_code, async_.status_code), (expected, expected))
+            self.assertEqual(async_.json(), sync.json())
+
+
+class ExpenditureQueryPlanTest(ExplainMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        cls.category = Category.objects.create(name='식비', description='식비')
+        Expenditure.objects.bulk_create([
+            Expenditure(user=cls.user, category=cls.category, money=1000 * day, expense_date=date(2023, 11, day))
+            for day in range(1, 29)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_uses_index(self):
+        params = {'start_date' : '2023-11-01', 'end_date' : '2023-11-30'}
+        response, queries = self.capture(self.client.get, '/api/v1/expenditure/', params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertUsesIndex(queries, 'expenditure')
+
+    def test_filtered_list_uses_index(self):
+        params = {
+            'start_date' : '2023-11-01',
+            'end_date' : '2023-11-30',
+            'category' : '식비',
+            'min_m' : 1000,
+            'max_m' : 10000
+        }
+        response, queries = self.capture(self.client.get, '/api/v1/expenditure/', params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertUsesIndex(queries, 'expenditure')
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class ExpenditureQueryBudgetTest(QueryBudgetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        categories = [Category.objects.create(name=name, description=name) for name in ('식비', '교통', '카페')]
+        for day in range(1, 29):
+            for category in categories:
+                Expenditure.objects.create(user=cls.user, category=category, money=1000, expense_date=date(2023, 11, day))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}")
+
+    def test_list_query_budget(self):
+        params = {'start_date' : '2023-11-01', 'end_date' : '2023-11-30', 'category' : '식비'}
+        response, queries = self.capture(self.client.get, '/api/v1/expenditure/', params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['expense_list']), 28)
+        self.assertEqual(response.data['expense_list'][0]['category'], '식비')
+        self.assertQueryBudget(ExpenditureAPIView, 'get', queries)
+
+    def test_detail_query_budget(self):
+        expenditure = Expenditure.objects.filter(user=self.user).first()
+        response, queries = self.capture(self.client.get, f'/api/v1/expenditure/{expenditure.id}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user'], 'tester')
+        self.assertQueryBudget(ExpenditureDetailAPIView, 'get', queries)
+
+
+class ExpenditureListRenderingTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        categories = [Category.objects.create(name=name, description=name) for name in ('식비', 'cafe\u2028')]
+        Expenditure.objects.bulk_create([
+            Expenditure(user=cls.user, category=categories[day % 2], money=1000 * day, expense_date=date(2023, 11, day))
+            for day in range(1, 29)
+        ])
+
+    def test_values_path_matches_serializer(self):
+        queryset = Expenditure.objects.filter(user=self.user).order_by('expense_date', 'id')
+
+        expected = JSONRenderer().render(ExpenditureListSerializer(queryset.select_related('category'), many=True).data)
+        actual = FastJSONRenderer().render(ExpenditureListSerializer.represent_values(ExpenditureListSerializer.values(queryset)))
+
+        self.assertEqual(actual, expected)
+
+
+class ExpenditureResponseCacheTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        cls.category = Category.objects.create(name='식비', description='식비')
+        for day in range(1, 11):
+            Expenditure.objects.create(user=cls.user, category=cls.category, money=1000 * day, expense_date=date(2023, 11, day))
+
+    def setUp(self):
+        cache.clear()
+        caches['local'].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.params = {'start_date' : '2023-11-01', 'end_date' : '2023-11-30', 'page_size' : 5}
+
+    def get(self, **extra):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/expenditure/', self.params, **extra)
+        return response, len(context.captured_queries)
+
+    def test_cached_until_data_changes(self):
+        first, _ = self.get()
+        second, queries = self.get()
+
+        self.assertEqual(queries, 0)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Link'], first['Link'])
+        self.assertEqual(second['ETag'], first['ETag'])
+
+        not_modified, queries = self.get(HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(queries, 0)
+
+        Expenditure.objects.create(user=self.user, category=self.category, money=500, expense_date=date(2023, 11, 1))
+
+        changed, queries = self.get(HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertGreater(queries, 0)
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+
+
+class ExpenditureArchiveTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tester', password='password')
+        cls.category = Category.objects.create(name='식비', description='식비')
+        for month in (9, 10, 11):
+            for day in range(1, 6):
+                Expenditure.objects.create(user=cls.user, category=cls.category, money=1000 * day, expense_date=date(2023, month, day))
+
+    def setUp(self):
+        cache.clear()
+        caches['local'].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def walk(self, **params):
+        ids, url, params = [], '/api/v1/expenditure/', {'page_size' : 4, **params}
+        while url:
+            data = self.client.get(url, params).json()
+            ids += [row['id'] for row in data['expense_list']]
+            url, params = data['next'], None
+        return ids, data['sum_category'], data['total_sum']
+
+    def test_archived_months_are_listed_only_when_needed(self):
+        params = {'start_date' : '2023-09-01', 'end_date' : '2023-11-30'}
+        filtered = {**params, 'min_m' : 2000, 'max_m' : 4000}
+        expected, expected_filtered = self.walk(**params), self.walk(**filtered)
+
+        moved = archive.archive_before(date(2023, 11, 1), batch_size=4)
+        cache.clear()
+        caches['local'].clear()
+
+        self.assertEqual(moved, 10)
+        self.assertEqual(Expenditure.objects.count(), 5)
+        self.assertEqual(self.walk(**params), expected)
+        self.assertEqual(self.walk(**filtered), expected_filtered)
+        self.assertEqual(rollups.verify(), [])
+        self.assertEqual(len(archive.querysets(Q(user=self.user), date(2023, 11, 1))), 1)
+
+    def test_stale_boundary_expires(self):
+        params = {'start_date' : '2023-09-01', 'end_date' : '2023-11-30'}
+        expected = self.walk(**params)
+        # 보관 전에 이 프로세스가 캐시해 둔 기준일
+        self.assertEqual(archive.boundary(), date.min)
+
+        archive.archive_before(date(2023, 11, 1))
+        # 보관 명령을 다른 프로세스에서 실행한 경우 이 프로세스의 캐시(locmem)는 바뀌지 않음
+        cache.clear()
+        caches['local'].clear()
+        cache.set(archive.BOUNDARY_KEY, date.min, settings.EXPENDITURE_ARCHIVE_SYNC_INTERVAL)
+        self.assertEqual(len(self.walk(**params)[0]), 5)
+
+        later = time.time() + settings.EXPENDITURE_ARCHIVE_SYNC_INTERVAL + 1
+        with mock.patch('time.time', return_value=later):
+            self.assertEqual(archive.boundary(), date(2023, 10, 6))
+
+        # 캐시된 응답이 아닌 새로 조회한 결과로 비교
+        bump_user_version(self.user.pk)
+        self.assertEqual(self.walk(**params), expected)
+
+    def test_delete_keeps_archived_copy(self):
+        expenditure = Expenditure.objects.filter(user=self.user).first()
+
+        response = self.client.delete(f'/api/v1/expenditure/{expenditure.id}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Expenditure.objects.filter(id=expenditure.id).exists())
+        self.assertIsNotNone(ArchivedExpenditure.objects.get(id=expenditure.id).deleted_at)
+        self.assertNotIn(expenditure.id, self.walk(start_date='2023-09-01', end_date='2023-11-30')[0])
+        self.assertEqual(rollups.verify(), [])
+        # 삭제한 지출은 상세 조회에서도 찾을 수 없음
+        self.assertEqual(self.client.get(f'/api/v1/expenditure/{expenditure.id}/').status_code, 404)
+
+    def test_archived_detail_is_read_only(self):
+        archive.archive_before(date(2023, 11, 1))
+        archived = ArchivedExpenditure.objects.filter(user=self.user).order_by('id').first()
+        url = f'/api/v1/expenditure/{archived.id}/'
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['id'], response.data['money'], response.data['category']), (archived.id, archived.money, '식비'))
+
+        self.assertEqual(self.client.put(url, {'money' : 1, 'category' : '식비'}, format='json').status_code, 400)
+        self.assertEqual(self.client.delete(url).status_code, 400)
+        self.assertIsNone(ArchivedExpenditure.objects.get(id=archived.id).deleted_at)
+        self.assertEqual(rollups.verify(), [])
+
+        self.assertEqual(self.client.get('/api/v1/expenditure/999999/').status_code, 404)
@@ -1,8 +1,12 @@
 from django.urls import path
 
-from expenditure.views import ExpenditureAPIView, ExpenditureDetailAPIView
+from expenditure.views import ExpenditureAPIView, ExpenditureAsyncAPIView, ExpenditureDetailAPIView, ExpenditureExportAPIView, ExpenditureImportAPIView, ExpenditureReportAPIView
 
 urlpatterns = [
     path('', ExpenditureAPIView.as_view()),
+    path('async/', ExpenditureAsyncAPIView.as_view()),
+    path('report/', ExpenditureReportAPIView.as_view()),
+    path('export/', ExpenditureExportAPIView.as_view()),
+    path('import/', ExpenditureImportAPIView.as_view()),
     path('<int:expenditure_id>/', ExpenditureDetailAPIView.as_view()),
 ]
\ No newline at end of file
@@ -1,6 +1,14 @@
+import asyncio
+from datetime import date
+
+from asgiref.sync import sync_to_async
+
+from django.core.handlers.asgi import ASGIRequest
 from django.db.models import Q, Sum, F
+from django.http import StreamingHttpResponse
 
 from rest_framework.views import APIView
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
@@ -8,17 +16,89 @@ from rest_framework import status
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from categories.models import Category
+from categories.registry import registry
+from common.pagination import KeysetPagination
+from common.response_cache import cache_response
+from common.views import AsyncAPIView, InstrumentedViewMixin, aiterate
+from expenditure import archive, exporters, importers, reports, rollups
 from expenditure.models import Expenditure
-from expenditure.serializers import ExpenditureCreateSerializer, ExpenditureDetailSerializer, ExpenditureListSerializer, ExpenditureSerializer
+from expenditure.serializers import ExpenditureCreateSerializer, ExpenditureDetailSerializer, ExpenditureExportInputSerializer, ExpenditureImportInputSerializer, ExpenditureListSerializer, ExpenditureReportInputSerializer, ExpenditureSerializer
+
+
+class ExpenditureListMixin:
+    """
+    지출 목록 조회 API 의 동기/비동기 버전이 함께 사용하는 조회 조건 해석과 응답 생성
+    """
+    list_ordering = ('expense_date', 'id')
+
+    def list_filters(self, request):
+        """
+        (조회 조건, 시작일, 종료일, 카테고리 id, 금액 범위 조건 여부) 또는 오류 응답
+        """
+        try:
+            start_date = date.fromisoformat(request.query_params.get('start_date', "2023-11-01"))
+            end_date = date.fromisoformat(request.query_params.get('end_date', "2023-11-30"))
+        except ValueError:
+            return Response({"message" : "조회 기간 형식(YYYY-MM-DD)을 확인해주세요."}, status=status.HTTP_400_BAD_REQUEST)
+
+        query = Q(user=request.user, expense_date__range=[start_date, end_date], is_sum=True)
+
+        category_id = None
+        category_name = request.query_params.get('category', None)
+        if category_name is not None:
+            category = registry.get_by_name(category_name)
+            if category is None:
+                return Response({"message" : "해당 카테고리의 정보가 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+            category_id = category.id
+            query &= Q(category=category)
+
+        min_m = request.query_params.get('min_m', None)
+        max_m = request.query_params.get('max_m', None)
+        money_filtered = min_m is not None and max_m is not None
+        if money_filtered:
+            query &= Q(money__range=[min_m, max_m])
+
+        return query, start_date, end_date, category_id, money_filtered
+
+    @staticmethod
+    def list_values(querysets):
+        # 목록은 모델 인스턴스 대신 values() 결과로 바로 응답 형식을 생성
+        return [ExpenditureListSerializer.values(queryset) for queryset in querysets]
+
+    @staticmethod
+    def category_sums(querysets):
+        # 금액 범위 조건은 집계 테이블로 계산할 수 없으므로 원본(보관 포함)에서 테이블별로 집계한 뒤 합산
+        return [queryset.values('category').annotate(Sum('money')).order_by() for queryset in querysets]
+
+    @staticmethod
+    def empty_response():
+        return Response({"message" : "지출 내역이 존재하지 않습니다. 지출을 등록해주세요."}, status=status.HTTP_404_NOT_FOUND)
+
+    def list_response(self, paginator, page, summary):
+        with self.timing('serialize'):
+            expense_list = ExpenditureListSerializer.represent_values(page)
+
+        sum_category_group, total = summary
+        result = {
+            "expense_list" : expense_list,
+            "sum_category" : sum_category_group,
+            "total_sum" : [total],
+            "next" : paginator.get_next_link()
+        }
+
+        return Response(result, status=status.HTTP_200_OK, headers=paginator.get_link_header())
 
 
 # api/v1/expenditure/
-class ExpenditureAPIView(APIView):
+class ExpenditureAPIView(InstrumentedViewMixin, ExpenditureListMixin, APIView):
     """
     지출 내역을 생성하고, 조회하는 기능 관련 API
     """
     permission_classes = [IsAuthenticated]
+    # 요청당 최대 쿼리 수 (인증 포함)
+    query_budget = {'get' : 5}
+    # GET 조회는 read replica 사용 (설정된 경우)
+    read_replica = True
 
     query_start_date = openapi.Parameter(
         "start_date",
@@ -41,6 +121,12 @@ class ExpenditureAPIView(APIView):
     query_max_m = openapi.Parameter(
         "max_m", openapi.IN_QUERY, type=openapi.TYPE_NUMBER, description="검색 최대금액"
     )
+    query_cursor = openapi.Parameter(
+        "cursor", openapi.IN_QUERY, type=openapi.TYPE_STRING, description="다음 페이지 cursor (응답의 next)"
+    )
+    query_page_size = openapi.Parameter(
+        "page_size", openapi.IN_QUERY, type=openapi.TYPE_NUMBER, description="페이지 크기"
+    )
     @swagger_auto_schema(
         request_body=None,
         responses={
@@ -53,52 +139,33 @@ class ExpenditureAPIView(APIView):
             query_end_date,
             query_category,
             query_min_m,
-            query_max_m
+            query_max_m,
+            query_cursor,
+            query_page_size
         ]
     )
+    @cache_response
     def get(self, request):
-        query = Q()
-        
-        user = request.user
-        start_date = request.query_params.get('start_date', "2023-11-01")
-        end_date = request.query_params.get('end_date', "2023-11-30")
-        
-        if start_date is None or end_date is None:
-            return Response({"message" : "조회 기간을 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST)
-        
-        category_name = request.query_params.get('category', None)
-        min_m = request.query_params.get('min_m', None)
-        max_m = request.query_params.get('max_m', None)
+        filters = self.list_filters(request)
+        if isinstance(filters, Response):
+            return filters
+        query, start_date, end_date, category_id, money_filtered = filters
 
-        if category_name is not None:
-            try:
-                category_instance = Category.objects.get(name=category_name)
-                query &= Q(category=category_instance)
-            except:
-                return Response({"message" : "해당 카테고리의 정보가 없습니다."}, status=status.HTTP_404_NOT_FOUND)
-        
-        if min_m is not None and max_m is not None:
-            query &= Q(money__range=[min_m, max_m])
-        
-        query &= Q(user=user)
-        query &= Q(expense_date__range=[start_date, end_date])
-        query &= Q(is_sum=True)
-
-        user_expenditure = Expenditure.objects.filter(query)
-        if user_expenditure.exists():
-            total_sum = user_expenditure.aggregate(Sum('money')).values()
-            sum_category_group = user_expenditure.values('category').annotate(Sum('money')).order_by('category')
-            serializer = ExpenditureListSerializer(user_expenditure, many=True)
-
-            result = {
-                "expense_list" : serializer.data,
-                "sum_category" : sum_category_group,
-                "total_sum" : total_sum
-            }
+        # 조회 기간이 보관 기준일 이전을 포함하는 경우에만 보관 테이블도 함께 조회
+        user_expenditures = archive.querysets(query, start_date)
 
-            return Response(result, status=status.HTTP_200_OK)
-        
-        return Response({"message" : "지출 내역이 존재하지 않습니다. 지출을 등록해주세요."}, status=status.HTTP_404_NOT_FOUND)
+        # 목록은 (지출일, id) 기준 cursor 페이지 단위로, 합계는 전체 조회 기간 기준으로 계산
+        paginator = KeysetPagination(ordering=self.list_ordering)
+        page = paginator.paginate_querysets(self.list_values(user_expenditures), request)
+        if not page and paginator.is_first_page:
+            return self.empty_response()
+
+        if money_filtered:
+            summary = rollups.merge_summary(list(queryset) for queryset in self.category_sums(user_expenditures))
+        else:
+            summary = rollups.summarize(request.user, start_date, end_date, category_id)
+
+        return self.list_response(paginator, page, summary)
     
 
     @swagger_auto_schema(
@@ -125,7 +192,7 @@ class ExpenditureAPIView(APIView):
             raise ValueError("지출 금액, 지출일, 지출 카테고리는 필수 입력사항입니다. 다시 입력해주세요.")
         
         try:
-            category = Category.objects.get(name=input_category)
+            category = registry.get(input_category)
         except Exception as e:
             return Response(
                 {
@@ -146,12 +213,190 @@ class ExpenditureAPIView(APIView):
         return Response({"message" : "지출 생성에 실패하였습니다. 다시 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST)
 
 
+# api/v1/expenditure/async/
+class ExpenditureAsyncAPIView(InstrumentedViewMixin, ExpenditureListMixin, AsyncAPIView):
+    """
+    지출 목록 조회 API 의 비동기 버전 (ASGI 배포용, 응답 형식은 동일)
+    """
+    permission_classes = [IsAuthenticated]
+    query_budget = {'get' : 5}
+    read_replica = True
+
+    @swagger_auto_schema(
+        request_body=None,
+        responses={
+            status.HTTP_200_OK : ExpenditureListSerializer,
+        },
+        operation_id="지출 목록 조회 (async)",
+        operation_description="검색/정렬 기준에 대한 지출 목록을 조회합니다.",
+        manual_parameters=[
+            ExpenditureAPIView.query_start_date,
+            ExpenditureAPIView.query_end_date,
+            ExpenditureAPIView.query_category,
+            ExpenditureAPIView.query_min_m,
+            ExpenditureAPIView.query_max_m,
+            ExpenditureAPIView.query_cursor,
+            ExpenditureAPIView.query_page_size
+        ]
+    )
+    @cache_response
+    async def get(self, request):
+        # 카테고리 조회(registry)는 캐시를 사용하므로 sync 스레드에서 실행
+        filters = await sync_to_async(self.list_filters)(request)
+        if isinstance(filters, Response):
+            return filters
+        query, start_date, end_date, category_id, money_filtered = filters
+
+        user_expenditures = await archive.aquerysets(query, start_date)
+
+        paginator = KeysetPagination(ordering=self.list_ordering)
+        page = await paginator.apaginate_querysets(self.list_values(user_expenditures), request)
+        if not page and paginator.is_first_page:
+            return self.empty_response()
+
+        if money_filtered:
+            # 테이블별 카테고리 합계를 동시에 조회
+            summary = rollups.merge_summary(await asyncio.gather(*(
+                self._fetch(queryset) for queryset in self.category_sums(user_expenditures)
+            )))
+        else:
+            summary = await rollups.asummarize(request.user, start_date, end_date, category_id)
+
+        return self.list_response(paginator, page, summary)
+
+    @staticmethod
+    async def _fetch(queryset):
+        return [row async for row in queryset]
+
+
+# api/v1/expenditure/report/
+class ExpenditureReportAPIView(InstrumentedViewMixin, APIView):
+    """
+    기간 내 지출을 일/주/월 단위, 카테고리별로 묶은 통계 API
+    """
+    permission_classes = [IsAuthenticated]
+    query_budget = {'get' : 2}
+    read_replica = True
+
+    @swagger_auto_schema(
+        query_serializer=ExpenditureReportInputSerializer,
+        operation_description="buckets 의 각 구간에 대해 카테고리별(series), 전체(total) 지출 합계를 반환합니다."
+    )
+    @cache_response
+    def get(self, request):
+        serializer = ExpenditureReportInputSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        category_id = None
+        if 'category' in data:
+            category = registry.get_by_name(data['category'])
+            if category is None:
+                return Response({"message" : "해당 카테고리의 정보가 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+            category_id = category.id
+
+        report = reports.spending_report(
+            request.user,
+            data['start_date'],
+            data['end_date'],
+            interval=data['interval'],
+            category_id=category_id
+        )
+
+        return Response(report, status=status.HTTP_200_OK)
+
+
+# api/v1/expenditure/export/
+class ExpenditureExportAPIView(APIView):
+    """
+    지출 내역 전체를 CSV/JSONL 파일로 내보내는 API (행 수와 관계없이 스트리밍)
+    """
+    permission_classes = [IsAuthenticated]
+    query_budget = {'get' : 2}
+
+    def perform_content_negotiation(self, request, force=False):
+        # ?format= 은 파일 형식으로 사용하므로 오류 응답은 기본 renderer(JSON) 로 반환
+        return super().perform_content_negotiation(request, force=True)
+
+    @swagger_auto_schema(
+        query_serializer=ExpenditureExportInputSerializer,
+        operation_description="검색 조건(기간, 카테고리, 금액)에 맞는 지출 내역을 지출일 순으로 내보냅니다. gzip=true 이면 gzip 으로 압축합니다."
+    )
+    def get(self, request):
+        serializer = ExpenditureExportInputSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        query = Q(user=request.user)
+        if 'category' in data:
+            category = registry.get_by_name(data['category'])
+            if category is None:
+                return Response({"message" : "해당 카테고리의 정보가 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+            query &= Q(category=category)
+
+        if 'start_date' in data:
+            query &= Q(expense_date__gte=data['start_date'])
+        if 'end_date' in data:
+            query &= Q(expense_date__lte=data['end_date'])
+        if 'min_m' in data and 'max_m' in data:
+            query &= Q(money__range=[data['min_m'], data['max_m']])
+
+        file_format, compress = data['format'], data['gzip']
+        querysets = archive.querysets(query, data.get('start_date'))
+        chunks = exporters.stream(querysets, file_format, compress)
+        if isinstance(request._request, ASGIRequest):
+            # ASGI 에서는 동기 iterator 를 전부 읽은 뒤 전송하므로 비동기 iterator 로 변환
+            chunks = aiterate(chunks)
+
+        content_type = 'application/gzip' if compress else exporters.CONTENT_TYPES[file_format]
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{exporters.filename(file_format, compress)}"'
+        return response
+
+
+# api/v1/expenditure/import/
+class ExpenditureImportAPIView(APIView):
+    """
+    CSV/JSONL 파일로 지출 내역을 일괄 등록하는 API
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    @swagger_auto_schema(
+            request_body=ExpenditureImportInputSerializer,
+            operation_description="CSV 헤더 또는 JSONL 키 : money, comment, category, expense_date, is_sum"
+    )
+    def post(self, request):
+        serializer = ExpenditureImportInputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        upload = serializer.validated_data['file']
+        file_format = serializer.validated_data.get('format') or importers.guess_format(upload.name)
+        batch_size = serializer.validated_data['batch_size']
+
+        rows = importers.read_rows(upload.file, file_format)
+        report = importers.import_expenditures(request.user, rows, batch_size=batch_size)
+
+        if report['created']:
+            return Response(report, status=status.HTTP_201_CREATED)
+
+        return Response(report, status=status.HTTP_400_BAD_REQUEST)
+
+
 # api/v1/expenditure/<int:expenditure_id>/
 class ExpenditureDetailAPIView(APIView):
     """
     지출 내역을 상세 조회하고, 수정, 삭제하는 기능 관련 API
     """
     permission_classes = [IsAuthenticated]
+    # 원본 테이블에 없으면 보관 테이블 조회 포함
+    query_budget = {'get' : 3}
+
+    def is_archived(self, user, expenditure_id):
+        return archive.active().filter(user=user, id=expenditure_id).exists()
+
+    def archived_response(self):
+        return Response({"message" : "보관된 지출은 수정/삭제할 수 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
 
 
     @swagger_auto_schema(
@@ -164,15 +409,19 @@ class ExpenditureDetailAPIView(APIView):
         user = request.user
 
         try:
-            expense_data = Expenditure.objects.get(user=user, id=expenditure_id)
-        except Exception as e :
-            return Response(
-                {
-                    "error_code" : str(e),
-                    "message" : "해당 내역을 찾을 수 없습니다."
-                },
-                status=status.HTTP_404_NOT_FOUND
-                )
+            expense_data = Expenditure.objects.select_related('user', 'category').get(user=user, id=expenditure_id)
+        except Expenditure.DoesNotExist:
+            # 목록에 함께 보이는 보관 지출은 보관 테이블에서 조회 (조회만 가능)
+            try:
+                expense_data = archive.active().select_related('user', 'category').get(user=user, id=expenditure_id)
+            except Exception as e :
+                return Response(
+                    {
+                        "error_code" : str(e),
+                        "message" : "해당 내역을 찾을 수 없습니다."
+                    },
+                    status=status.HTTP_404_NOT_FOUND
+                    )
         
         serializer = ExpenditureDetailSerializer(expense_data)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -189,9 +438,11 @@ class ExpenditureDetailAPIView(APIView):
         update_data = request.data
 
         try:
-            expense_data = Expenditure.objects.get(user=user, id=expenditure_id)
-            category_data = Category.objects.get(name=update_data['category'])
+            expense_data = Expenditure.objects.select_related('user', 'category').get(user=user, id=expenditure_id)
+            category_data = registry.get(update_data['category'])
         except Exception as e :
+            if self.is_archived(user, expenditure_id):
+                return self.archived_response()
             return Response(
                 {
                     "error_code" : str(e),
@@ -219,6 +470,8 @@ class ExpenditureDetailAPIView(APIView):
         try:
             data = Expenditure.objects.get(user=user, id=expenditure_id)
         except Exception as e :
+            if self.is_archived(user, expenditure_id):
+                return self.archived_response()
             return Response(
                 {
                     "error_code" : str(e),
@@ -227,6 +480,7 @@ class ExpenditureDetailAPIView(APIView):
                 status=status.HTTP_404_NOT_FOUND
                 )
         
-        data.delete()
+        # 삭제한 지출은 보관 테이블에 deleted_at 과 함께 남김
+        archive.soft_delete(data)
 
         return Response({"message" : "삭제 완료!"}, status=status.HTTP_200_OK)
\ No newline at end of file
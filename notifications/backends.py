@@ -0,0 +1,78 @@
+import asyncio
+import json
+import urllib.request
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+
+class BaseDigestBackend:
+    """
+    알림 발송 backend 기본 클래스 (DIGEST_BACKEND 설정으로 선택)
+    """
+
+    async def send(self, digest):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class LocmemDigestBackend(BaseDigestBackend):
+    """
+    테스트용 : 발송 내용을 인스턴스의 outbox 에 보관 (digests.run(backend=...) 으로 전달)
+    """
+
+    def __init__(self):
+        self.outbox = []
+
+    async def send(self, digest):
+        self.outbox.append(digest)
+
+
+class FileDigestBackend(BaseDigestBackend):
+    """
+    로컬 확인용 : DIGEST_FILE_PATH 에 JSON 한 줄씩 기록
+    """
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.path = settings.DIGEST_FILE_PATH
+
+    def _write(self, line):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+    async def send(self, digest):
+        line = json.dumps(digest, cls=DjangoJSONEncoder, ensure_ascii=False)
+        async with self.lock:
+            await asyncio.to_thread(self._write, line)
+
+
+class WebhookDigestBackend(BaseDigestBackend):
+    """
+    DIGEST_WEBHOOK_URL 로 JSON 을 POST (실제 푸시 서비스 연동 전 stub)
+    """
+
+    def __init__(self):
+        self.url = settings.DIGEST_WEBHOOK_URL
+        self.timeout = settings.DIGEST_WEBHOOK_TIMEOUT
+
+    def _post(self, body):
+        request = urllib.request.Request(
+            self.url,
+            data=body,
+            headers={'Content-Type' : 'application/json'},
+            method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.status
+
+    async def send(self, digest):
+        body = json.dumps(digest, cls=DjangoJSONEncoder, ensure_ascii=False).encode()
+        await asyncio.to_thread(self._post, body)
+
+
+def get_backend():
+    return import_string(settings.DIGEST_BACKEND)()
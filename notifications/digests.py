@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.db.models import Sum
+
+from budget.models import DailyBudgetPlan
+from expenditure.models import ExpenditureDailySummary
+from notifications.backends import get_backend
+from notifications.models import DigestCheckpoint
+from users.models import User
+
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('morning', 'evening')
+
+
+def next_users(after_id, batch_size):
+    """
+    활성 사용자를 id 순서(keyset)로 batch_size 명씩 조회
+    """
+    return list(
+        User.objects.filter(is_active=True, id__gt=after_id)
+        .order_by('id')
+        .values('id', 'username')[:batch_size]
+    )
+
+
+def users_by_id(user_ids):
+    """
+    이전 실행에서 발송에 실패한 사용자 조회
+    """
+    return list(
+        User.objects.filter(is_active=True, id__in=user_ids)
+        .order_by('id')
+        .values('id', 'username')
+    )
+
+
+def build_digests(users, kind, digest_date):
+    """
+    사용자 묶음의 지출/추천 금액을 각각 한 번의 GROUP BY 쿼리로 조회해서 알림 내용 생성
+    morning : 전날 지출 + 오늘 추천 금액, evening : 오늘 지출 + 오늘 추천 금액
+    """
+    user_ids = [user['id'] for user in users]
+    spent_date = digest_date - timedelta(days=1) if kind == 'morning' else digest_date
+
+    spent = dict(
+        ExpenditureDailySummary.objects.filter(user_id__in=user_ids, expense_date=spent_date, count__gt=0)
+        .values('user_id')
+        .annotate(Sum('money'))
+        .values_list('user_id', 'money__sum')
+    )
+    recommended = dict(
+        DailyBudgetPlan.objects.filter(user_id__in=user_ids, plan_date=digest_date)
+        .values('user_id')
+        .annotate(Sum('daily_allowance'))
+        .values_list('user_id', 'daily_allowance__sum')
+    )
+
+    digests = []
+    for user in users:
+        if user['id'] not in spent and user['id'] not in recommended:
+            continue
+
+        user_spent = spent.get(user['id'], 0)
+        user_recommended = recommended.get(user['id'], 0)
+        digests.append({
+            "kind" : kind,
+            "user_id" : user['id'],
+            "username" : user['username'],
+            "date" : digest_date,
+            "spent_date" : spent_date,
+            "spent" : user_spent,
+            "recommended" : user_recommended,
+            "difference" : user_recommended - user_spent,
+        })
+    return digests
+
+
+async def deliver(backend, digests, concurrency, retries=2):
+    """
+    최대 concurrency 개씩 동시에 발송, 실패하면 retries 번까지 재시도
+    반환값 : (성공 건수, 실패한 사용자 id 목록)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(digest):
+        async with semaphore:
+            for attempt in range(retries + 1):
+                try:
+                    await backend.send(digest)
+                    return True
+                except Exception:
+                    if attempt == retries:
+                        logger.exception("알림 발송 실패 : user_id=%s", digest['user_id'])
+                        return False
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+
+    results = await asyncio.gather(*(send(digest) for digest in digests))
+    failed = [digest['user_id'] for digest, result in zip(digests, results) if not result]
+    return len(results) - len(failed), failed
+
+
+def _checkpoint(kind, digest_date, restart):
+    checkpoint, _ = DigestCheckpoint.objects.get_or_create(kind=kind, digest_date=digest_date)
+    if restart:
+        checkpoint.last_user_id = 0
+        checkpoint.failed_user_ids = []
+        checkpoint.is_done = False
+        checkpoint.save(update_fields=['last_user_id', 'failed_user_ids', 'is_done', 'updated_at'])
+    return checkpoint
+
+
+def _next_batch(checkpoint, kind, digest_date, batch_size):
+    users = next_users(checkpoint.last_user_id, batch_size)
+    return users, build_digests(users, kind, digest_date) if users else []
+
+
+def _retry_batch(user_ids, kind, digest_date):
+    users = users_by_id(user_ids)
+    return build_digests(users, kind, digest_date) if users else []
+
+
+def _advance(checkpoint, last_user_id, failed_user_ids):
+    checkpoint.last_user_id = last_user_id
+    checkpoint.failed_user_ids = failed_user_ids
+    checkpoint.save(update_fields=['last_user_id', 'failed_user_ids', 'updated_at'])
+
+
+def _finish(checkpoint):
+    # 실패한 사용자가 남아 있으면 다음 실행에서 다시 발송
+    checkpoint.is_done = not checkpoint.failed_user_ids
+    checkpoint.save(update_fields=['is_done', 'updated_at'])
+
+
+async def _run(kind, digest_date, batch_size, concurrency, restart, backend, retries):
+    checkpoint = await sync_to_async(_checkpoint)(kind, digest_date, restart)
+    total_sent, total_failed = 0, 0
+    if checkpoint.is_done:
+        return total_sent, total_failed
+
+    if backend is None:
+        backend = get_backend()
+    try:
+        # 이전 실행에서 실패한 사용자부터 다시 발송
+        pending = list(checkpoint.failed_user_ids)
+        failed_user_ids = []
+        for start in range(0, len(pending), batch_size):
+            digests = await sync_to_async(_retry_batch)(pending[start:start + batch_size], kind, digest_date)
+
+            sent, failed = await deliver(backend, digests, concurrency, retries)
+            total_sent += sent
+            total_failed += len(failed)
+            failed_user_ids += failed
+
+            await sync_to_async(_advance)(checkpoint, checkpoint.last_user_id, failed_user_ids + pending[start + batch_size:])
+
+        while True:
+            users, digests = await sync_to_async(_next_batch)(checkpoint, kind, digest_date, batch_size)
+            if not users:
+                break
+
+            sent, failed = await deliver(backend, digests, concurrency, retries)
+            total_sent += sent
+            total_failed += len(failed)
+            failed_user_ids += failed
+
+            # 묶음 단위로 진행 위치와 실패한 사용자를 함께 기록해서 중단되어도 다음 실행에서 이어서 발송
+            await sync_to_async(_advance)(checkpoint, users[-1]['id'], failed_user_ids)
+
+        await sync_to_async(_finish)(checkpoint)
+    finally:
+        await backend.close()
+
+    return total_sent, total_failed
+
+
+def run(kind, digest_date, batch_size=1000, concurrency=50, restart=False, backend=None, retries=2):
+    """
+    기준일의 알림을 발송 (이미 완료된 기준일은 건너뜀, restart=True 면 처음부터)
+    backend 를 지정하지 않으면 DIGEST_BACKEND 사용
+    반환값 : (성공 건수, 실패 건수)
+    """
+    return asyncio.run(_run(kind, digest_date, batch_size, concurrency, restart, backend, retries))
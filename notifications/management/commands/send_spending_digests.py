@@ -0,0 +1,38 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from notifications import digests
+
+
+class Command(BaseCommand):
+    help = "사용자별 지출/추천 금액 알림을 발송합니다. 중단되거나 발송에 실패한 사용자가 있으면 다시 실행할 때 이어서 발송합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=digests.KINDS, help="morning : 전날 지출 + 오늘 추천, evening : 오늘 지출 + 오늘 추천")
+        parser.add_argument('--date', help="기준일 YYYY-MM-DD (기본값 : 오늘)")
+        parser.add_argument('--batch-size', type=int, default=1000, help="한 번에 조회할 사용자 수")
+        parser.add_argument('--concurrency', type=int, default=50, help="동시 발송 수")
+        parser.add_argument('--restart', action='store_true', help="진행 위치를 무시하고 처음부터 발송")
+
+    def handle(self, *args, **options):
+        try:
+            digest_date = date.fromisoformat(options['date']) if options['date'] else timezone.localdate()
+        except ValueError:
+            raise CommandError("기준일 형식(YYYY-MM-DD)을 확인해주세요.")
+
+        started = time.perf_counter()
+        sent, failed = digests.run(
+            options['kind'],
+            digest_date,
+            batch_size=options['batch_size'],
+            concurrency=options['concurrency'],
+            restart=options['restart']
+        )
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['kind']} {digest_date} : {sent}건 발송, {failed}건 실패 ({elapsed:.2f}초)"
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DigestCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('kind', models.CharField(max_length=20, verbose_name='알림 종류')),
+                ('digest_date', models.DateField(verbose_name='기준일')),
+                ('last_user_id', models.BigIntegerField(default=0, verbose_name='마지막 사용자 id')),
+                ('is_done', models.BooleanField(default=False, verbose_name='완료여부')),
+            ],
+            options={
+                'db_table': 'digest_checkpoint',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='digestcheckpoint',
+            constraint=models.UniqueConstraint(fields=('kind', 'digest_date'), name='uniq_digest_checkpoint'),
+        ),
+    ]
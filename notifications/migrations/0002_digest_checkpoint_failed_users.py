@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='digestcheckpoint',
+            name='failed_user_ids',
+            field=models.JSONField(blank=True, default=list, verbose_name='발송 실패 사용자 id'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import models
+
+from common.models import BaseModel
+
+class DigestCheckpoint(BaseModel):
+    """
+    알림 발송 배치의 진행 위치 (마지막으로 처리한 사용자 id)
+    """
+    kind = models.CharField("알림 종류", max_length=20)
+    digest_date = models.DateField("기준일")
+    last_user_id = models.BigIntegerField("마지막 사용자 id", default=0)
+    # 발송에 실패해 다음 실행에서 다시 발송할 사용자 id
+    failed_user_ids = models.JSONField("발송 실패 사용자 id", default=list, blank=True)
+    is_done = models.BooleanField("완료여부", default=False)
+
+    class Meta:
+        db_table = 'digest_checkpoint'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'digest_date'], name='uniq_digest_checkpoint'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} : {self.digest_date} : {self.last_user_id}"
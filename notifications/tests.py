@@ -0,0 +1,98 @@
+from datetime import date
+
+from django.test import TransactionTestCase
+
+from budget.models import DailyBudgetPlan
+from categories.models import Category
+from expenditure.models import Expenditure
+from notifications import digests
+from notifications.backends import LocmemDigestBackend
+from notifications.models import DigestCheckpoint
+from users.models import User
+
+
+class Interrupted(BaseException):
+    """
+    배치 중단(프로세스 종료 등)을 흉내 내기 위한 예외 (deliver 의 재시도 대상이 아님)
+    """
+
+
+class FailingBackend(LocmemDigestBackend):
+
+    def __init__(self, fail_user_ids=(), interrupt_after=None):
+        super().__init__()
+        self.fail_user_ids = set(fail_user_ids)
+        self.interrupt_after = interrupt_after
+
+    async def send(self, digest):
+        if digest['user_id'] in self.fail_user_ids:
+            raise ConnectionError("발송 실패")
+        if self.interrupt_after is not None and len(self.outbox) >= self.interrupt_after:
+            raise Interrupted
+        await super().send(digest)
+
+
+# 다른 스레드(sync_to_async)에서 DB 를 조회하므로 TransactionTestCase 사용
+class SpendingDigestTest(TransactionTestCase):
+    digest_date = date(2023, 11, 2)
+
+    def setUp(self):
+        category = Category.objects.create(name='식비', description='식비')
+        self.users = [User.objects.create_user(username=f'tester{i}', password=None) for i in range(7)]
+        for i, user in enumerate(self.users):
+            Expenditure.objects.create(user=user, category=category, money=1000 * (i + 1), expense_date=date(2023, 11, 1))
+            DailyBudgetPlan.objects.create(
+                user=user, category=category, plan_date=self.digest_date,
+                daily_allowance=5000, remaining=50000, remaining_days=10, spent=0
+            )
+        # 지출도 추천 금액도 없는 사용자는 발송 대상이 아님
+        User.objects.create_user(username='idle', password=None)
+
+    def run_digests(self, backend, concurrency=2):
+        return digests.run('morning', self.digest_date, batch_size=3, concurrency=concurrency, backend=backend, retries=0)
+
+    def user_ids(self, backend):
+        return sorted(digest['user_id'] for digest in backend.outbox)
+
+    def test_batches_send_every_user_once(self):
+        backend = LocmemDigestBackend()
+
+        self.assertEqual(self.run_digests(backend), (7, 0))
+        self.assertEqual(self.user_ids(backend), [user.id for user in self.users])
+
+        digest = next(digest for digest in backend.outbox if digest['user_id'] == self.users[1].id)
+        self.assertEqual((digest['spent'], digest['recommended'], digest['difference']), (2000, 5000, 3000))
+
+        # 완료된 기준일은 다시 발송하지 않음
+        self.assertEqual(self.run_digests(LocmemDigestBackend()), (0, 0))
+
+    def test_resume_after_interruption(self):
+        with self.assertRaises(Interrupted):
+            # 첫 묶음(3명)을 보낸 뒤 두 번째 묶음에서 중단
+            self.run_digests(FailingBackend(interrupt_after=3), concurrency=1)
+
+        checkpoint = DigestCheckpoint.objects.get(kind='morning', digest_date=self.digest_date)
+        self.assertEqual(checkpoint.last_user_id, self.users[2].id)
+        self.assertFalse(checkpoint.is_done)
+
+        backend = LocmemDigestBackend()
+        self.assertEqual(self.run_digests(backend), (4, 0))
+        self.assertEqual(self.user_ids(backend), [user.id for user in self.users[3:]])
+
+    def test_failed_users_are_retried(self):
+        failing = {self.users[1].id, self.users[4].id}
+
+        with self.assertLogs('notifications.digests', 'ERROR'):
+            self.assertEqual(self.run_digests(FailingBackend(fail_user_ids=failing)), (5, 2))
+
+        checkpoint = DigestCheckpoint.objects.get(kind='morning', digest_date=self.digest_date)
+        self.assertEqual(sorted(checkpoint.failed_user_ids), sorted(failing))
+        self.assertFalse(checkpoint.is_done)
+
+        backend = LocmemDigestBackend()
+        self.assertEqual(self.run_digests(backend), (2, 0))
+        self.assertEqual(self.user_ids(backend), sorted(failing))
+
+        checkpoint.refresh_from_db()
+        self.assertEqual(checkpoint.failed_user_ids, [])
+        self.assertTrue(checkpoint.is_done)
@@ -0,0 +1,28 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from users import cache
+
+
+class CachedUserJWTAuthentication(JWTAuthentication):
+    """
+    검증된 토큰의 user_id 로 캐시된 사용자 정보를 조회하는 JWTAuthentication
+    요청마다 users 테이블을 조회하지 않으며, 사용자 정보가 바뀌면(is_active 등) signal 로 캐시를 무효화
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = cache.get_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
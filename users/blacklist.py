@@ -0,0 +1,159 @@
+import hashlib
+import math
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+VERSION_KEY = 'users:blacklist:version'
+
+
+class BloomFilter:
+    """
+    jti 집합의 포함 여부를 비트 배열로 판단 (없다고 판단한 값은 확실히 없음, 있다고 판단한 값은 error_rate 확률로 오탐)
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        # double hashing : blake2b 128bit 를 두 개의 64bit 해시로 나누어 사용
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class TokenBlacklist:
+    """
+    블랙리스트 jti 를 프로세스 메모리의 Bloom filter 로 관리
+    필터에 없으면 DB 조회 없이 통과, 있을 때만 BlacklistedToken 테이블로 확인
+
+    - 다른 프로세스에서 블랙리스트에 추가하면 캐시의 version 이 바뀌고, version 이 바뀐 경우에만 새로 추가된 행을 읽어옴
+    - 프로세스별 캐시(locmem)에서는 version 이 공유되지 않으므로 TOKEN_BLACKLIST_SYNC_INTERVAL(초) 마다 한 번 더 동기화
+    - id 는 커밋 순서와 다를 수 있으므로(먼저 id 를 받은 트랜잭션이 늦게 커밋) 마지막 id 이전 TOKEN_BLACKLIST_SYNC_OVERLAP 건을 다시 읽고,
+      그보다 늦은 커밋도 반영되도록 TOKEN_BLACKLIST_REBUILD_INTERVAL(초) 마다 필터를 새로 만듦
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.filter = None
+        self.last_id = 0
+        self.version = None
+        self.synced_at = 0
+        self.built_at = 0
+
+    def _rebuild(self):
+        # 만료된 토큰은 서명 검증에서 거부되므로 필터에 넣지 않음
+        queryset = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+        capacity = max(settings.TOKEN_BLACKLIST_CAPACITY, queryset.count() * 2)
+
+        # 다른 스레드가 채워지는 중인 필터를 보지 않도록 다 채운 뒤 교체
+        bloom = BloomFilter(capacity, settings.TOKEN_BLACKLIST_ERROR_RATE)
+        self.last_id = self._load(bloom, queryset, 0)
+        self.filter = bloom
+        self.built_at = time.monotonic()
+
+    def _load(self, bloom, queryset, last_id, overlap=0):
+        rows = queryset.filter(id__gt=max(last_id - overlap, 0)).order_by('id').values_list('id', 'token__jti')
+        for row_id, jti in rows.iterator(chunk_size=settings.TOKEN_BLACKLIST_BATCH_SIZE):
+            # 다시 읽은 구간은 이미 있는 값이 대부분이므로 건수(count)가 늘지 않도록 없는 값만 추가
+            if row_id > last_id or jti not in bloom:
+                bloom.add(jti)
+            last_id = max(last_id, row_id)
+        return last_id
+
+    def sync(self):
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            # 캐시에서 사라진 경우 새 version 을 발급해 모든 프로세스가 다시 동기화하도록 함
+            cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+            version = cache.get(VERSION_KEY)
+
+        now = time.monotonic()
+        expired = now - self.synced_at > settings.TOKEN_BLACKLIST_SYNC_INTERVAL
+        if self.filter is not None and version == self.version and not expired:
+            return
+
+        with self.lock:
+            if (
+                self.filter is None
+                or self.filter.count > self.filter.capacity
+                or now - self.built_at > settings.TOKEN_BLACKLIST_REBUILD_INTERVAL
+            ):
+                self._rebuild()
+            else:
+                self.last_id = self._load(
+                    self.filter, BlacklistedToken.objects.all(), self.last_id, settings.TOKEN_BLACKLIST_SYNC_OVERLAP
+                )
+            self.version = version
+            self.synced_at = time.monotonic()
+
+    def contains(self, jti):
+        self.sync()
+        if jti not in self.filter:
+            return False
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    def added(self, jti):
+        """
+        블랙리스트 추가 시 현재 프로세스의 필터에 바로 반영하고, 커밋 후 다른 프로세스가 동기화하도록 version 변경
+        """
+        with self.lock:
+            if self.filter is not None:
+                self.filter.add(jti)
+        transaction.on_commit(lambda: cache.set(VERSION_KEY, uuid.uuid4().hex, None))
+
+
+blacklist = TokenBlacklist()
+
+
+def purge_expired(batch_size=1000, pause=0, now=None):
+    """
+    만료된 OutstandingToken 과 연결된 BlacklistedToken 을 batch_size 건씩 나누어 삭제
+    batch 마다 트랜잭션을 짧게 끊어 테이블 잠금을 오래 잡지 않음
+    """
+    if now is None:
+        now = timezone.now()
+
+    last_id = 0
+    deleted = 0
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(id__gt=last_id, expires_at__lte=now)
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+
+        with transaction.atomic():
+            # 연결된 BlacklistedToken 은 CASCADE 로 함께 삭제 (delete signal 이 없으므로 batch 당 DELETE 한 번씩)
+            _, per_model = OutstandingToken.objects.filter(id__in=ids).delete()
+            deleted += per_model.get(OutstandingToken._meta.label, 0)
+
+        last_id = ids[-1]
+        if pause:
+            time.sleep(pause)
+
+    return deleted
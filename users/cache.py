@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+
+from users.models import User
+
+
+KEY = 'users:user:{}'
+# 비밀번호 hash 는 캐시에 저장하지 않음 (접근 시 DB 에서 조회)
+EXCLUDED_FIELDS = ('password',)
+
+
+def _fields():
+    return [field.attname for field in User._meta.concrete_fields if field.attname not in EXCLUDED_FIELDS]
+
+
+def get_user(user_id):
+    """
+    USER_CACHE_TIMEOUT(초) 동안 캐시된 사용자 정보로 User 인스턴스를 생성 (캐시에 없을 때만 DB 조회)
+    없는 사용자는 None
+    """
+    key = KEY.format(user_id)
+    fields = _fields()
+
+    values = cache.get(key)
+    if values is None:
+        row = User.objects.filter(pk=user_id).values_list(*fields).first()
+        if row is None:
+            return None
+        values = list(row)
+        cache.set(key, values, settings.USER_CACHE_TIMEOUT)
+
+    return User.from_db(router.db_for_read(User), fields, values)
+
+
+def invalidate(user_id):
+    cache.delete(KEY.format(user_id))
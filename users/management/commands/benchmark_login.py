@@ -0,0 +1,68 @@
+import logging
+import time
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "비밀번호 hash 알고리즘별 초당 로그인 처리 수(단일 스레드 = 코어 1개 기준)와 횟수 제한에 걸린 요청의 처리 속도를 측정합니다. 생성한 데이터는 종료 시 롤백됩니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20, help="알고리즘별 로그인 횟수")
+        parser.add_argument('--rejected', type=int, default=1000, help="횟수 제한에 걸린 로그인 요청 수")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            for name, path in settings.PASSWORD_HASHER_CLASSES.items():
+                self.measure_hasher(name, path, options['logins'])
+            self.measure_rejected(options['rejected'])
+
+            transaction.set_rollback(True)
+
+    def measure_hasher(self, name, path, logins):
+        with override_settings(PASSWORD_HASHERS=[path]):
+            hasher = get_hasher('default')
+            try:
+                if hasher.library:
+                    hasher._load_library()
+            except ValueError:
+                self.stdout.write(f"{name} : 라이브러리 미설치")
+                return
+
+            username = f'benchmark-login-{name}'
+            User.objects.create_user(username=username, password='benchmark-password')
+
+            started = time.perf_counter()
+            for _ in range(logins):
+                authenticate(username=username, password='benchmark-password')
+            elapsed = time.perf_counter() - started
+
+        current = " (현재 설정)" if name == settings.PASSWORD_HASHER else ""
+        self.stdout.write(f"{name}{current} : {logins / elapsed:.1f} logins/s ({elapsed / logins * 1000:.1f}ms/건)")
+
+    def measure_rejected(self, requests):
+        # 다른 요청의 횟수 제한에 영향을 주지 않도록 별도 IP 사용 (카운터는 제한 주기의 2배가 지나면 만료)
+        client = APIClient(REMOTE_ADDR='192.0.2.1')
+        data = {'username' : 'benchmark-login-rejected', 'password' : 'wrong-password'}
+
+        # 실패/거부 응답마다 남는 경고 로그 생략
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+
+        # 한도에 도달할 때까지 요청한 뒤 거부되는 요청의 처리 속도 측정
+        while client.post('/api/v1/users/login/', data).status_code != 429:
+            pass
+
+        started = time.perf_counter()
+        for _ in range(requests):
+            client.post('/api/v1/users/login/', data)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"횟수 제한 거부 : {requests / elapsed:.1f} req/s ({elapsed / requests * 1000:.2f}ms/건, hash 계산 없음)")
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from users.blacklist import purge_expired
+
+
+class Command(BaseCommand):
+    help = "만료된 outstanding/blacklisted 토큰을 batch 단위로 나누어 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0.1, help="batch 사이 대기 시간(초), DB 부하를 줄이기 위해 사용")
+
+    def handle(self, *args, **options):
+        deleted = purge_expired(options['batch_size'], options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f"만료된 토큰 {deleted}건 삭제"))
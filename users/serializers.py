@@ -1,5 +1,8 @@
 from rest_framework import serializers
+from rest_framework_simplejwt import serializers as jwt_serializers
+
 from users.models import User
+from users.tokens import RefreshToken
 
 
 class SignupSerializer(serializers.ModelSerializer):
@@ -34,4 +37,8 @@ class LoginSerializer(serializers.ModelSerializer):
         fields = [
             'username',
             'password'
-        ]
\ No newline at end of file
+        ]
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    token_class = RefreshToken
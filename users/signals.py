@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from users import cache
+from users.blacklist import blacklist
+from users.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    # 현재 요청은 즉시, 커밋 전에 다른 요청이 이전 값을 다시 캐시한 경우를 위해 커밋 후 한 번 더 무효화
+    cache.invalidate(instance.pk)
+    transaction.on_commit(lambda: cache.invalidate(instance.pk))
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def add_to_blacklist_filter(sender, instance, created, **kwargs):
+    if created:
+        blacklist.added(instance.token.jti)
@@ -1,3 +1,144 @@
-from django.test import TestCase
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.blacklist import VERSION_KEY, blacklist, purge_expired
+from users.models import User
+
+
+class CachedUserAuthenticationTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='tester', password='password')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def test_cached_user_skips_users_query(self):
+        self.assertEqual(self.client.get('/api/v1/categories/').status_code, 200)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/categories/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in context.captured_queries if '"users"' in query['sql']])
+
+    def test_inactive_user_rejected(self):
+        self.assertEqual(self.client.get('/api/v1/categories/').status_code, 200)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get('/api/v1/categories/').status_code, 401)
+
+
+class TokenBlacklistTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        blacklist.reset()
+        self.user = User.objects.create_user(username='tester', password='password')
+        self.client = APIClient()
+
+    def refresh(self, token):
+        return self.client.post('/api/v1/users/token/refresh/', {'refresh' : str(token)})
+
+    def test_refresh_skips_blacklist_query(self):
+        token = RefreshToken.for_user(self.user)
+        self.assertEqual(self.refresh(token).status_code, 200)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.refresh(token)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in context.captured_queries if 'token_blacklist' in query['sql']])
+
+    def test_blacklisted_token_rejected(self):
+        token = RefreshToken.for_user(self.user)
+        self.assertEqual(self.refresh(token).status_code, 200)
+
+        token.blacklist()
+
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+    def blacklist_elsewhere(self, token, row_id):
+        # 다른 프로세스에서 추가한 경우 : 이 프로세스의 필터는 그대로이고 커밋 후 version 만 바뀜 (signal 없이 저장)
+        outstanding = OutstandingToken.objects.get(jti=token['jti'])
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(id=row_id, token=outstanding)])
+        cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+    def test_blacklisted_from_another_process(self):
+        early, late = RefreshToken.for_user(self.user), RefreshToken.for_user(self.user)
+        self.assertEqual(self.refresh(early).status_code, 200)
+
+        # id 는 먼저 받았지만(50) 늦게 커밋된 행도 동기화 시 다시 읽음
+        self.blacklist_elsewhere(late, 100)
+        self.assertEqual(self.refresh(late).status_code, 401)
+        self.blacklist_elsewhere(early, 50)
+        self.assertEqual(self.refresh(early).status_code, 401)
+
+    @override_settings(TOKEN_BLACKLIST_SYNC_OVERLAP=0)
+    def test_rebuild_after_interval(self):
+        early, late = RefreshToken.for_user(self.user), RefreshToken.for_user(self.user)
+        self.assertEqual(self.refresh(early).status_code, 200)
+
+        self.blacklist_elsewhere(late, 100)
+        self.assertEqual(self.refresh(late).status_code, 401)
+        self.blacklist_elsewhere(early, 50)
+        self.assertEqual(self.refresh(early).status_code, 200)
+
+        # 주기적으로 필터를 새로 만들면서 반영
+        with override_settings(TOKEN_BLACKLIST_SYNC_INTERVAL=0, TOKEN_BLACKLIST_REBUILD_INTERVAL=0):
+            self.assertEqual(self.refresh(early).status_code, 401)
+
+    def test_purge_expired(self):
+        tokens = [RefreshToken.for_user(self.user) for _ in range(5)]
+        for token in tokens[:2]:
+            token.blacklist()
+
+        expired = OutstandingToken.objects.filter(jti__in=[token['jti'] for token in tokens[:3]])
+        expired.update(expires_at=timezone.now() - timedelta(days=1))
+
+        self.assertEqual(purge_expired(batch_size=2), 3)
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+        self.assertEqual(BlacklistedToken.objects.count(), 0)
+
+
+class LoginTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def login(self, username, password):
+        return self.client.post('/api/v1/users/login/', {'username' : username, 'password' : password})
+
+    def test_hash_upgraded_on_login(self):
+        with override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.PBKDF2PasswordHasher']):
+            user = User.objects.create_user(username='tester', password='password')
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+
+        self.assertEqual(self.login('tester', 'password').status_code, 200)
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('scrypt$'))
+
+    def test_rate_limited_before_hashing(self):
+        for _ in range(10):
+            self.assertEqual(self.login('tester', 'wrong').status_code, 404)
+
+        with patch('django.contrib.auth.backends.ModelBackend.authenticate') as authenticate:
+            response = self.login('Tester', 'wrong')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        authenticate.assert_not_called()
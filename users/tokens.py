@@ -0,0 +1,16 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from users.blacklist import blacklist
+
+
+class RefreshToken(tokens.RefreshToken):
+    """
+    블랙리스트 확인을 Bloom filter 로 먼저 거르는 RefreshToken
+    """
+
+    def check_blacklist(self):
+        if blacklist.contains(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
@@ -5,9 +5,10 @@ from rest_framework import status
 from drf_yasg.utils import swagger_auto_schema
 from django.contrib.auth import authenticate
 
+from common.throttling import LoginIPRateThrottle, LoginUsernameRateThrottle
 from users.serializers import LoginSerializer, SignupOutputSerializer, SignupSerializer
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
+from users.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
 
 
@@ -40,6 +41,8 @@ class SignupView(APIView):
 # api/v1/users/login/
 class LoginView(APIView):
     permission_classes = [AllowAny]
+    # username 기준과 함께 IP 기준으로도 제한해 username 을 바꿔가며 시도하는 요청을 막음
+    throttle_classes = [LoginIPRateThrottle, LoginUsernameRateThrottle]
     
     @swagger_auto_schema(
         request_body=LoginSerializer